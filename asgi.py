@@ -0,0 +1,436 @@
+'''
+ASGI application of tic-tac-toe server (run it with 'uvicorn asgi:application').
+
+Async serving mode keeps routes and payloads of WSGI server. Requests are parsed and validated in event loop,
+while min-max searches and neural network predictions are run in pre-warmed engine processes pool
+(see 'engine/process_pool.py'). When client disconnects before its move is found, engine task waiting for
+free pool process is cancelled and result of already running one is dropped. Routes that are not handled
+asynchronously (game sessions, metrics) are served by WSGI server application.
+
+Game channel ('/tic-tac-toe/games' WebSocket) lets client play the whole game against min-max engine over single
+connection. Client starts the game with JSON message:
+    {"type": "start", "grid_size": 4, "engine_player": 2, "first_player": 1, "pondering": 0}
+and then sends its moves as JSON messages ({"type": "move", "move": 5}) or as single byte binary messages (field index).
+Only the move itself is validated against the last known board, so there is no form parsing or full grid validation
+per move. Engine replies are sent in the format of received move:
+    JSON    - {"type": "state", "session_id": ..., "grid": ..., "move": ..., "game_status": ..., ...}
+    binary  - two bytes: engine move (255 if engine did not move) and game status index (see GAME_STATUSES)
+Invalid messages are answered with JSON message {"type": "error", "errors": {field: message}}.
+'''
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import anyio
+from starlette.applications import Starlette
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route, WebSocketRoute
+from starlette.websockets import WebSocket
+
+from engine.board import GAME_DRAW, GAME_IN_PROGRESS, GAME_O_WON, GAME_X_WON
+from engine.process_pool import create_engine_pool, predict_neural_network_move, search_hybrid_move, search_minmax_move
+from engine.scheduling import LaneSaturatedError, estimate_minmax_cost, estimate_neural_network_cost
+from engine.sessions import SessionLimitError
+from metrics.metrics import ENGINE_LATENCY, VALIDATION_LATENCY, get_request_labels, observe_bad_request
+from metrics.timing import PhaseTimer
+from server import (
+    HYBRID_LEAF_BATCH_SIZE,
+    HYBRID_MAX_NODES,
+    HYBRID_SEARCH_DEADLINE_S,
+    HYBRID_TREE_PROCESSING_LIMITS,
+    ResponseStatus,
+    finish_request,
+    get_game_sessions,
+    get_minmax_budget,
+    lane_scheduler,
+    prefetch_request_data,
+    server
+)
+from validators.exceptions import ValidationError
+from engine.resolvers import ResolverUnavailableError
+from validators.validators import (
+    GameSessionMoveRequestValidator,
+    GameSessionRequestValidator,
+    HybridRequestValidator,
+    NeuralNetworkRequestValidator,
+    TicTacToeRequestValidator
+)
+
+
+# number of engine processes (each of them loads min-max library and all neural network models)
+ENGINE_POOL_WORKERS = int(os.environ.get("ENGINE_POOL_WORKERS", str(os.cpu_count() or 1)))
+# interval (in seconds) of checking whether client waiting for engine move is still connected
+DISCONNECT_CHECK_INTERVAL = float(os.environ.get("DISCONNECT_CHECK_INTERVAL", "0.05"))
+
+# max. number of engine searches made at the same time for game channels of worker (the rest of games wait for them)
+GAME_CHANNEL_MAX_SEARCHES = int(os.environ.get("GAME_CHANNEL_MAX_SEARCHES", str(os.cpu_count() or 1)))
+
+# game statuses order used by binary messages
+GAME_STATUSES = [GAME_IN_PROGRESS, GAME_X_WON, GAME_O_WON, GAME_DRAW]
+# binary message field value used when engine did not move
+NO_MOVE = 255
+
+# WebSocket close code sent when worker cannot play more games (RFC 6455 'Try Again Later')
+CLOSE_TRY_AGAIN_LATER = 1013
+
+_search_limiter = None
+engine_pool = None
+engine_slots = None
+
+
+class ClientDisconnectedError(Exception):
+    '''
+    Raised when client disconnected before its request was handled.
+    '''
+
+
+def start_engine_pool():
+    global engine_pool, engine_slots
+    engine_pool = create_engine_pool(ENGINE_POOL_WORKERS)
+    # tasks passed to pool cannot be cancelled once pool process takes them, so only one task per process is passed
+    # to pool - the rest of them waits in event loop (semaphore has to be created inside running event loop)
+    engine_slots = asyncio.Semaphore(ENGINE_POOL_WORKERS)
+
+
+def stop_engine_pool():
+    global engine_pool
+    if engine_pool is not None:
+        engine_pool.shutdown(cancel_futures=True)
+        engine_pool = None
+
+
+async def wait_while_connected(request, awaitable):
+    '''
+    Waits for awaitable result as long as client is connected.
+
+    throws:
+        ClientDisconnectedError - when client disconnected before awaitable was done (awaitable is cancelled)
+    '''
+
+    task = asyncio.ensure_future(awaitable)
+    while True:
+        done, pending = await asyncio.wait({task}, timeout=DISCONNECT_CHECK_INTERVAL)
+        if done:
+            return task.result()
+        if await request.is_disconnected():
+            # awaitable could be done while connection was checked
+            if not task.cancel():
+                return task.result()
+            raise ClientDisconnectedError()
+
+
+async def run_engine_task(request, function, *args):
+    '''
+    Runs function in engine processes pool, when one of pool processes is free.
+
+    throws:
+        ClientDisconnectedError - when client disconnected before result was found (task that waits for free pool
+                                  process is cancelled, result of already running task is dropped)
+    '''
+
+    loop = asyncio.get_running_loop()
+    await wait_while_connected(request, engine_slots.acquire())
+
+    # pool process slot is released when process ends the task (even if nobody waits for its result)
+    engine_future = engine_pool.submit(function, *args)
+    engine_future.add_done_callback(lambda future: loop.call_soon_threadsafe(engine_slots.release))
+    return await wait_while_connected(request, asyncio.wrap_future(engine_future))
+
+
+async def handle_engine_request(request, endpoint, phase, get_engine_task, validator_class=TicTacToeRequestValidator):
+    '''
+    Handles engine move request (the same way as WSGI server does, but engine is run in processes pool).
+
+    args:
+        request         - type: Request     - received request
+        endpoint        - type: str         - endpoint name ('min-max', 'neural-network' or 'hybrid')
+        phase           - type: str         - name of engine phase ('search' or 'inference')
+        get_engine_task - type: function    - returns engine function, its arguments, details logged with slow
+                                              request and estimated cost for grid and validated request data
+        validator_class - type: class       - request validator class
+    '''
+
+    timer = PhaseTimer()
+
+    # request data prefetch of WSGI server works with any object that has 'form' mapping
+    with timer.phase("prefetch"):
+        request_data = prefetch_request_data(SimpleNamespace(form=await request.form()))
+
+    with timer.phase("validation"):
+        validator = validator_class(request_data)
+        validator_valid = validator.is_valid()
+
+    labels = get_request_labels(endpoint, request_data)
+    VALIDATION_LATENCY.labels(**labels).observe(timer.get_phase_time("validation"))
+    if not validator_valid:
+        observe_bad_request(endpoint, validator.errors)
+        response = JSONResponse(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+        return finish_request(endpoint, timer, labels, request_data, response)
+
+    grid = [int(field) for field in request_data['grid']]
+    function, args, details, cost = get_engine_task(grid, request_data)
+
+    # requests are admitted to lane chosen due to their estimated cost (engine pool is shared by all lanes)
+    lane = lane_scheduler.get_lane(cost)
+    details['lane'] = lane.name
+    try:
+        with lane.admit(), timer.phase(phase):
+            move = await run_engine_task(request, function, *args)
+    except LaneSaturatedError:
+        response = JSONResponse({'error': "Server is busy - try again later."},
+                                ResponseStatus.HTTP_503_SERVICE_UNAVAILABLE.value, headers={'Retry-After': "1"})
+        return finish_request(endpoint, timer, labels, request_data, response, **details)
+    except ResolverUnavailableError as error:
+        response = JSONResponse({'error': str(error)}, ResponseStatus.HTTP_503_SERVICE_UNAVAILABLE.value)
+        return finish_request(endpoint, timer, labels, request_data, response, **details)
+    except ClientDisconnectedError:
+        response = Response(status_code=ResponseStatus.HTTP_499_CLIENT_CLOSED_REQUEST.value)
+        return finish_request(endpoint, timer, labels, request_data, response, **details)
+    ENGINE_LATENCY.labels(**labels).observe(timer.get_phase_time(phase))
+
+    response = JSONResponse({'move': move}, ResponseStatus.HTTP_200_OK.value)
+    return finish_request(endpoint, timer, labels, request_data, response, move=move, **details)
+
+
+async def tic_tac_toe_min_max_request_handler(request):
+    '''
+    Handles request that is sent for '/tic-tac-toe/min-max' url.
+    '''
+
+    def get_engine_task(grid, request_data):
+        depth_limit, max_nodes = get_minmax_budget(request_data)
+        cost = estimate_minmax_cost(grid.count(0), depth_limit, max_nodes)
+        args = (grid, request_data['grid_size'], request_data['moving_player'], depth_limit, max_nodes)
+        return search_minmax_move, args, {'depth': depth_limit, 'max_nodes': max_nodes}, cost
+
+    return await handle_engine_request(request, "min-max", "search", get_engine_task)
+
+
+async def tic_tac_toe_neural_network_request_handler(request):
+    '''
+    Handles request that is sent for '/tic-tac-toe/neural-network' url.
+    '''
+
+    def get_engine_task(grid, request_data):
+        # value network predicts every child grid, policy network predicts single row
+        model = request_data['model'] or "value"
+        cost = estimate_neural_network_cost(1 if model == "policy" else grid.count(0))
+        args = (grid, request_data['grid_size'], request_data['moving_player'], model)
+        return predict_neural_network_move, args, {'model': model}, cost
+
+    return await handle_engine_request(
+        request, "neural-network", "inference", get_engine_task, NeuralNetworkRequestValidator
+    )
+
+
+async def tic_tac_toe_hybrid_request_handler(request):
+    '''
+    Handles request that is sent for '/tic-tac-toe/hybrid' url.
+    '''
+
+    def get_engine_task(grid, request_data):
+        depth_limit = request_data['max_depth']
+        if depth_limit is None:
+            depth_limit = HYBRID_TREE_PROCESSING_LIMITS[request_data['grid_size']]
+        cost = estimate_minmax_cost(grid.count(0), depth_limit, HYBRID_MAX_NODES)
+        args = (
+            grid, request_data['grid_size'], request_data['moving_player'], depth_limit, HYBRID_LEAF_BATCH_SIZE,
+            HYBRID_MAX_NODES, HYBRID_SEARCH_DEADLINE_S
+        )
+        return search_hybrid_move, args, {'depth': depth_limit}, cost
+
+    return await handle_engine_request(request, "hybrid", "search", get_engine_task, HybridRequestValidator)
+
+
+def get_search_limiter():
+    # limiter has to be created inside running event loop
+    global _search_limiter
+    if _search_limiter is None:
+        _search_limiter = anyio.CapacityLimiter(GAME_CHANNEL_MAX_SEARCHES)
+    return _search_limiter
+
+
+def parse_start_message(message):
+    '''
+    Parses game start message.
+
+    args:
+        message - type: dict    - received ASGI WebSocket message
+
+    returns:
+        dict - validated game parameters ('grid_size', 'engine_player', 'first_player', 'pondering')
+
+    throws:
+        ValidationError - when message is not correct start message
+    '''
+
+    if message.get("text") is None:
+        raise ValidationError("type", "Game has to be started with JSON 'start' message.")
+    try:
+        data = json.loads(message["text"])
+    except ValueError:
+        raise ValidationError("message", "Received message is not valid JSON.")
+    if not isinstance(data, dict) or data.get("type") != "start":
+        raise ValidationError("type", "Game has to be started with JSON 'start' message.")
+
+    request_data = {field: data.get(field, None) for field in ["grid_size", "engine_player", "first_player", "pondering"]}
+    validator = GameSessionRequestValidator(request_data)
+    if not validator.is_valid():
+        field, error_message = next(iter(validator.errors.items()))
+        raise ValidationError(field, error_message)
+
+    fields = validator.validated_data
+    return {
+        'grid_size': int(fields['grid_size']),
+        'engine_player': int(fields['engine_player']),
+        # 'X' player starts the game by default
+        'first_player': int(fields['first_player']) if fields['first_player'] is not None else 1,
+        'pondering': fields['pondering'] is not None and int(fields['pondering']) == 1,
+    }
+
+
+def parse_move_message(message):
+    '''
+    Parses opponent move message (JSON 'move' message or single byte binary message).
+
+    returns:
+        int - index of field marked by opponent
+
+    throws:
+        ValidationError - when message is not correct move message
+    '''
+
+    if message.get("bytes") is not None:
+        if len(message["bytes"]) != 1:
+            raise ValidationError("move", "Binary move message has to contain single byte.")
+        move = message["bytes"][0]
+    else:
+        try:
+            data = json.loads(message.get("text") or "")
+        except ValueError:
+            raise ValidationError("message", "Received message is not valid JSON.")
+        if not isinstance(data, dict) or data.get("type") != "move":
+            raise ValidationError("type", "Expected JSON 'move' message.")
+        move = data.get("move", None)
+        if type(move) != int:
+            raise ValidationError("move", "Field 'move' has to be an integer.")
+
+    validator = GameSessionMoveRequestValidator({'move': move})
+    if not validator.is_valid():
+        raise ValidationError("move", validator.errors["move"])
+    return move
+
+
+def encode_state_message(session, engine_move, binary):
+    '''
+    Encodes engine reply in format of received message.
+
+    returns:
+        bytes or str - binary or JSON message
+    '''
+
+    if binary:
+        return bytes([engine_move if engine_move is not None else NO_MOVE, GAME_STATUSES.index(session.get_game_status())])
+
+    state = session.to_dict()
+    state['type'] = "state"
+    state['move'] = engine_move
+    return json.dumps(state)
+
+
+async def send_message(websocket, message):
+    if isinstance(message, bytes):
+        await websocket.send_bytes(message)
+    else:
+        await websocket.send_text(message)
+
+
+async def send_error(websocket, error):
+    await websocket.send_text(json.dumps({'type': "error", 'errors': {error._field: error._message}}))
+
+
+async def run_search(function, *args):
+    # engine search runs in thread (C library releases GIL), only limited number of searches run at once
+    return await anyio.to_thread.run_sync(function, *args, limiter=get_search_limiter())
+
+
+async def start_game(websocket, game_sessions):
+    '''
+    Waits for valid start message and creates game session.
+
+    returns:
+        GameSession - created session or None when client disconnected or game could not be created
+    '''
+
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return None
+
+        try:
+            parameters = parse_start_message(message)
+        except ValidationError as error:
+            await send_error(websocket, error)
+            continue
+
+        try:
+            session, engine_move = await run_search(
+                lambda: game_sessions.create_session(
+                    parameters['grid_size'], parameters['engine_player'], parameters['first_player'],
+                    pondering=parameters['pondering']
+                )
+            )
+        except SessionLimitError as error:
+            await websocket.close(CLOSE_TRY_AGAIN_LATER, str(error))
+            return None
+
+        await send_message(websocket, encode_state_message(session, engine_move, False))
+        return session
+
+
+async def game_channel(websocket: WebSocket):
+    '''
+    Handles game channel connection - each message is processed before the next one is received, so client that
+    sends moves faster than engine replies is slowed down by transport flow control.
+    '''
+
+    await websocket.accept()
+    game_sessions = get_game_sessions()
+    session = await start_game(websocket, game_sessions)
+    if session is None:
+        return
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            binary = message.get("bytes") is not None
+            try:
+                move = parse_move_message(message)
+                engine_move = await run_search(game_sessions.play_opponent_move, session, move)
+            except ValidationError as error:
+                await send_error(websocket, error)
+                continue
+            await send_message(websocket, encode_state_message(session, engine_move, binary))
+    finally:
+        # game ends together with connection
+        await anyio.to_thread.run_sync(game_sessions.remove_session, session.session_id)
+
+
+application = Starlette(
+    routes=[
+        Route("/tic-tac-toe/min-max", tic_tac_toe_min_max_request_handler, methods=["POST"]),
+        Route("/tic-tac-toe/neural-network", tic_tac_toe_neural_network_request_handler, methods=["POST"]),
+        Route("/tic-tac-toe/hybrid", tic_tac_toe_hybrid_request_handler, methods=["POST"]),
+        WebSocketRoute("/tic-tac-toe/games", game_channel),
+        # the rest of routes is handled by WSGI server
+        Mount("/", app=WSGIMiddleware(server)),
+    ],
+    # engine processes are spawned, so threads started by server module (e.g. persistent store warm-up) are not copied
+    on_startup=[start_engine_pool],
+    on_shutdown=[stop_engine_pool],
+)
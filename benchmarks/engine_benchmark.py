@@ -0,0 +1,266 @@
+'''
+Min-Max engine search benchmark.
+
+Runs 'make_minmax_move' from compiled min-max library over a fixed, versioned suite of positions
+(see 'benchmarks/positions/') and reports wall time, analysed nodes, nodes per second and chosen moves.
+Results can be saved as JSON and compared with previously saved baseline. With '--perft' option
+node counts at fixed depths are compared with exact counts of reference implementation, so any
+search optimization can be verified against original tree expansion rules.
+
+Usage (from repository root):
+    python -m benchmarks.engine_benchmark [--suite FILE] [--repeat N] [--output FILE] [--baseline FILE]
+                                          [--max-slowdown PERCENT] [--perft] [--verify-reference] [--library FILE]
+'''
+import argparse
+import datetime
+import json
+import pathlib
+import statistics
+import sys
+import time
+
+from engine.board import get_winner
+from minmax.minmax_lib import MinMaxLibrary
+
+
+DEFAULT_SUITE_PATH = pathlib.Path(__file__).resolve().parent / "positions" / "minmax_suite_v1.json"
+
+
+# REFERENCE IMPLEMENTATION
+
+
+def count_reference_nodes(grid, grid_size, current_player, tree_depth_limit, node_depth=0):
+    '''
+    Counts min-max tree nodes exactly the way original 'minmax_analysis' expands the tree
+    (node is expanded when the game is not finished, free fields exist and node depth <= depth limit).
+
+    returns:
+        int - number of analysed tree nodes (root included)
+    '''
+
+    if get_winner(grid, grid_size) != 0:
+        return 1
+
+    free_fields = [i for i in range(grid_size * grid_size) if grid[i] == 0]
+    if len(free_fields) == 0 or node_depth > tree_depth_limit:
+        return 1
+
+    nodes = 1
+    next_player = 2 if current_player == 1 else 1
+    for field in free_fields:
+        grid[field] = current_player
+        nodes += count_reference_nodes(grid, grid_size, next_player, tree_depth_limit, node_depth + 1)
+        grid[field] = 0
+    return nodes
+
+
+# BENCHMARK
+
+
+def load_suite(suite_path):
+    with open(suite_path, "r") as suite_file:
+        return json.load(suite_file)
+
+
+def parse_grid(grid_state):
+    return [int(field) for field in grid_state]
+
+
+def run_position(library, position, depth, repeat):
+    '''
+    Runs min-max search for single suite position and depth 'repeat' times.
+
+    returns:
+        dict - benchmark result for given position (median wall time is reported)
+    '''
+
+    grid = parse_grid(position["grid"])
+    times, moves, nodes = [], [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        moves.append(library.make_move(grid, position["grid_size"], position["moving_player"], depth))
+        times.append(time.perf_counter() - start)
+        nodes = library.get_processed_nodes_number()
+
+    wall_time = statistics.median(times)
+    return {
+        'id': position["id"],
+        'grid': position["grid"],
+        'grid_size': position["grid_size"],
+        'moving_player': position["moving_player"],
+        'depth': depth,
+        'move': moves[-1],
+        'moves': sorted(set(moves)),
+        'nodes': nodes,
+        'wall_time_s': wall_time,
+        'times_s': times,
+        'nodes_per_second': nodes / wall_time if wall_time > 0 else None,
+    }
+
+
+def run_benchmark(library, suite, repeat):
+    results = []
+    for position in suite["positions"]:
+        for depth in position["depths"]:
+            results.append(run_position(library, position, depth, repeat))
+    return results
+
+
+def run_perft(library, suite, verify_reference):
+    '''
+    Compares node counts of min-max library with exact counts stored in suite (perft-style check).
+
+    returns:
+        list - perft check results (each one contains expected and received nodes number)
+    '''
+
+    checks = []
+    for entry in suite["perft"]:
+        grid = parse_grid(entry["grid"])
+        library.make_move(grid, entry["grid_size"], entry["moving_player"], entry["depth"])
+        nodes = library.get_processed_nodes_number()
+
+        expected_nodes = entry["nodes"]
+        if verify_reference:
+            expected_nodes = count_reference_nodes(grid, entry["grid_size"], entry["moving_player"], entry["depth"])
+            if expected_nodes != entry["nodes"]:
+                raise ValueError("Suite perft entry '{entry_id}' differs from reference implementation \
+({stored} != {reference})".format(entry_id=entry["id"], stored=entry["nodes"], reference=expected_nodes))
+
+        checks.append({
+            'id': entry["id"],
+            'depth': entry["depth"],
+            'expected_nodes': expected_nodes,
+            'nodes': nodes,
+            'passed': nodes == expected_nodes,
+        })
+    return checks
+
+
+def compare_with_baseline(results, baseline, max_slowdown):
+    '''
+    Compares benchmark results with baseline ones (matched by position id and depth).
+
+    returns:
+        list - comparison entries, each one with time change (in percent), nodes and move equality
+    '''
+
+    baseline_results = {(result["id"], result["depth"]): result for result in baseline["results"]}
+
+    comparison = []
+    for result in results:
+        reference = baseline_results.get((result["id"], result["depth"]), None)
+        if reference is None:
+            continue
+
+        time_change = (result["wall_time_s"] / reference["wall_time_s"] - 1.0) * 100.0 if reference["wall_time_s"] > 0 else 0.0
+        comparison.append({
+            'id': result["id"],
+            'depth': result["depth"],
+            'baseline_wall_time_s': reference["wall_time_s"],
+            'wall_time_s': result["wall_time_s"],
+            'time_change_percent': time_change,
+            'nodes_match': result["nodes"] == reference["nodes"],
+            'move_match': result["move"] == reference["move"],
+            'regression': max_slowdown is not None and time_change > max_slowdown,
+        })
+    return comparison
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in [header] + [row[i] for row in rows]) for i, header in enumerate(headers)]
+    print("  ".join(str(header).ljust(widths[i]) for i, header in enumerate(headers)))
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(str(value).ljust(widths[i]) for i, value in enumerate(row)))
+    print()
+
+
+def print_report(report):
+    print("Suite: {name} (version {version}), library: {library}\n".format(
+        name=report["suite"], version=report["suite_version"], library=report["library"]
+    ))
+
+    if report["results"]:
+        print_table(
+            ["position", "size", "depth", "move", "nodes", "time [ms]", "nodes/s"],
+            [[
+                result["id"], result["grid_size"], result["depth"], result["move"], result["nodes"],
+                "{:.2f}".format(result["wall_time_s"] * 1000.0),
+                "{:.0f}".format(result["nodes_per_second"] or 0),
+            ] for result in report["results"]]
+        )
+
+    if report["perft"]:
+        print_table(
+            ["perft", "depth", "expected", "nodes", "status"],
+            [[
+                check["id"], check["depth"], check["expected_nodes"], check["nodes"], "OK" if check["passed"] else "MISMATCH"
+            ] for check in report["perft"]]
+        )
+
+    if report["comparison"]:
+        print_table(
+            ["position", "depth", "baseline [ms]", "time [ms]", "change", "nodes", "move"],
+            [[
+                entry["id"], entry["depth"],
+                "{:.2f}".format(entry["baseline_wall_time_s"] * 1000.0),
+                "{:.2f}".format(entry["wall_time_s"] * 1000.0),
+                "{:+.1f}%".format(entry["time_change_percent"]) + (" REGRESSION" if entry["regression"] else ""),
+                "same" if entry["nodes_match"] else "DIFFERENT",
+                "same" if entry["move_match"] else "different",
+            ] for entry in report["comparison"]]
+        )
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Min-Max engine search benchmark.")
+    parser.add_argument("--suite", default=str(DEFAULT_SUITE_PATH), help="positions suite file")
+    parser.add_argument("--library", default=None, help="path to compiled 'minmax.so' library")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs for each position (median is reported)")
+    parser.add_argument("--output", default=None, help="file where JSON results are saved")
+    parser.add_argument("--baseline", default=None, help="JSON results file to compare with")
+    parser.add_argument("--max-slowdown", type=float, default=None, help="allowed slowdown in percent against baseline")
+    parser.add_argument("--perft", action="store_true", help="run only perft-style node counts check")
+    parser.add_argument("--verify-reference", action="store_true", help="recompute perft counts with reference implementation")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+
+    suite = load_suite(arguments.suite)
+    library = MinMaxLibrary(arguments.library)
+
+    report = {
+        'suite': suite["name"],
+        'suite_version': suite["version"],
+        'library': library.library_path,
+        'created_at': datetime.datetime.now().isoformat(),
+        'results': [],
+        'perft': run_perft(library, suite, arguments.verify_reference),
+        'comparison': [],
+    }
+
+    if not arguments.perft:
+        report["results"] = run_benchmark(library, suite, arguments.repeat)
+
+    if arguments.baseline is not None:
+        with open(arguments.baseline, "r") as baseline_file:
+            baseline = json.load(baseline_file)
+        report["comparison"] = compare_with_baseline(report["results"], baseline, arguments.max_slowdown)
+
+    print_report(report)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    # non-zero exit code means that optimized library does not analyse the same tree or it is too slow
+    failed = not all(check["passed"] for check in report["perft"])
+    failed = failed or any(not entry["nodes_match"] or entry["regression"] for entry in report["comparison"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
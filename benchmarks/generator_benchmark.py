@@ -0,0 +1,95 @@
+'''
+Random games data generators benchmark.
+
+Runs compiled random games generators ('data_generator/generator_NxN') with binary output and reports simulated
+games and written records per second for each board size (the best of repeated runs). Generators of other build
+(e.g. of older revision) can be compared with '--baseline-directory' option.
+
+Usage (from repository root, generators have to be built with 'make -C data_generator'):
+    python -m benchmarks.generator_benchmark [--sizes 4,5] [--games 200000] [--threads 1] [--repeat 3]
+                                             [--directory DIR] [--baseline-directory DIR]
+'''
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.engine_benchmark import print_table
+from neural_network.dataset import read_header
+
+
+DATA_GENERATOR_PATH = pathlib.Path(__file__).resolve().parent.parent / "data_generator"
+
+
+def run_generator(generator_path, games_number, threads_number, seed):
+    '''
+    returns:
+        tuple - (run time in seconds, number of written records)
+    '''
+
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = str(pathlib.Path(directory) / "data.bin")
+        start = time.perf_counter()
+        subprocess.run(
+            [str(generator_path), str(games_number), output_path, "--binary", "--threads", str(threads_number),
+             "--seed", str(seed)],
+            stdout=subprocess.DEVNULL, check=True
+        )
+        run_time = time.perf_counter() - start
+        return run_time, read_header(output_path)[1]
+
+
+def measure_generator(generator_path, arguments):
+    '''
+    returns:
+        list - games per second and records per second of the fastest run
+    '''
+
+    runs = [
+        run_generator(generator_path, arguments.games, arguments.threads, seed) for seed in range(arguments.repeat)
+    ]
+    run_time, records_number = min(runs)
+    return [arguments.games / run_time, records_number / run_time]
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Random games data generators benchmark.")
+    parser.add_argument("--sizes", default="4,5", help="comma separated board sizes")
+    parser.add_argument("--games", type=int, default=200000, help="number of games simulated by each run")
+    parser.add_argument("--threads", type=int, default=1, help="number of generator threads")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each generator")
+    parser.add_argument("--directory", default=str(DATA_GENERATOR_PATH), help="directory of benchmarked generators")
+    parser.add_argument("--baseline-directory", default=None, help="directory of compared generators")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+
+    rows = []
+    for size in [int(value) for value in arguments.sizes.split(",")]:
+        generator_name = "generator_{size}x{size}".format(size=size)
+        games_per_second, records_per_second = measure_generator(
+            pathlib.Path(arguments.directory) / generator_name, arguments
+        )
+        row = [generator_name, "{:.0f}".format(games_per_second), "{:.0f}".format(records_per_second)]
+        if arguments.baseline_directory is not None:
+            baseline_games_per_second = measure_generator(
+                pathlib.Path(arguments.baseline_directory) / generator_name, arguments
+            )[0]
+            row += ["{:.0f}".format(baseline_games_per_second), "{:.2f}x".format(
+                games_per_second / baseline_games_per_second
+            )]
+        rows.append(row)
+
+    headers = ["generator", "games/s", "records/s"]
+    if arguments.baseline_directory is not None:
+        headers += ["baseline games/s", "speedup"]
+    print_table(headers, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
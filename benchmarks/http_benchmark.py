@@ -0,0 +1,279 @@
+'''
+HTTP load-test and latency benchmark for '/tic-tac-toe/min-max' and '/tic-tac-toe/neural-network' endpoints.
+
+Replays a reproducible mix of positions (taken from simulated games, so every move number is represented)
+either through WSGI application in-process (Flask test client) or against running server, e.g. local gunicorn.
+For each concurrency level throughput and p50/p95/p99 latencies per endpoint, grid size and move number
+are reported as a table and (optionally) as JSON file, so results can be tracked between versions.
+
+Usage (from repository root):
+    python -m benchmarks.http_benchmark [--url http://127.0.0.1:8000] [--endpoints min-max,neural-network]
+                                        [--grid-sizes 3,4,5] [--concurrency 1,4,16] [--requests 200]
+                                        [--max-move-number N] [--seed 0] [--output FILE]
+'''
+import argparse
+import datetime
+import json
+import math
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.engine_benchmark import print_table
+from engine.board import get_winner
+
+
+ENDPOINTS = {
+    'min-max': "/tic-tac-toe/min-max",
+    'neural-network': "/tic-tac-toe/neural-network",
+}
+
+
+# POSITIONS MIX
+
+
+def simulate_game_positions(grid_size, rng):
+    '''
+    Plays single random game and returns all positions (with moving player) that server may be asked about.
+
+    returns:
+        list - (grid, moving_player, move_number) tuples
+    '''
+
+    grid = [0] * (grid_size * grid_size)
+    moving_player = rng.randint(1, 2)
+    positions = []
+
+    for move_number in range(grid_size * grid_size):
+        positions.append(("".join(str(field) for field in grid), moving_player, move_number))
+
+        free_fields = [i for i in range(grid_size * grid_size) if grid[i] == 0]
+        grid[rng.choice(free_fields)] = moving_player
+        if get_winner(grid, grid_size) != 0:
+            break
+        moving_player = 2 if moving_player == 1 else 1
+
+    return positions
+
+
+def build_positions_mix(grid_sizes, endpoints, requests_number, max_move_number, seed):
+    '''
+    Builds reproducible list of requests - positions are spread evenly between endpoints and grid sizes.
+
+    returns:
+        list - request descriptions (endpoint, grid_size, move_number and form data)
+    '''
+
+    rng = random.Random(seed)
+    combinations = [(endpoint, grid_size) for endpoint in endpoints for grid_size in grid_sizes]
+
+    requests = []
+    for i in range(requests_number):
+        endpoint, grid_size = combinations[i % len(combinations)]
+
+        positions = simulate_game_positions(grid_size, rng)
+        if max_move_number is not None:
+            positions = [position for position in positions if position[2] <= max_move_number]
+        grid, moving_player, move_number = rng.choice(positions)
+
+        requests.append({
+            'endpoint': endpoint,
+            'grid_size': grid_size,
+            'move_number': move_number,
+            'data': {'grid': grid, 'grid_size': grid_size, 'moving_player': moving_player},
+        })
+    return requests
+
+
+# REQUEST SENDERS
+
+
+class InProcessSender():
+    '''
+    Sends requests directly to WSGI application (each thread uses its own Flask test client).
+    '''
+
+    def __init__(self):
+        from server import server
+        self._server = server
+        self._local = threading.local()
+
+    def send(self, path, data):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._server.test_client()
+        return client.post(path, data=data).status_code
+
+
+# statuses of requests that got no HTTP response (they are counted as errors, with their latency)
+CONNECTION_ERROR_STATUS = "connection-error"
+TIMEOUT_STATUS = "timeout"
+
+
+class HttpSender():
+    '''
+    Sends requests to running server (e.g. local gunicorn) as urlencoded forms - requests refused, reset or timed out
+    by overloaded server are reported with connection error or timeout status.
+    '''
+
+    def __init__(self, url, timeout):
+        self._url = url.rstrip("/")
+        self._timeout = timeout
+
+    def send(self, path, data):
+        body = urllib.parse.urlencode(data).encode()
+        try:
+            with urllib.request.urlopen(self._url + path, data=body, timeout=self._timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+        except (urllib.error.URLError, OSError) as error:
+            # timeout of connection is wrapped in URLError, timeout of response reading is not
+            reason = getattr(error, "reason", error)
+            return TIMEOUT_STATUS if isinstance(reason, (socket.timeout, TimeoutError)) else CONNECTION_ERROR_STATUS
+
+
+# MEASUREMENTS
+
+
+def percentile(values, percent):
+    '''
+    Finds percentile of given values (nearest-rank method).
+    '''
+
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100.0 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples):
+    latencies = [sample["latency_s"] for sample in samples]
+    return {
+        'requests': len(samples),
+        'errors': len([sample for sample in samples if sample["status"] != 200]),
+        'p50_ms': percentile(latencies, 50) * 1000.0,
+        'p95_ms': percentile(latencies, 95) * 1000.0,
+        'p99_ms': percentile(latencies, 99) * 1000.0,
+        'max_ms': max(latencies) * 1000.0,
+    }
+
+
+def group_samples(samples, keys):
+    groups = {}
+    for sample in samples:
+        groups.setdefault(tuple(sample[key] for key in keys), []).append(sample)
+
+    summary = []
+    for group_key in sorted(groups):
+        entry = dict(zip(keys, group_key))
+        entry.update(summarize(groups[group_key]))
+        summary.append(entry)
+    return summary
+
+
+def run_concurrency_level(sender, requests, concurrency):
+    '''
+    Sends all requests using 'concurrency' parallel clients.
+
+    returns:
+        dict - throughput and latency summaries for given concurrency level
+    '''
+
+    def send_request(request):
+        start = time.perf_counter()
+        status = sender.send(ENDPOINTS[request["endpoint"]], request["data"])
+        return {
+            'endpoint': request["endpoint"],
+            'grid_size': request["grid_size"],
+            'move_number': request["move_number"],
+            'status': status,
+            'latency_s': time.perf_counter() - start,
+        }
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(send_request, requests))
+    duration = time.perf_counter() - start
+
+    return {
+        'concurrency': concurrency,
+        'duration_s': duration,
+        'throughput_rps': len(samples) / duration if duration > 0 else None,
+        'overall': summarize(samples),
+        'by_grid_size': group_samples(samples, ["endpoint", "grid_size"]),
+        'by_move_number': group_samples(samples, ["endpoint", "grid_size", "move_number"]),
+    }
+
+
+def print_report(report):
+    for level in report["levels"]:
+        print("Concurrency: {concurrency}, throughput: {throughput:.1f} req/s, errors: {errors}".format(
+            concurrency=level["concurrency"], throughput=level["throughput_rps"] or 0, errors=level["overall"]["errors"]
+        ))
+        print_table(
+            ["endpoint", "size", "requests", "p50 [ms]", "p95 [ms]", "p99 [ms]", "max [ms]"],
+            [[
+                entry["endpoint"], entry["grid_size"], entry["requests"], "{:.2f}".format(entry["p50_ms"]),
+                "{:.2f}".format(entry["p95_ms"]), "{:.2f}".format(entry["p99_ms"]), "{:.2f}".format(entry["max_ms"]),
+            ] for entry in level["by_grid_size"]]
+        )
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item != ""]
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="HTTP load-test and latency benchmark for tic-tac-toe endpoints.")
+    parser.add_argument("--url", default=None, help="server url (WSGI application is called in-process when not set)")
+    parser.add_argument("--endpoints", default="min-max,neural-network", help="comma separated endpoints to benchmark")
+    parser.add_argument("--grid-sizes", default="3,4,5", help="comma separated grid sizes")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="number of requests for each concurrency level")
+    parser.add_argument("--max-move-number", type=int, default=None, help="skip positions with more marks than given")
+    parser.add_argument("--seed", type=int, default=0, help="seed of positions mix")
+    parser.add_argument("--timeout", type=float, default=60.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--output", default=None, help="file where JSON results are saved")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+
+    endpoints = parse_list(arguments.endpoints, str)
+    for endpoint in endpoints:
+        if endpoint not in ENDPOINTS:
+            raise ValueError("Unknown endpoint '{endpoint}'.".format(endpoint=endpoint))
+
+    requests = build_positions_mix(
+        parse_list(arguments.grid_sizes, int), endpoints, arguments.requests, arguments.max_move_number, arguments.seed
+    )
+    sender = InProcessSender() if arguments.url is None else HttpSender(arguments.url, arguments.timeout)
+
+    report = {
+        'target': arguments.url or "in-process",
+        'created_at': datetime.datetime.now().isoformat(),
+        'seed': arguments.seed,
+        'levels': [
+            run_concurrency_level(sender, requests, concurrency)
+            for concurrency in parse_list(arguments.concurrency, int)
+        ],
+    }
+
+    print_report(report)
+
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
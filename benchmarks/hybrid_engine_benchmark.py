@@ -0,0 +1,131 @@
+'''
+Hybrid engine benchmark.
+
+Compares strength and move latency of pure min-max engine (library with line-count heuristic at depth cutoff),
+pure neural network engine and hybrid engine (min-max search with neural network leaves scores) at given depths
+and leaf batch sizes. Every engine plays the same number of games against the same opponent (random player
+or shallow min-max search), half of them as 'X' player, and both players start half of the games.
+
+Usage (from repository root, trained value network model of grid size has to exist):
+    python -m benchmarks.hybrid_engine_benchmark [--grid-size 4] [--depths 1,2,3] [--leaf-batch-sizes 256,4096]
+                                                 [--minmax-depth 5] [--games 20] [--opponent random|minmax]
+                                                 [--opponent-depth 1] [--seed 0]
+'''
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.engine_benchmark import print_table
+from benchmarks.http_benchmark import percentile
+from engine.board import GAME_IN_PROGRESS, GAME_O_WON, GAME_X_WON, get_free_fields, get_game_status, get_opponent
+from engine.hybrid import HybridSearch
+from engine.process_pool import NEURAL_NETWORK_MODELS
+from minmax.minmax_lib import MINMAX_LIBRARY_PATH, MinMaxLibrary
+from neural_network.neural_network_cls import NeuralNetworkSklearn as NeuralNetwork
+
+
+def play_game(engine, opponent, grid_size, engine_player, first_player):
+    '''
+    Plays single game of engine against opponent.
+
+    returns:
+        tuple - (game result for engine: 1 - win, 0 - draw, -1 - loss, engine moves times in seconds)
+    '''
+
+    grid = [0] * (grid_size * grid_size)
+    moving_player, moves_times = first_player, []
+    while get_game_status(grid, grid_size) == GAME_IN_PROGRESS:
+        if moving_player == engine_player:
+            start = time.perf_counter()
+            move = engine(grid, grid_size, moving_player)
+            moves_times.append(time.perf_counter() - start)
+        else:
+            move = opponent(grid, grid_size, moving_player)
+        grid[move] = moving_player
+        moving_player = get_opponent(moving_player)
+
+    status = get_game_status(grid, grid_size)
+    if status not in [GAME_X_WON, GAME_O_WON]:
+        return 0, moves_times
+    return (1 if (status == GAME_X_WON) == (engine_player == 1) else -1), moves_times
+
+
+def run_engine(engine, opponent, grid_size, games_number):
+    '''
+    returns:
+        list - wins, draws, losses, mean and 95th percentile of move latency (in milliseconds)
+    '''
+
+    results, moves_times = [], []
+    for game in range(games_number):
+        result, game_moves_times = play_game(engine, opponent, grid_size, 1 + game % 2, 1 + game // 2 % 2)
+        results.append(result)
+        moves_times += game_moves_times
+    return [
+        results.count(1), results.count(0), results.count(-1),
+        "{:.2f}".format(statistics.mean(moves_times) * 1000), "{:.2f}".format(percentile(moves_times, 95) * 1000)
+    ]
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Hybrid engine strength and latency benchmark.")
+    parser.add_argument("--grid-size", type=int, default=4, choices=[3, 4, 5], help="grid size of games")
+    parser.add_argument("--depths", default="1,2,3", help="comma separated depth limits of hybrid engine")
+    parser.add_argument("--leaf-batch-sizes", default="256,4096", help="comma separated leaf batch sizes")
+    parser.add_argument("--minmax-depth", type=int, default=5, help="depth limit of pure min-max engine")
+    parser.add_argument("--games", type=int, default=20, help="number of games played by each engine")
+    parser.add_argument("--opponent", default="random", choices=["random", "minmax"], help="opponent of engines")
+    parser.add_argument("--opponent-depth", type=int, default=1, help="depth limit of min-max opponent")
+    parser.add_argument("--seed", type=int, default=0, help="random opponent seed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    grid_size = arguments.grid_size
+
+    configuration, model_path = NEURAL_NETWORK_MODELS[grid_size]
+    neural_network = NeuralNetwork(configuration)
+    if not neural_network.load_model(model_path):
+        print("Model file '{path}' does not exist.".format(path=model_path))
+        return 1
+    minmax_library = MinMaxLibrary() if MINMAX_LIBRARY_PATH.exists() else None
+    if minmax_library is None and arguments.opponent == "minmax":
+        print("Min-max library is not built.")
+        return 1
+
+    engines = [("neural-network", neural_network.make_move)]
+    if minmax_library is not None:
+        engines.insert(0, ("min-max depth={depth}".format(depth=arguments.minmax_depth), (
+            lambda grid, grid_size, player: minmax_library.make_move(grid, grid_size, player, arguments.minmax_depth)
+        )))
+    for depth in [int(value) for value in arguments.depths.split(",")]:
+        for leaf_batch_size in [int(value) for value in arguments.leaf_batch_sizes.split(",")]:
+            hybrid_search = HybridSearch(neural_network.predict, leaf_batch_size)
+            engines.append((
+                "hybrid depth={depth} batch={batch}".format(depth=depth, batch=leaf_batch_size),
+                lambda grid, grid_size, player, search=hybrid_search, depth=depth: search.make_move(
+                    grid, grid_size, player, depth
+                )
+            ))
+
+    rows = []
+    for name, engine in engines:
+        # every engine plays against the same random moves sequence
+        rng = random.Random(arguments.seed)
+        if arguments.opponent == "random":
+            def opponent(grid, grid_size, player):
+                return rng.choice(get_free_fields(grid, grid_size))
+        else:
+            def opponent(grid, grid_size, player):
+                return minmax_library.make_move(grid, grid_size, player, arguments.opponent_depth)
+        rows.append([name] + run_engine(engine, opponent, grid_size, arguments.games))
+
+    print_table(["engine", "wins", "draws", "losses", "mean move [ms]", "p95 move [ms]"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+'''
+Neural network inference micro-batching benchmark.
+
+Runs neural network moves of reproducible positions mix from many concurrent clients (threads) - once with
+every client predicting its own rows and once with rows of all clients batched by 'InferenceBatcher'.
+For each concurrency level throughput of both modes, their ratio and average batch size are reported.
+
+Usage (from repository root, trained model of grid size has to exist):
+    python -m benchmarks.inference_batching_benchmark [--grid-size 4] [--concurrency 50,100,200,500]
+                                                      [--requests 2000] [--max-wait-ms 2] [--max-rows 512]
+'''
+import argparse
+import random
+import sys
+import threading
+import time
+
+from benchmarks.engine_benchmark import print_table
+from benchmarks.http_benchmark import simulate_game_positions
+from engine.process_pool import NEURAL_NETWORK_MODELS
+from neural_network.batching import InferenceBatcher
+from neural_network.neural_network_cls import NeuralNetworkSklearn as NeuralNetwork
+
+
+def build_positions(grid_size, positions_number, seed):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < positions_number:
+        grid, moving_player, move_number = rng.choice(simulate_game_positions(grid_size, rng))
+        positions.append(([int(field) for field in grid], moving_player))
+    return positions
+
+
+def run_clients(neural_network, grid_size, positions, concurrency, predict=None):
+    '''
+    Makes neural network moves of all positions with given number of client threads.
+
+    returns:
+        float - throughput (moves per second)
+    '''
+
+    next_position = iter(positions)
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                position = next(next_position, None)
+            if position is None:
+                return
+            neural_network.make_move(position[0], grid_size, position[1], predict=predict)
+
+    threads = [threading.Thread(target=client) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(positions) / (time.perf_counter() - start)
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Neural network inference micro-batching benchmark.")
+    parser.add_argument("--grid-size", type=int, default=4, choices=[3, 4, 5], help="grid size of neural network")
+    parser.add_argument("--concurrency", default="50,100,200,500", help="comma separated numbers of concurrent clients")
+    parser.add_argument("--requests", type=int, default=2000, help="number of moves made at each concurrency level")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="max. time of waiting for batch rows")
+    parser.add_argument("--max-rows", type=int, default=512, help="max. number of batch rows")
+    parser.add_argument("--seed", type=int, default=0, help="positions mix seed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+
+    configuration, model_path = NEURAL_NETWORK_MODELS[arguments.grid_size]
+    neural_network = NeuralNetwork(configuration)
+    if not neural_network.load_model(model_path):
+        print("Model file '{path}' does not exist.".format(path=model_path))
+        return 1
+
+    positions = build_positions(arguments.grid_size, arguments.requests, arguments.seed)
+    batches = {'batches': 0, 'requests': 0}
+
+    def count_batch(requests_number, rows_number):
+        batches['batches'] += 1
+        batches['requests'] += requests_number
+
+    batcher = InferenceBatcher(
+        neural_network.predict, arguments.max_wait_ms / 1000.0, arguments.max_rows, on_batch=count_batch
+    )
+
+    rows = []
+    for concurrency in [int(value) for value in arguments.concurrency.split(",")]:
+        unbatched = run_clients(neural_network, arguments.grid_size, positions, concurrency)
+        batches.update({'batches': 0, 'requests': 0})
+        batched = run_clients(neural_network, arguments.grid_size, positions, concurrency, predict=batcher.predict)
+        rows.append([
+            concurrency, "{:.0f}".format(unbatched), "{:.0f}".format(batched), "{:.2f}x".format(batched / unbatched),
+            "{:.1f}".format(batches['requests'] / max(batches['batches'], 1))
+        ])
+
+    print_table(["clients", "unbatched [moves/s]", "batched [moves/s]", "gain", "requests/batch"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+'''
+Slow requests replay tool.
+
+Reads slow requests logs written by server processes (see 'metrics/slow_requests.py', rotated files included)
+and re-runs logged boards with the same engine under cProfile. Profiling statistics are printed for
+each replayed request and can be saved for later analysis (e.g. with 'snakeviz' or 'pstats').
+
+Usage (from repository root):
+    python -m benchmarks.replay_slow_requests [--log FILE] [--limit N] [--endpoint min-max|neural-network|hybrid]
+                                              [--sort cumulative] [--top 25] [--profile-dir DIR]
+'''
+import argparse
+import cProfile
+import glob
+import json
+import pathlib
+import pstats
+import re
+import sys
+
+from metrics.slow_requests import SLOW_REQUEST_LOG_PATH
+
+
+def get_log_files(log_path):
+    '''
+    Finds log file and its rotated backups ('<log file>.<number>').
+
+    returns:
+        list - paths of existing files
+    '''
+
+    backups = [path for path in glob.glob(glob.escape(log_path) + ".*") if path.rsplit(".", 1)[1].isdigit()]
+    return [path for path in backups + [log_path] if pathlib.Path(path).exists()]
+
+
+def read_slow_requests(log_path):
+    '''
+    Reads slow requests from log files of all server processes ('<log stem>.<pid><log suffix>') and from log file
+    shared by processes (written by older servers) - requests are ordered by time of logging.
+
+    returns:
+        list - logged requests (dictionaries)
+    '''
+
+    path = pathlib.Path(log_path)
+    process_logs = [
+        process_log for process_log in glob.glob(str(path.with_name(glob.escape(path.stem) + ".*" + path.suffix)))
+        if re.fullmatch(re.escape(path.stem) + r"\.\d+" + re.escape(path.suffix), pathlib.Path(process_log).name)
+    ]
+
+    log_files = []
+    for base_path in [log_path] + sorted(process_logs):
+        log_files += get_log_files(base_path)
+
+    entries = []
+    for log_file_path in dict.fromkeys(log_files):
+        with open(log_file_path, "r") as log_file:
+            for line in log_file:
+                if line.strip() != "":
+                    entries.append(json.loads(line))
+    return sorted(entries, key=lambda entry: entry["time"])
+
+
+def get_engine_call(entry, minmax_library):
+    '''
+    Prepares engine call that reproduces logged request.
+
+    returns:
+        function - engine call without arguments (returns found move)
+    '''
+
+    grid = [int(field) for field in entry["grid"]]
+    grid_size, moving_player = entry["grid_size"], entry["moving_player"]
+
+    if entry["endpoint"] == "min-max":
+        return lambda: minmax_library.make_move(grid, grid_size, moving_player, entry["depth"], entry.get("max_nodes"))
+
+    import server
+    if entry["endpoint"] == "hybrid":
+        from engine.hybrid import HybridSearch
+        hybrid_search = HybridSearch(server.neural_networks[grid_size].predict, server.HYBRID_LEAF_BATCH_SIZE)
+        return lambda: hybrid_search.make_move(grid, grid_size, moving_player, entry["depth"])
+
+    if entry.get("model") == "policy":
+        network = server.policy_networks[grid_size]
+    else:
+        network = getattr(server, "neural_network_{size}x{size}".format(size=grid_size))
+    return lambda: network.make_move(grid, grid_size, moving_player)
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Replays logged slow requests under cProfile.")
+    parser.add_argument("--log", default=SLOW_REQUEST_LOG_PATH, help="slow requests log file")
+    parser.add_argument("--limit", type=int, default=None, help="replay only the last N requests")
+    parser.add_argument("--endpoint", default=None, help="replay only requests of given endpoint")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key")
+    parser.add_argument("--top", type=int, default=25, help="number of printed profile entries")
+    parser.add_argument("--profile-dir", default=None, help="directory where '.prof' files are saved")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+
+    entries = [
+        entry for entry in read_slow_requests(arguments.log)
+        if entry.get("status", 200) == 200 and (arguments.endpoint is None or entry["endpoint"] == arguments.endpoint)
+    ]
+    if arguments.limit is not None:
+        entries = entries[-arguments.limit:]
+
+    minmax_library = None
+    if any(entry["endpoint"] == "min-max" for entry in entries):
+        from minmax.minmax_lib import MinMaxLibrary
+        minmax_library = MinMaxLibrary()
+
+    for i, entry in enumerate(entries):
+        engine_call = get_engine_call(entry, minmax_library)
+
+        profile = cProfile.Profile()
+        move = profile.runcall(engine_call)
+
+        print("[{index}] {endpoint} grid={grid} size={grid_size} player={moving_player} logged={total:.1f} ms \
+phases={phases} move={move} (logged move: {logged_move})".format(
+            index=i, endpoint=entry["endpoint"], grid=entry["grid"], grid_size=entry["grid_size"],
+            moving_player=entry["moving_player"], total=entry["total_ms"], phases=entry["phases_ms"],
+            move=move, logged_move=entry.get("move", None)
+        ))
+        pstats.Stats(profile, stream=sys.stdout).sort_stats(arguments.sort).print_stats(arguments.top)
+
+        if arguments.profile_dir is not None:
+            pathlib.Path(arguments.profile_dir).mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(pathlib.Path(arguments.profile_dir) / "slow_request_{index}.prof".format(index=i)))
+
+    print("Replayed {number} slow requests.".format(number=len(entries)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#include <stdint.h>
+#include "generator.h"
+
+/**
+ * Adds line to board lines and to lines crossing its fields.
+ * @param board Board geometry.
+ * @param mask Line fields mask.
+ */
+static void add_line(board_t* board, uint32_t mask)
+{
+    board -> lines_masks[board -> lines_number++] = mask;
+    for (int field = 0; field < board -> fields_number; field++) {
+        if (mask & (1U << field)) {
+            board -> field_lines_masks[field][board -> field_lines_numbers[field]++] = mask;
+        }
+    }
+}
+
+/**
+ * Prepares board geometry - masks of all lines (rows, columns and diagonals) and of lines crossing every field.
+ * @param board Board geometry.
+ * @param size Size of board (max. 'MAX_BOARD_SIZE').
+ */
+void prepare_board(board_t* board, int size)
+{
+    board -> size = size;
+    board -> fields_number = size * size;
+    board -> full_mask = (uint32_t) ((1ULL << board -> fields_number) - 1);
+    board -> lines_number = 0;
+    for (int field = 0; field < board -> fields_number; field++) {
+        board -> field_lines_numbers[field] = 0;
+    }
+
+    uint32_t first_diagonal = 0, second_diagonal = 0;
+    for (int i = 0; i < size; i++) {
+        uint32_t row = 0, column = 0;
+        for (int j = 0; j < size; j++) {
+            row |= 1U << (i * size + j);
+            column |= 1U << (j * size + i);
+        }
+        add_line(board, row);
+        add_line(board, column);
+        first_diagonal |= 1U << (i * size + i);
+        second_diagonal |= 1U << (i * size + size - i - 1);
+    }
+    add_line(board, first_diagonal);
+    add_line(board, second_diagonal);
+}
+
+/**
+ * Checks whether player has taken full line of board.
+ * @param board Board geometry.
+ * @param mask Player fields mask.
+ * @returns Information whether player won.
+ */
+int has_won(board_t* board, uint32_t mask)
+{
+    for (int line = 0; line < board -> lines_number; line++) {
+        if ((mask & board -> lines_masks[line]) == board -> lines_masks[line]) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/**
+ * Checks whether player move completed line (only lines crossing moved field are checked).
+ * @param board Board geometry.
+ * @param mask Player fields mask (moved field included).
+ * @param field Moved field.
+ * @returns Information whether player won with move.
+ */
+int is_winning_move(board_t* board, uint32_t mask, int field)
+{
+    for (int line = 0; line < board -> field_lines_numbers[field]; line++) {
+        if ((mask & board -> field_lines_masks[field][line]) == board -> field_lines_masks[field][line]) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/**
+ * Expands players fields masks to grid fields.
+ * @param board Board geometry.
+ * @param x_mask 'X' player fields mask.
+ * @param o_mask 'O' player fields mask.
+ * @param grid Destination grid (0 - free field, 1 - 'X' player, 2 - 'O' player).
+ */
+void get_grid_fields(board_t* board, uint32_t x_mask, uint32_t o_mask, int* grid)
+{
+    for (int field = 0; field < board -> fields_number; field++) {
+        grid[field] = (x_mask >> field) & 1 ? 1 : (int) ((o_mask >> field) & 1) * 2;
+    }
+}
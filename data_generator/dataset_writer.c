@@ -0,0 +1,135 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include "generator.h"
+
+/**
+ * Writes unsigned integer to buffer in little-endian byte order.
+ * @param buffer Destination buffer.
+ * @param value Written value.
+ * @param bytes_number Number of value bytes.
+ */
+static void write_little_endian(unsigned char* buffer, uint64_t value, int bytes_number)
+{
+    for (int i = 0; i < bytes_number; i++) {
+        buffer[i] = (unsigned char) (value >> (8 * i));
+    }
+}
+
+/**
+ * Writes binary dataset header (records number is updated when dataset is closed).
+ * @param writer Dataset writer.
+ */
+static void write_dataset_header(dataset_writer_t* writer)
+{
+    unsigned char header[DATASET_HEADER_SIZE];
+    memset(header, 0, DATASET_HEADER_SIZE);
+
+    memcpy(header, DATASET_MAGIC, 4);
+    write_little_endian(header + 4, DATASET_VERSION, 2);
+    header[6] = (unsigned char) writer -> grid_size;
+    header[7] = DATASET_LABELS_NUMBER;
+    write_little_endian(header + 8, get_dataset_record_size(writer -> grid_size), 4);
+    write_little_endian(header + 16, writer -> records, 8);
+
+    fseek(writer -> file, 0, SEEK_SET);
+    fwrite(header, 1, DATASET_HEADER_SIZE, writer -> file);
+}
+
+/**
+ * Finds size of binary dataset record (grid fields packed by 2 bits and float labels).
+ * @param grid_size Size of grid.
+ * @returns Record size in bytes.
+ */
+int get_dataset_record_size(int grid_size)
+{
+    return (grid_size * grid_size * 2 + 7) / 8 + DATASET_LABELS_NUMBER * (int) sizeof(float);
+}
+
+/**
+ * Opens dataset output file.
+ * @param filename Name of output file.
+ * @param grid_size Size of grid.
+ * @param binary Output format (1 - binary records, 0 - text lines).
+ * @returns Dataset writer (NULL when file cannot be opened).
+ */
+dataset_writer_t* open_dataset_writer(char* filename, int grid_size, int binary)
+{
+    FILE* file = fopen(filename, binary ? "wb" : "w");
+    if (file == NULL) {
+        return NULL;
+    }
+
+    dataset_writer_t* writer = malloc(sizeof(dataset_writer_t));
+    writer -> file = file;
+    writer -> grid_size = grid_size;
+    writer -> binary = binary;
+    writer -> records = 0;
+
+    if (binary) {
+        write_dataset_header(writer);
+    }
+    return writer;
+}
+
+/**
+ * Writes single dataset record - grid state and its game ending probabilities.
+ * @param writer Dataset writer.
+ * @param grid Grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player).
+ * @param draw_prob Probability of draw.
+ * @param x_win_prob Probability of 'X' player win.
+ * @param o_win_prob Probability of 'O' player win.
+ */
+void write_dataset_record(dataset_writer_t* writer, int* grid, double draw_prob, double x_win_prob, double o_win_prob)
+{
+    int fields_number = writer -> grid_size * writer -> grid_size;
+
+    if (!writer -> binary) {
+        fprintf(writer -> file, "(");
+        for (int i = 0; i < fields_number; i++) {
+            fprintf(writer -> file, "%d, ", grid[i]);
+        }
+        fprintf(writer -> file, ") -> (%.4lf, %.4lf, %.4lf)\n", draw_prob, x_win_prob, o_win_prob);
+        writer -> records++;
+        return;
+    }
+
+    // field 'i' is stored in bits 2 * i of little-endian packed grid
+    unsigned char record[DATASET_MAX_RECORD_SIZE];
+    int packed_size = (fields_number * 2 + 7) / 8;
+    memset(record, 0, packed_size);
+    for (int i = 0; i < fields_number; i++) {
+        record[i / 4] |= (unsigned char) (grid[i] << (2 * (i % 4)));
+    }
+
+    float labels[DATASET_LABELS_NUMBER] = { (float) draw_prob, (float) x_win_prob, (float) o_win_prob };
+    memcpy(record + packed_size, labels, sizeof(labels));
+
+    fwrite(record, 1, get_dataset_record_size(writer -> grid_size), writer -> file);
+    writer -> records++;
+}
+
+/**
+ * Ends records of single game (text output separates games with empty line).
+ * @param writer Dataset writer.
+ */
+void end_dataset_game(dataset_writer_t* writer)
+{
+    if (!writer -> binary) {
+        fprintf(writer -> file, "\n");
+    }
+}
+
+/**
+ * Closes dataset output file (binary header gets final number of records).
+ * @param writer Dataset writer.
+ */
+void close_dataset_writer(dataset_writer_t* writer)
+{
+    if (writer -> binary) {
+        write_dataset_header(writer);
+    }
+    fclose(writer -> file);
+    free(writer);
+}
@@ -1,23 +1,90 @@
 #ifndef GENERATOR_H_INCLUDED
 #define GENERATOR_H_INCLUDED
 
-typedef struct grid_state {
-    int* content;
-    int size;
-    int free_fields;
+#include <stdint.h>
+#include <stdio.h>
+
+// binary dataset format (see 'neural_network/dataset.py'): 32 bytes header (magic, version, grid size, labels number,
+// record size, records number) followed by fixed width records (grid fields packed by 2 bits, float32 labels)
+#define DATASET_MAGIC "TTTD"
+#define DATASET_VERSION 1
+#define DATASET_HEADER_SIZE 32
+#define DATASET_LABELS_NUMBER 3
+#define DATASET_MAX_RECORD_SIZE 64
 
-    int x_wins;
-    int o_wins;
-    int draws;
-} grid_state_t;
+// max. board size of generators (players fields masks are 32-bit)
+#define MAX_BOARD_SIZE 5
+#define MAX_FIELDS_NUMBER (MAX_BOARD_SIZE * MAX_BOARD_SIZE)
+#define MAX_LINES_NUMBER (2 * MAX_BOARD_SIZE + 2)
+
+// board geometry - player fields are stored as mask (field 'i' in bit 'i')
+typedef struct board {
+    int size;
+    int fields_number;
+    uint32_t full_mask;
+    int lines_number;
+    uint32_t lines_masks[MAX_LINES_NUMBER];
+    // masks of lines crossing field (row, column and up to 2 diagonals)
+    int field_lines_numbers[MAX_FIELDS_NUMBER];
+    uint32_t field_lines_masks[MAX_FIELDS_NUMBER][4];
+} board_t;
 
+// simulated game - players fields masks of every game state (empty grid included)
 typedef struct game_simulation {
-    int** grid_states;
+    uint32_t x_masks[MAX_FIELDS_NUMBER + 1];
+    uint32_t o_masks[MAX_FIELDS_NUMBER + 1];
     int turns;
     int result;
 } game_simulation_t;
 
-int is_valid_state(grid_state_t* state);
-int get_game_result(grid_state_t* state);
+typedef struct dataset_writer {
+    FILE* file;
+    int grid_size;
+    int binary;
+    long long records;
+} dataset_writer_t;
+
+// number of games simulated with single random numbers stream (games are simulated and written in blocks)
+#define SIMULATION_BLOCK_GAMES 1024
+
+// random numbers stream (each block of games has its own stream)
+typedef struct random {
+    uint64_t state[4];
+} random_t;
+
+// function simulating single game (game states are written to simulation data)
+typedef void (*simulate_game_t)(random_t* random, game_simulation_t* simulation, board_t* board);
+
+typedef struct simulation_options {
+    long long games_number;
+    int threads_number;
+    uint64_t seed;
+    // number of games of output chunk file (0 - single output file)
+    long long chunk_games;
+    int binary;
+    char* filename;
+    int board_size;
+} simulation_options_t;
+
+void prepare_board(board_t* board, int size);
+int has_won(board_t* board, uint32_t mask);
+int is_winning_move(board_t* board, uint32_t mask, int field);
+void get_grid_fields(board_t* board, uint32_t x_mask, uint32_t o_mask, int* grid);
+
+int get_dataset_record_size(int grid_size);
+dataset_writer_t* open_dataset_writer(char* filename, int grid_size, int binary);
+void write_dataset_record(dataset_writer_t* writer, int* grid, double draw_prob, double x_win_prob, double o_win_prob);
+void end_dataset_game(dataset_writer_t* writer);
+void close_dataset_writer(dataset_writer_t* writer);
+
+void seed_random(random_t* random, uint64_t seed, uint64_t stream);
+uint64_t next_random(random_t* random);
+int next_random_below(random_t* random, int bound);
+
+void run_simulations(simulation_options_t* options, simulate_game_t simulate_game);
+
+int take_flag(int* argc, char** argv, char* name);
+int take_binary_flag(int* argc, char** argv);
+long long take_integer_option(int* argc, char** argv, char* name, long long default_value);
 
 #endif
\ No newline at end of file
@@ -0,0 +1,364 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include "generator.h"
+
+// board size is chosen at compile time ('generator_3x3' and 'generator_exact_4x4' are built from this file)
+#ifndef BOARD_SIZE
+#define BOARD_SIZE 3
+#endif
+
+#define FIELDS_NUMBER (BOARD_SIZE * BOARD_SIZE)
+#define SYMMETRIES_NUMBER 8
+#define FULL_MASK ((1ULL << FIELDS_NUMBER) - 1)
+// 'O' player mask is stored in upper bits of state key, the highest bit is moving player (0 - 'X', 1 - 'O')
+#define O_MASK_SHIFT 32
+#define MOVING_O_FLAG (1ULL << 63)
+#define INITIAL_TABLE_CAPACITY (1 << 16)
+
+/*
+ * Exact game ending statistics generator. Every grid reachable in game (started by any player) is labeled with
+ * numbers of games that can be played from it and end with draw, 'X' player win or 'O' player win. Numbers are
+ * found with memoized depth first search over game states DAG (every state is processed once) - states are
+ * reduced by grid symmetries, so grids that differ only by rotation or reflection share single table entry.
+ */
+
+// numbers of games ending with draw, 'X' player win and 'O' player win
+typedef struct game_counts {
+    uint64_t results[3];
+} game_counts_t;
+
+// processed game state (canonical grid and moving player)
+typedef struct state_entry {
+    uint64_t key;
+    game_counts_t counts;
+} state_entry_t;
+
+// open addressing hash table of processed states (key 0 marks empty entry - empty grid with 'X' moving is stored
+// separately as it is the only state with such key)
+typedef struct states_table {
+    state_entry_t* entries;
+    uint64_t capacity;
+    uint64_t size;
+    int has_zero_key;
+    state_entry_t zero_key_entry;
+} states_table_t;
+
+board_t board;
+// symmetry_bytes[s][b][v] - fields of byte 'b' of mask with value 'v' transformed by symmetry 's'
+uint64_t symmetry_bytes[SYMMETRIES_NUMBER][(FIELDS_NUMBER + 7) / 8][256];
+
+/**
+ * Finds field index after grid symmetry (rotations and reflections of square grid).
+ * @param field Field index.
+ * @param symmetry Symmetry number (0 - identity).
+ * @returns Transformed field index.
+ */
+int transform_field(int field, int symmetry)
+{
+    int row = field / BOARD_SIZE, column = field % BOARD_SIZE, last = BOARD_SIZE - 1;
+    switch (symmetry) {
+        case 1: return column * BOARD_SIZE + last - row;
+        case 2: return (last - row) * BOARD_SIZE + last - column;
+        case 3: return (last - column) * BOARD_SIZE + row;
+        case 4: return row * BOARD_SIZE + last - column;
+        case 5: return (last - row) * BOARD_SIZE + column;
+        case 6: return column * BOARD_SIZE + row;
+        case 7: return (last - column) * BOARD_SIZE + last - row;
+        default: return field;
+    }
+}
+
+/**
+ * Prepares lookup tables of grid symmetries (mask is transformed byte by byte).
+ */
+void prepare_symmetry_bytes()
+{
+    for (int symmetry = 0; symmetry < SYMMETRIES_NUMBER; symmetry++) {
+        for (int byte = 0; byte < (FIELDS_NUMBER + 7) / 8; byte++) {
+            for (int value = 0; value < 256; value++) {
+                uint64_t mask = 0;
+                for (int bit = 0; bit < 8 && byte * 8 + bit < FIELDS_NUMBER; bit++) {
+                    if (value & (1 << bit)) {
+                        mask |= 1ULL << transform_field(byte * 8 + bit, symmetry);
+                    }
+                }
+                symmetry_bytes[symmetry][byte][value] = mask;
+            }
+        }
+    }
+}
+
+/**
+ * Transforms player fields mask by grid symmetry.
+ * @param mask Player fields mask.
+ * @param symmetry Symmetry number.
+ * @returns Transformed mask.
+ */
+uint64_t transform_mask(uint64_t mask, int symmetry)
+{
+    uint64_t result = 0;
+    for (int byte = 0; byte < (FIELDS_NUMBER + 7) / 8; byte++) {
+        result |= symmetry_bytes[symmetry][byte][(mask >> (8 * byte)) & 0xFF];
+    }
+    return result;
+}
+
+/**
+ * Finds canonical grid key - the lowest key of all grid symmetries.
+ * @param x_mask 'X' player fields mask.
+ * @param o_mask 'O' player fields mask.
+ * @returns Canonical grid key (without moving player flag).
+ */
+uint64_t get_canonical_key(uint64_t x_mask, uint64_t o_mask)
+{
+    uint64_t canonical_key = x_mask | (o_mask << O_MASK_SHIFT);
+    for (int symmetry = 1; symmetry < SYMMETRIES_NUMBER; symmetry++) {
+        uint64_t key = transform_mask(x_mask, symmetry) | (transform_mask(o_mask, symmetry) << O_MASK_SHIFT);
+        if (key < canonical_key) {
+            canonical_key = key;
+        }
+    }
+    return canonical_key;
+}
+
+/**
+ * Finds table entry of state key (empty entry when state was not processed yet).
+ * @param table States table.
+ * @param key State key.
+ * @returns Pointer to entry.
+ */
+state_entry_t* find_entry(states_table_t* table, uint64_t key)
+{
+    if (key == 0) {
+        return &table -> zero_key_entry;
+    }
+
+    uint64_t hash = key * 0x9E3779B97F4A7C15ULL;
+    uint64_t index = (hash ^ (hash >> 29)) & (table -> capacity - 1);
+    while (table -> entries[index].key != 0 && table -> entries[index].key != key) {
+        index = (index + 1) & (table -> capacity - 1);
+    }
+    return &table -> entries[index];
+}
+
+/**
+ * Inserts processed state to table (table is grown twice when it is filled in 3/4).
+ * @param table States table.
+ * @param key State key.
+ * @param counts Numbers of games played from state.
+ */
+void insert_entry(states_table_t* table, uint64_t key, game_counts_t counts)
+{
+    if (key == 0) {
+        table -> has_zero_key = 1;
+        table -> zero_key_entry.counts = counts;
+        table -> size++;
+        return;
+    }
+
+    if (4 * (table -> size + 1) > 3 * table -> capacity) {
+        state_entry_t* entries = table -> entries;
+        uint64_t capacity = table -> capacity;
+        table -> capacity *= 2;
+        table -> entries = calloc(table -> capacity, sizeof(state_entry_t));
+        if (table -> entries == NULL) {
+            printf("Cannot allocate states table of %llu entries\n", (unsigned long long) table -> capacity);
+            exit(1);
+        }
+        for (uint64_t i = 0; i < capacity; i++) {
+            if (entries[i].key != 0) {
+                *find_entry(table, entries[i].key) = entries[i];
+            }
+        }
+        free(entries);
+    }
+
+    state_entry_t* entry = find_entry(table, key);
+    entry -> key = key;
+    entry -> counts = counts;
+    table -> size++;
+}
+
+/**
+ * Finds numbers of games that can be played from state (memoized depth first search).
+ * @param table States table.
+ * @param x_mask 'X' player fields mask.
+ * @param o_mask 'O' player fields mask.
+ * @param moving_player Moving player (1 - 'X', 2 - 'O').
+ * @returns Numbers of games ending with draw, 'X' player win and 'O' player win.
+ */
+game_counts_t count_games(states_table_t* table, uint64_t x_mask, uint64_t o_mask, int moving_player)
+{
+    uint64_t key = get_canonical_key(x_mask, o_mask) | (moving_player == 2 ? MOVING_O_FLAG : 0);
+    state_entry_t* entry = find_entry(table, key);
+    if (entry -> key == key && (key != 0 || table -> has_zero_key)) {
+        return entry -> counts;
+    }
+
+    game_counts_t counts = {{0, 0, 0}};
+    if (has_won(&board, (uint32_t) x_mask)) {
+        counts.results[1] = 1;
+    }
+    else if (has_won(&board, (uint32_t) o_mask)) {
+        counts.results[2] = 1;
+    }
+    else if ((x_mask | o_mask) == FULL_MASK) {
+        counts.results[0] = 1;
+    }
+    else {
+        uint64_t free_mask = ~(x_mask | o_mask) & FULL_MASK;
+        while (free_mask) {
+            uint64_t field = free_mask & (~free_mask + 1);
+            free_mask ^= field;
+            game_counts_t child_counts = moving_player == 1 ? count_games(table, x_mask | field, o_mask, 2)
+                                                            : count_games(table, x_mask, o_mask | field, 1);
+            for (int result = 0; result < 3; result++) {
+                counts.results[result] += child_counts.results[result];
+            }
+        }
+    }
+
+    insert_entry(table, key, counts);
+    return counts;
+}
+
+/**
+ * Finds numbers of games played from grid - grid with equal numbers of 'X' and 'O' fields can be reached with both
+ * players moving (depending on starting player), its games of both moving players are summed.
+ * @param table States table.
+ * @param grid_key Canonical grid key.
+ * @returns Numbers of games ending with draw, 'X' player win and 'O' player win.
+ */
+game_counts_t get_grid_counts(states_table_t* table, uint64_t grid_key)
+{
+    game_counts_t counts = {{0, 0, 0}};
+    uint64_t keys[2] = { grid_key, grid_key | MOVING_O_FLAG };
+    for (int i = 0; i < 2; i++) {
+        state_entry_t* entry = find_entry(table, keys[i]);
+        if (entry -> key == keys[i] && (keys[i] != 0 || table -> has_zero_key)) {
+            for (int result = 0; result < 3; result++) {
+                counts.results[result] += entry -> counts.results[result];
+            }
+        }
+    }
+    return counts;
+}
+
+/**
+ * Writes all symmetric variants of canonical grid (every distinct grid is written once).
+ * @param output Dataset writer.
+ * @param grid_key Canonical grid key.
+ * @param counts Numbers of games played from grid.
+ * @param canonical_only Information whether only canonical grid is written.
+ * @returns Number of written grids.
+ */
+int write_grid(dataset_writer_t* output, uint64_t grid_key, game_counts_t counts, int canonical_only)
+{
+    uint64_t x_mask = grid_key & FULL_MASK, o_mask = grid_key >> O_MASK_SHIFT;
+    uint64_t written_keys[SYMMETRIES_NUMBER];
+    int written_number = 0;
+
+    double games = (double) (counts.results[0] + counts.results[1] + counts.results[2]);
+    for (int symmetry = 0; symmetry < (canonical_only ? 1 : SYMMETRIES_NUMBER); symmetry++) {
+        uint64_t key = transform_mask(x_mask, symmetry) | (transform_mask(o_mask, symmetry) << O_MASK_SHIFT);
+        int is_written = 0;
+        for (int i = 0; i < written_number; i++) {
+            is_written |= written_keys[i] == key;
+        }
+        if (is_written) {
+            continue;
+        }
+        written_keys[written_number++] = key;
+
+        int grid[FIELDS_NUMBER];
+        get_grid_fields(&board, (uint32_t) (key & FULL_MASK), (uint32_t) (key >> O_MASK_SHIFT), grid);
+        write_dataset_record(output, grid, counts.results[0] / games, counts.results[1] / games, counts.results[2] / games);
+    }
+    return written_number;
+}
+
+/**
+ * Writes labeled grids of all processed states to file.
+ * @param table States table.
+ * @param filename Name of file where all generated data will be stored.
+ * @param binary Output format (1 - binary records, 0 - text lines).
+ * @param canonical_only Information whether only canonical grids are written.
+ * @returns Number of written grids.
+ */
+long long save_to_file(states_table_t* table, char* filename, int binary, int canonical_only)
+{
+    dataset_writer_t* output = open_dataset_writer(filename, BOARD_SIZE, binary);
+    if (output == NULL) {
+        printf("Cannot open output file '%s'\n", filename);
+        exit(1);
+    }
+
+    // empty grid (zero key) is written first, grid of both moving players is written once (with 'X' moving key)
+    long long written_grids = write_grid(output, 0, get_grid_counts(table, 0), canonical_only);
+    for (uint64_t i = 0; i < table -> capacity; i++) {
+        uint64_t key = table -> entries[i].key;
+        if (key == 0 || key == MOVING_O_FLAG) {
+            continue;
+        }
+        uint64_t grid_key = key & ~MOVING_O_FLAG;
+        if ((key & MOVING_O_FLAG) && find_entry(table, grid_key) -> key == grid_key) {
+            continue;
+        }
+        written_grids += write_grid(output, grid_key, get_grid_counts(table, grid_key), canonical_only);
+    }
+
+    close_dataset_writer(output);
+    return written_grids;
+}
+
+/**
+ * Checks if user wants to get help about generator or not. If so, then proper message is printed and whole program exits.
+ * @param argc Number of arguments provided while running program.
+ * @param argv Vector of program start arguments.
+ */
+void handle_help(int argc, char** argv)
+{
+    for (int i = 0; i < argc; i++) {
+        if (strcmp(argv[i], "--help") == 0 || strcmp(argv[i], "-h") == 0) {
+            printf("In order to use this generator you need to run command presented below\n'./<compiled program name> <name of file with results> [--binary] [--canonical]'\nEx. './generator_3x3 data_3x3.dat'\nWith '--canonical' only one grid of grids that differ by rotation or reflection is written.\nAfter that you should see file with wanted data.\n");
+            exit(0);
+        }
+    }
+}
+
+int main(int argc, char** argv)
+{
+    // handle help for user
+    handle_help(argc, argv);
+
+    // binary output is requested with '--binary' flag
+    int binary = take_binary_flag(&argc, argv);
+    int canonical_only = take_flag(&argc, argv, "--canonical");
+
+    // handle lack of necessary argument
+    if (argc != 2) {
+        printf("Invalid number of arguments, there should be just one argument - name of file where prepared data should be stored\n");
+        exit(0);
+    }
+
+    prepare_board(&board, BOARD_SIZE);
+    prepare_symmetry_bytes();
+
+    states_table_t table;
+    table.capacity = INITIAL_TABLE_CAPACITY;
+    table.size = 0;
+    table.has_zero_key = 0;
+    table.entries = calloc(table.capacity, sizeof(state_entry_t));
+
+    // process games started by both players
+    count_games(&table, 0, 0, 1);
+    count_games(&table, 0, 0, 2);
+
+    long long written_grids = save_to_file(&table, argv[1], binary, canonical_only);
+    printf("Processed %llu states, written %lld grids\n", (unsigned long long) table.size, written_grids);
+
+    free(table.entries);
+    return 0;
+}
@@ -0,0 +1,105 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include "generator.h"
+
+// board size is chosen at compile time ('generator_4x4' and 'generator_5x5' are built from this file)
+#ifndef BOARD_SIZE
+#define BOARD_SIZE 4
+#endif
+
+/**
+ * Simulates single tic-tac-toe game of random moves - free fields are kept in list (taken field is swapped with
+ * the last free one), so random field is chosen in constant time, and only lines crossing moved field are checked.
+ * @param random Random numbers stream of simulated games block.
+ * @param simulation Simulation data (players fields masks of every game state are written to it).
+ * @param board Board geometry.
+ */
+void simulate_game(random_t* random, game_simulation_t* simulation, board_t* board)
+{
+    int free_fields[MAX_FIELDS_NUMBER], free_fields_number = board -> fields_number;
+    for (int field = 0; field < free_fields_number; field++) {
+        free_fields[field] = field;
+    }
+
+    // players fields masks (indexed by player: 1 - 'X', 2 - 'O')
+    uint32_t masks[3] = { 0, 0, 0 };
+    int current_player = next_random_below(random, 2) == 0 ? 2 : 1;
+
+    simulation -> x_masks[0] = 0;
+    simulation -> o_masks[0] = 0;
+    simulation -> turns = 1;
+    simulation -> result = 0;
+
+    while (free_fields_number > 0) {
+        // mark random free field
+        int index = next_random_below(random, free_fields_number);
+        int field = free_fields[index];
+        free_fields[index] = free_fields[--free_fields_number];
+        masks[current_player] |= 1U << field;
+
+        simulation -> x_masks[simulation -> turns] = masks[1];
+        simulation -> o_masks[simulation -> turns] = masks[2];
+        simulation -> turns++;
+
+        if (is_winning_move(board, masks[current_player], field)) {
+            simulation -> result = current_player;
+            return;
+        }
+        current_player = current_player == 1 ? 2 : 1;
+    }
+}
+
+/**
+ * Checks if user wants to get help about generator or not. If so, then proper message is printed and whole program exits.
+ * @param argc Number of arguments provided while running program.
+ * @param argv Vector of program start arguments.
+ */
+void handle_help(int argc, char** argv)
+{
+    for (int i = 0; i < argc; i++) {
+        if (strcmp(argv[i], "--help") == 0 || strcmp(argv[i], "-h") == 0) {
+            printf("In order to use this generator you need to run command presented below\n'./<compiled program name> <number of games to simulate> <name of file with results> [--binary] [--threads N] [--seed S] [--chunk-games N]'\nWith '--chunk-games' games are written to '<name of file with results>.<chunk number>' files and finished chunks are skipped when generator is run again with the same seed.\nEx. './generator5x5 1000 data_5x5.dat'\nAfter that you should see file with wanted data.\n");
+            exit(0);
+        }
+    }
+}
+
+int main(int argc, char** argv)
+{
+    // handle help for user
+    handle_help(argc, argv);
+
+    // binary output is requested with '--binary' flag
+    int binary = take_binary_flag(&argc, argv);
+
+    // games are simulated by '--threads' threads, the same seed generates the same games
+    simulation_options_t options;
+    options.threads_number = (int) take_integer_option(&argc, argv, "--threads", 1);
+    options.seed = (uint64_t) take_integer_option(&argc, argv, "--seed", (long long) time(NULL));
+    options.chunk_games = take_integer_option(&argc, argv, "--chunk-games", 0);
+    if (options.threads_number < 1) {
+        printf("Number of threads should be positive\n");
+        exit(1);
+    }
+    if (options.chunk_games < 0) {
+        printf("Number of chunk games should not be negative\n");
+        exit(1);
+    }
+
+    // handle lack of necessary argument
+    if (argc != 3) {
+        printf("Invalid number of arguments, user should provide exactly 2 arguments\n");
+        exit(0);
+    }
+
+    options.games_number = atoll(argv[1]);
+    options.filename = argv[2];
+    options.binary = binary;
+    options.board_size = BOARD_SIZE;
+
+    // simulate games and stream them to output file
+    run_simulations(&options, simulate_game);
+    return 0;
+}
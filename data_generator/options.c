@@ -0,0 +1,68 @@
+#include <stdlib.h>
+#include <string.h>
+#include "generator.h"
+
+/**
+ * Removes program argument (and its value) from arguments vector.
+ * @param argc Number of program arguments (updated).
+ * @param argv Vector of program arguments.
+ * @param index Index of removed argument.
+ * @param number Number of removed arguments.
+ */
+static void remove_arguments(int* argc, char** argv, int index, int number)
+{
+    for (int i = index; i + number < *argc; i++) {
+        argv[i] = argv[i + number];
+    }
+    *argc -= number;
+}
+
+/**
+ * Checks whether flag was provided and removes flag from program arguments.
+ * @param argc Number of program arguments (updated when flag is removed).
+ * @param argv Vector of program arguments.
+ * @param name Flag name.
+ * @returns Information whether flag was provided.
+ */
+int take_flag(int* argc, char** argv, char* name)
+{
+    int provided = 0;
+    for (int i = 0; i < *argc; i++) {
+        if (strcmp(argv[i], name) == 0) {
+            remove_arguments(argc, argv, i--, 1);
+            provided = 1;
+        }
+    }
+    return provided;
+}
+
+/**
+ * Checks whether binary output was requested with '--binary' flag and removes flag from program arguments.
+ * @param argc Number of program arguments (updated when flag is removed).
+ * @param argv Vector of program arguments.
+ * @returns Information whether binary output was requested.
+ */
+int take_binary_flag(int* argc, char** argv)
+{
+    return take_flag(argc, argv, "--binary");
+}
+
+/**
+ * Finds value of integer option (e.g. '--threads 4') and removes option from program arguments.
+ * @param argc Number of program arguments (updated when option is removed).
+ * @param argv Vector of program arguments.
+ * @param name Option name.
+ * @param default_value Value used when option is not provided.
+ * @returns Option value.
+ */
+long long take_integer_option(int* argc, char** argv, char* name, long long default_value)
+{
+    long long value = default_value;
+    for (int i = 0; i + 1 < *argc; i++) {
+        if (strcmp(argv[i], name) == 0) {
+            value = atoll(argv[i + 1]);
+            remove_arguments(argc, argv, i--, 2);
+        }
+    }
+    return value;
+}
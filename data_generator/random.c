@@ -0,0 +1,65 @@
+#include <stdint.h>
+#include "generator.h"
+
+/**
+ * Finds next value of splitmix64 sequence (used to expand seed into generator state).
+ * @param value Sequence state (updated).
+ * @returns Next sequence value.
+ */
+static uint64_t next_splitmix64(uint64_t* value)
+{
+    uint64_t result = (*value += 0x9E3779B97F4A7C15ULL);
+    result = (result ^ (result >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    result = (result ^ (result >> 27)) * 0x94D049BB133111EBULL;
+    return result ^ (result >> 31);
+}
+
+static inline uint64_t rotate_left(uint64_t value, int bits)
+{
+    return (value << bits) | (value >> (64 - bits));
+}
+
+/**
+ * Seeds random numbers stream - every stream (e.g. worker thread) of the same seed gets independent sequence.
+ * @param random Random numbers generator state.
+ * @param seed Generation seed.
+ * @param stream Stream number.
+ */
+void seed_random(random_t* random, uint64_t seed, uint64_t stream)
+{
+    uint64_t value = seed ^ next_splitmix64(&stream);
+    for (int i = 0; i < 4; i++) {
+        random -> state[i] = next_splitmix64(&value);
+    }
+}
+
+/**
+ * Finds next random number (xoshiro256** generator).
+ * @param random Random numbers generator state.
+ * @returns Random 64-bit number.
+ */
+uint64_t next_random(random_t* random)
+{
+    uint64_t* state = random -> state;
+    uint64_t result = rotate_left(state[1] * 5, 7) * 9;
+    uint64_t shifted = state[1] << 17;
+
+    state[2] ^= state[0];
+    state[3] ^= state[1];
+    state[1] ^= state[2];
+    state[0] ^= state[3];
+    state[2] ^= shifted;
+    state[3] = rotate_left(state[3], 45);
+    return result;
+}
+
+/**
+ * Finds random number lesser than bound (multiply-shift reduction, bias is negligible for small bounds).
+ * @param random Random numbers generator state.
+ * @param bound Exclusive upper bound of number.
+ * @returns Random number from range [0, bound).
+ */
+int next_random_below(random_t* random, int bound)
+{
+    return (int) (((next_random(random) >> 32) * (uint64_t) bound) >> 32);
+}
@@ -0,0 +1,239 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <pthread.h>
+#include "generator.h"
+
+// block of games simulated by single generator thread in single round
+typedef struct simulation_block {
+    game_simulation_t* games;
+    int games_number;
+    long long block_number;
+    simulate_game_t simulate_game;
+    simulation_options_t* options;
+    board_t* board;
+} simulation_block_t;
+
+/**
+ * Finds name of output chunk file ('<output name>.<chunk number>', unfinished chunk has additional '.part' suffix).
+ * @param buffer Destination buffer.
+ * @param buffer_size Size of destination buffer.
+ * @param filename Name of output file.
+ * @param chunk_number Number of chunk.
+ * @param finished Information whether chunk is finished.
+ */
+static void get_chunk_filename(char* buffer, int buffer_size, char* filename, long long chunk_number, int finished)
+{
+    snprintf(buffer, buffer_size, "%s.%05lld%s", filename, chunk_number, finished ? "" : ".part");
+}
+
+/**
+ * Checks whether output chunk was finished by previous generator run.
+ * @param options Simulation options.
+ * @param chunk_number Number of chunk.
+ * @returns Information whether chunk file exists.
+ */
+static int is_chunk_finished(simulation_options_t* options, long long chunk_number)
+{
+    char chunk_filename[FILENAME_MAX];
+    get_chunk_filename(chunk_filename, FILENAME_MAX, options -> filename, chunk_number, 1);
+    FILE* file = fopen(chunk_filename, "rb");
+    if (file == NULL) {
+        return 0;
+    }
+    fclose(file);
+    return 1;
+}
+
+/**
+ * Opens output file (or output chunk file when output is chunked).
+ * @param options Simulation options.
+ * @param chunk_number Number of chunk.
+ * @returns Dataset writer.
+ */
+static dataset_writer_t* open_output(simulation_options_t* options, long long chunk_number)
+{
+    char chunk_filename[FILENAME_MAX];
+    char* filename = options -> filename;
+    if (options -> chunk_games > 0) {
+        get_chunk_filename(chunk_filename, FILENAME_MAX, options -> filename, chunk_number, 0);
+        filename = chunk_filename;
+    }
+
+    dataset_writer_t* output = open_dataset_writer(filename, options -> board_size, options -> binary);
+    if (output == NULL) {
+        printf("Cannot open output file '%s'\n", filename);
+        exit(1);
+    }
+    return output;
+}
+
+/**
+ * Closes output file - finished chunk file is renamed, so only complete chunks are skipped when generator is resumed.
+ * @param options Simulation options.
+ * @param output Dataset writer.
+ * @param chunk_number Number of chunk.
+ */
+static void close_output(simulation_options_t* options, dataset_writer_t* output, long long chunk_number)
+{
+    close_dataset_writer(output);
+    if (options -> chunk_games > 0) {
+        char part_filename[FILENAME_MAX], chunk_filename[FILENAME_MAX];
+        get_chunk_filename(part_filename, FILENAME_MAX, options -> filename, chunk_number, 0);
+        get_chunk_filename(chunk_filename, FILENAME_MAX, options -> filename, chunk_number, 1);
+        if (rename(part_filename, chunk_filename) != 0) {
+            printf("Cannot rename output file '%s'\n", part_filename);
+            exit(1);
+        }
+    }
+}
+
+/**
+ * Simulates games of single block - every block has its own random numbers stream, so generated games depend only
+ * on seed (not on threads number or on games skipped when generator is resumed).
+ * @param data Block simulation data ('simulation_block_t').
+ * @returns NULL.
+ */
+static void* simulate_block(void* data)
+{
+    simulation_block_t* block = (simulation_block_t*) data;
+
+    random_t random;
+    seed_random(&random, block -> options -> seed, (uint64_t) block -> block_number);
+    for (int i = 0; i < block -> games_number; i++) {
+        block -> simulate_game(&random, &block -> games[i], block -> board);
+    }
+    return NULL;
+}
+
+/**
+ * Writes records of all games of block.
+ * @param output Dataset writer.
+ * @param block Simulated block.
+ */
+static void write_block(dataset_writer_t* output, simulation_block_t* block)
+{
+    int grid[MAX_FIELDS_NUMBER];
+    for (int i = 0; i < block -> games_number; i++) {
+        game_simulation_t* game = &block -> games[i];
+        for (int turn = 0; turn < game -> turns; turn++) {
+            get_grid_fields(block -> board, game -> x_masks[turn], game -> o_masks[turn], grid);
+            write_dataset_record(output, grid, game -> result == 0, game -> result == 1, game -> result == 2);
+        }
+        end_dataset_game(output);
+    }
+}
+
+/**
+ * Finds the next block that has to be simulated (blocks of chunks finished by previous run are skipped).
+ * @param options Simulation options.
+ * @param block_number Number of the first candidate block.
+ * @param blocks_number Number of all blocks.
+ * @param skipped_games Number of skipped games (updated).
+ * @returns Number of block (blocks number when no block is left).
+ */
+static long long find_next_block(simulation_options_t* options, long long block_number, long long blocks_number,
+                                 long long* skipped_games)
+{
+    long long chunk_blocks = (options -> chunk_games + SIMULATION_BLOCK_GAMES - 1) / SIMULATION_BLOCK_GAMES;
+    while (options -> chunk_games > 0 && block_number < blocks_number && block_number % chunk_blocks == 0
+           && is_chunk_finished(options, block_number / chunk_blocks)) {
+        long long next_chunk_block = block_number + chunk_blocks;
+        if (next_chunk_block > blocks_number) {
+            next_chunk_block = blocks_number;
+        }
+        long long last_game = next_chunk_block * SIMULATION_BLOCK_GAMES;
+        *skipped_games += (last_game < options -> games_number ? last_game : options -> games_number)
+                          - block_number * SIMULATION_BLOCK_GAMES;
+        block_number = next_chunk_block;
+    }
+    return block_number;
+}
+
+/**
+ * Runs game simulations and streams simulated games to output - games are simulated in rounds of blocks (one block
+ * per thread), so memory usage does not depend on number of games.
+ * @param options Simulation options.
+ * @param simulate_game Function simulating single game.
+ */
+void run_simulations(simulation_options_t* options, simulate_game_t simulate_game)
+{
+    long long blocks_number = (options -> games_number + SIMULATION_BLOCK_GAMES - 1) / SIMULATION_BLOCK_GAMES;
+    long long chunk_blocks = (options -> chunk_games + SIMULATION_BLOCK_GAMES - 1) / SIMULATION_BLOCK_GAMES;
+    long long simulated_games = 0, skipped_games = 0, current_chunk = -1;
+    dataset_writer_t* output = NULL;
+    time_t last_report = time(NULL);
+
+    board_t board;
+    prepare_board(&board, options -> board_size);
+
+    // games data of thread is reused by all blocks simulated by it
+    pthread_t* threads = malloc(sizeof(pthread_t) * options -> threads_number);
+    simulation_block_t* blocks = malloc(sizeof(simulation_block_t) * options -> threads_number);
+    for (int i = 0; i < options -> threads_number; i++) {
+        blocks[i].games = malloc(sizeof(game_simulation_t) * SIMULATION_BLOCK_GAMES);
+        blocks[i].simulate_game = simulate_game;
+        blocks[i].options = options;
+        blocks[i].board = &board;
+    }
+
+    long long next_block = find_next_block(options, 0, blocks_number, &skipped_games);
+    while (next_block < blocks_number) {
+        // simulate round of blocks
+        int round_blocks = 0;
+        for (; round_blocks < options -> threads_number && next_block < blocks_number; round_blocks++) {
+            simulation_block_t* block = &blocks[round_blocks];
+            long long remaining_games = options -> games_number - next_block * SIMULATION_BLOCK_GAMES;
+            block -> block_number = next_block;
+            block -> games_number = remaining_games < SIMULATION_BLOCK_GAMES ? (int) remaining_games : SIMULATION_BLOCK_GAMES;
+            pthread_create(&threads[round_blocks], NULL, simulate_block, block);
+            next_block = find_next_block(options, next_block + 1, blocks_number, &skipped_games);
+        }
+        for (int i = 0; i < round_blocks; i++) {
+            pthread_join(threads[i], NULL);
+        }
+
+        // write blocks in order (output chunk is closed after its last block)
+        for (int i = 0; i < round_blocks; i++) {
+            long long chunk = options -> chunk_games > 0 ? blocks[i].block_number / chunk_blocks : 0;
+            if (output == NULL) {
+                output = open_output(options, chunk);
+                current_chunk = chunk;
+            }
+            write_block(output, &blocks[i]);
+            simulated_games += blocks[i].games_number;
+
+            long long following_block = blocks[i].block_number + 1;
+            if (options -> chunk_games > 0 && (following_block % chunk_blocks == 0 || following_block == blocks_number)) {
+                close_output(options, output, current_chunk);
+                output = NULL;
+            }
+        }
+
+        // report progress (at most once per second)
+        if (time(NULL) != last_report || next_block == blocks_number) {
+            last_report = time(NULL);
+            printf("Simulated %lld/%lld games (%.1lf%%)\n", simulated_games + skipped_games, options -> games_number,
+                   100.0 * (simulated_games + skipped_games) / options -> games_number);
+            fflush(stdout);
+        }
+    }
+
+    if (output != NULL) {
+        close_output(options, output, current_chunk);
+    }
+    else if (options -> chunk_games == 0) {
+        // empty dataset is written even when no game is simulated
+        close_output(options, open_output(options, 0), 0);
+    }
+    if (skipped_games > 0) {
+        printf("Skipped %lld games of finished output chunks\n", skipped_games);
+    }
+
+    for (int i = 0; i < options -> threads_number; i++) {
+        free(blocks[i].games);
+    }
+    free(blocks);
+    free(threads);
+}
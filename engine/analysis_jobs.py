@@ -0,0 +1,340 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import time
+
+from engine.board import get_free_fields
+from engine.symmetry import canonicalize, get_canonical_key, map_canonical_move
+
+
+# analysis job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+FINISHED_JOB_STATUSES = [JOB_DONE, JOB_FAILED]
+
+
+class AnalysisQueueFullError(Exception):
+    '''
+    Raised when analysis job cannot be submitted, because jobs queue limit was reached.
+    '''
+
+
+def get_analysis_job_id(grid, grid_size, moving_player, max_depth):
+    '''
+    Computes job id from job parameters, so identical submissions get the same job.
+
+    returns:
+        str - job id
+    '''
+
+    job_parameters = "{grid}:{size}:{player}:{depth}".format(
+        grid="".join(str(field) for field in grid), size=grid_size, player=moving_player, depth=max_depth
+    )
+    return hashlib.sha1(job_parameters.encode()).hexdigest()[:20]
+
+
+def is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_json_file(path, data):
+    # file is replaced atomically, so readers never see partially written document
+    temporary_path = path.with_name("{name}.{pid}.{thread}.tmp".format(
+        name=path.name, pid=os.getpid(), thread=threading.get_ident()
+    ))
+    with open(temporary_path, "w") as file:
+        json.dump(data, file)
+    os.replace(temporary_path, path)
+
+
+def read_json_file(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+class AnalysisJob():
+    '''
+    Deep min-max analysis of single position (iterative deepening up to max. depth).
+    '''
+
+    def __init__(self, job_id, grid, grid_size, moving_player, max_depth):
+        self.job_id = job_id
+        self.grid = list(grid)
+        self.grid_size = grid_size
+        self.moving_player = moving_player
+        self.max_depth = max_depth
+
+        self.status = JOB_QUEUED
+        self.pid = os.getpid()
+        # progress of analysis - the deepest finished search, its best move and number of nodes analysed so far
+        self.depth = None
+        self.best_move = None
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.cached = False
+        self.error = None
+
+        # every progress update increments version (it's used to wait for updates)
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'grid': "".join(str(field) for field in self.grid),
+            'grid_size': self.grid_size,
+            'moving_player': self.moving_player,
+            'max_depth': self.max_depth,
+            'status': self.status,
+            'pid': self.pid,
+            'depth': self.depth,
+            'best_move': self.best_move,
+            'nodes': self.nodes,
+            'elapsed': self.elapsed,
+            'cached': self.cached,
+            'error': self.error,
+            'version': self.version,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        job = AnalysisJob(
+            data['job_id'], [int(field) for field in data['grid']], data['grid_size'], data['moving_player'],
+            data['max_depth']
+        )
+        for field in ['status', 'pid', 'depth', 'best_move', 'nodes', 'elapsed', 'cached', 'error', 'version']:
+            setattr(job, field, data[field])
+        return job
+
+    def is_finished(self):
+        return self.status in FINISHED_JOB_STATUSES
+
+    def update(self, save=None, **fields):
+        '''
+        Updates job fields and notifies waiting threads.
+
+        args:
+            save    - type: function    - function that persists updated job (called before waiting threads are notified)
+            fields  - updated job fields
+        '''
+
+        with self.condition:
+            for field, value in fields.items():
+                setattr(self, field, value)
+            self.version += 1
+            if save is not None:
+                save(self)
+            self.condition.notify_all()
+
+    def wait_for_update(self, version, timeout):
+        '''
+        Waits until job version is newer than given one.
+
+        returns:
+            int - current job version
+        '''
+
+        with self.condition:
+            self.condition.wait_for(lambda: self.version > version, timeout=timeout)
+            return self.version
+
+
+class AnalysisJobManager():
+    '''
+    Runs deep analysis jobs in bounded pool of background threads. Jobs and analysis results are persisted in jobs
+    directory - results are stored by canonical position, so they are reused for all symmetric positions.
+    '''
+
+    def __init__(self, minmax_library, jobs_directory, max_workers=1, queue_limit=16, time_limit=300.0,
+                 memory_limit=64 * 1024 * 1024):
+        '''
+        args:
+            minmax_library  - type: MinMaxLibrary   - min-max library binding
+            jobs_directory  - type: str             - directory where jobs and analysis results are stored
+            max_workers     - type: int             - number of jobs run at the same time
+            queue_limit     - type: int             - max. number of queued and running jobs
+            time_limit      - type: float           - max. time (in seconds) of single job analysis
+            memory_limit    - type: int             - max. memory (in bytes) of single job search context
+        '''
+
+        self._minmax_library = minmax_library
+        self._jobs_directory = pathlib.Path(jobs_directory) / "jobs"
+        self._positions_directory = pathlib.Path(jobs_directory) / "positions"
+        self._queue_limit = queue_limit
+        self._time_limit = time_limit
+        self._memory_limit = memory_limit
+
+        self._jobs_directory.mkdir(parents=True, exist_ok=True)
+        self._positions_directory.mkdir(parents=True, exist_ok=True)
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def __get_job_path(self, job_id):
+        return self._jobs_directory / "{job_id}.json".format(job_id=job_id)
+
+    def __get_position_path(self, canonical_key):
+        return self._positions_directory / "{key}.json".format(key=canonical_key)
+
+    def __save_job(self, job):
+        write_json_file(self.__get_job_path(job.job_id), job.to_dict())
+
+    def __load_job(self, job_id):
+        data = read_json_file(self.__get_job_path(job_id))
+        if data is None:
+            return None
+
+        job = AnalysisJob.from_dict(data)
+        # job of process that does not exist anymore was interrupted (e.g. by server restart)
+        if not job.is_finished() and not is_process_alive(job.pid):
+            job.status = JOB_FAILED
+            job.error = "Analysis was interrupted."
+        return job
+
+    def get_active_jobs_number(self):
+        with self._lock:
+            return len([job for job in self._jobs.values() if not job.is_finished()])
+
+    def get_job(self, job_id):
+        '''
+        Finds job run by this process or stored in jobs directory (e.g. by another server worker).
+
+        returns:
+            AnalysisJob - found job or None
+        '''
+
+        with self._lock:
+            job = self._jobs.get(job_id, None)
+        if job is not None:
+            return job
+        return self.__load_job(job_id)
+
+    def is_local_job(self, job):
+        with self._lock:
+            return self._jobs.get(job.job_id, None) is job
+
+    def submit(self, grid, grid_size, moving_player, max_depth):
+        '''
+        Submits analysis job - if identical job already exists (and did not fail), it's returned instead.
+
+        returns:
+            tuple - (job, information whether new job was created)
+
+        throws:
+            AnalysisQueueFullError - when there are too many queued and running jobs
+        '''
+
+        job_id = get_analysis_job_id(grid, grid_size, moving_player, max_depth)
+        with self._lock:
+            job = self._jobs.get(job_id, None) or self.__load_job(job_id)
+            if job is not None and job.status != JOB_FAILED:
+                return job, False
+
+            active_jobs = len([job for job in self._jobs.values() if not job.is_finished()])
+            if active_jobs >= self._queue_limit:
+                raise AnalysisQueueFullError("Too many analysis jobs are waiting - try again later.")
+
+            job = AnalysisJob(job_id, grid, grid_size, moving_player, max_depth)
+            self._jobs[job_id] = job
+            self.__save_job(job)
+
+        self._executor.submit(self.__run_job, job)
+        return job, True
+
+    def __run_job(self, job):
+        try:
+            job.update(save=self.__save_job, status=JOB_RUNNING)
+            self.__analyse(job)
+            job.update(save=self.__save_job, status=JOB_DONE)
+        except Exception as error:
+            job.update(save=self.__save_job, status=JOB_FAILED, error=str(error))
+
+    def __analyse(self, job):
+        '''
+        Analyses job position with iterative deepening - after each depth job progress is updated and saved.
+        '''
+
+        canonical_grid, permutation = canonicalize(job.grid, job.grid_size)
+        canonical_key = get_canonical_key(job.grid, job.grid_size, job.moving_player)
+        position_path = self.__get_position_path(canonical_key)
+
+        # deeper searches don't change anything once the whole game tree was analysed (position with single free field
+        # is still searched at depth 1, so job has its best move)
+        free_fields_number = len(get_free_fields(job.grid, job.grid_size))
+        max_depth = max(min(job.max_depth, free_fields_number - 1), 1)
+
+        # results of the same or symmetric position analysed at least as deep are reused
+        position_result = read_json_file(position_path)
+        if position_result is not None and position_result['depth'] >= max_depth:
+            job.update(
+                save=self.__save_job, depth=position_result['depth'], nodes=position_result['nodes'], cached=True,
+                best_move=map_canonical_move(position_result['move'], permutation)
+            )
+            return
+
+        context = self._minmax_library.create_context(job.grid_size, self._memory_limit)
+        # search that exceeds time limit is stopped, job result is the result of the deepest finished search
+        time_limit_timer = threading.Timer(self._time_limit, context.stop)
+        time_limit_timer.start()
+        start = time.perf_counter()
+        try:
+            for depth in range(1, max_depth + 1):
+                move = context.make_move(canonical_grid, job.moving_player, depth)
+                if move is None:
+                    break
+
+                job.update(
+                    save=self.__save_job, depth=depth, nodes=job.nodes + self._minmax_library.get_processed_nodes_number(),
+                    best_move=map_canonical_move(move, permutation), elapsed=time.perf_counter() - start
+                )
+                write_json_file(position_path, {'depth': depth, 'move': move, 'nodes': job.nodes})
+        finally:
+            time_limit_timer.cancel()
+            context.close()
+
+    def iterate_updates(self, job_id, keep_alive_interval=15.0, poll_interval=1.0):
+        '''
+        Yields job state after each job progress update until job is finished (None is yielded when nothing changed
+        during keep alive interval). Jobs run by other processes are polled from jobs directory.
+
+        returns:
+            generator - job states (dictionaries)
+        '''
+
+        job = self.get_job(job_id)
+        version = -1
+        while job is not None:
+            if job.version > version or job.is_finished():
+                version = job.version
+                yield job.to_dict()
+                if job.is_finished():
+                    return
+            elif self.is_local_job(job):
+                if job.wait_for_update(version, keep_alive_interval) == version:
+                    yield None
+            else:
+                waited = 0.0
+                while waited < keep_alive_interval:
+                    time.sleep(poll_interval)
+                    waited += poll_interval
+                    job = self.get_job(job_id)
+                    if job is None or job.version > version or job.is_finished():
+                        break
+                else:
+                    yield None
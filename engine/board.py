@@ -0,0 +1,77 @@
+# tic-tac-toe board helpers (grid is a list of fields: 0 - free field, 1 - 'X' player, 2 - 'O' player)
+
+# game statuses
+GAME_IN_PROGRESS = "in_progress"
+GAME_X_WON = "x_won"
+GAME_O_WON = "o_won"
+GAME_DRAW = "draw"
+
+_winning_lines = {}
+
+
+def get_winning_lines(grid_size):
+    '''
+    Finds all sequences of fields (rows, columns and both diagonals) that end the game.
+
+    returns:
+        list - lists of fields indices
+    '''
+
+    if grid_size not in _winning_lines:
+        lines = [[row * grid_size + column for column in range(grid_size)] for row in range(grid_size)]
+        lines += [[row * grid_size + column for row in range(grid_size)] for column in range(grid_size)]
+        lines.append([i * grid_size + i for i in range(grid_size)])
+        lines.append([i * grid_size + grid_size - i - 1 for i in range(grid_size)])
+        _winning_lines[grid_size] = lines
+    return _winning_lines[grid_size]
+
+
+def get_winner(grid, grid_size):
+    '''
+    Finds winner of given grid (0 - nobody won yet, 1 - 'X' player, 2 - 'O' player).
+    '''
+
+    for line in get_winning_lines(grid_size):
+        first_field = grid[line[0]]
+        if first_field != 0 and all(grid[field] == first_field for field in line):
+            return first_field
+    return 0
+
+
+def get_free_fields(grid, grid_size):
+    return [i for i in range(grid_size * grid_size) if grid[i] == 0]
+
+
+def get_game_status(grid, grid_size):
+    '''
+    returns:
+        str - one of game statuses (in progress, 'X' player won, 'O' player won, draw)
+    '''
+
+    winner = get_winner(grid, grid_size)
+    if winner == 1:
+        return GAME_X_WON
+    if winner == 2:
+        return GAME_O_WON
+    if 0 not in grid:
+        return GAME_DRAW
+    return GAME_IN_PROGRESS
+
+
+def get_opponent(player):
+    return 2 if player == 1 else 1
+
+
+def find_winning_field(grid, grid_size, player):
+    '''
+    Finds free field that ends the game with player's win when player marks it.
+
+    returns:
+        int - index of winning field (None when there is no such field)
+    '''
+
+    for line in get_winning_lines(grid_size):
+        marks = [grid[field] for field in line]
+        if marks.count(0) == 1 and marks.count(player) == grid_size - 1:
+            return line[marks.index(0)]
+    return None
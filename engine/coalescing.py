@@ -0,0 +1,94 @@
+import threading
+
+
+class TooManyWaitersError(Exception):
+    '''
+    Raised when computation for specific key already has maximal number of waiting requests.
+    '''
+
+    _key = None
+
+    def __init__(self, key=None):
+        super().__init__("Too many requests are waiting for the same computation.")
+        self._key = key
+
+
+class _InFlightCall():
+    '''
+    Computation shared by concurrent requests with the same key.
+    '''
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight():
+    '''
+    Deduplicates concurrent identical computations inside single worker process.
+
+    First request for a key runs computation, requests with the same key that arrive while it is
+    running wait for it and share its result (or its exception). Number of waiters is bounded.
+    '''
+
+    _lock = None
+    _calls = None
+    _max_waiters = None
+
+    def __init__(self, max_waiters=32):
+        '''
+        args:
+            max_waiters - type: int     - maximal number of requests waiting for single computation
+        '''
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._max_waiters = max_waiters
+
+    def run(self, key, function):
+        '''
+        Runs function for given key or waits for the same computation started by another thread.
+
+        args:
+            key         - type: hashable    - normalized computation identifier
+            function    - type: callable    - computation without arguments
+
+        returns:
+            tuple - (computation result, information whether result was shared with another request)
+
+        throws:
+            TooManyWaitersError - when computation already has 'max_waiters' waiting requests
+        '''
+
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlightCall()
+            elif call.waiters >= self._max_waiters:
+                raise TooManyWaitersError(key)
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = function()
+            except Exception as error:
+                call.error = error
+            finally:
+                # new requests start new computation from now on, waiting ones get this result
+                with self._lock:
+                    del self._calls[key]
+                call.finished.set()
+        else:
+            call.finished.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    def get_in_flight_number(self):
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,171 @@
+'''
+Hybrid engine - depth limited min-max search whose leaves (positions at depth cutoff that are not ended) are scored
+by value neural network instead of line-count heuristic of min-max library. Tree is expanded level by level (positions
+of the same level are deduplicated by grid symmetries), all leaves are predicted in batched calls and their scores
+are propagated back up to the root. Search of request is limited by number of expanded nodes and deadline, so it does
+not hold the interpreter for long (caller answers with other engine when budget is exceeded).
+'''
+import time
+
+from engine.board import get_free_fields, get_opponent, get_winner
+from engine.symmetry import canonicalize
+
+
+# scores are computed for root player - ended games are scored outside of neural network scores range
+# (win or loss found sooner is scored higher, so engine wins fast and loses late)
+WIN_SCORE = 2.0
+DEPTH_PENALTY = 0.01
+# deadline is checked every time this number of nodes is expanded
+DEADLINE_CHECK_NODES = 256
+
+
+class HybridBudgetExceededError(Exception):
+    '''
+    Raised when search exceeds its nodes budget or does not finish before deadline.
+    '''
+
+
+class HybridSearch():
+    '''
+    Min-max search with neural network leaves evaluation.
+    '''
+
+    def __init__(self, predict, leaf_batch_size=4096):
+        '''
+        args:
+            predict         - type: function    - value network prediction function (takes grids rows, returns
+                                                  predictions of draw, 'X' player win and 'O' player win)
+            leaf_batch_size - type: int         - max. number of leaves predicted with single call
+        '''
+
+        self._predict = predict
+        self._leaf_batch_size = leaf_batch_size
+
+    def __check_budget(self, nodes, max_nodes, deadline):
+        if max_nodes is not None and nodes > max_nodes:
+            raise HybridBudgetExceededError("Search exceeded budget of {max_nodes} nodes.".format(max_nodes=max_nodes))
+        if deadline is not None and time.monotonic() > deadline:
+            raise HybridBudgetExceededError("Search did not finish before deadline.")
+
+    def __expand(self, grid, grid_size, moving_player, depth_limit, max_nodes, deadline):
+        '''
+        Expands tree level by level - node is expanded when game is not ended and its depth is not greater than
+        depth limit (the same way min-max library expands the tree).
+
+        returns:
+            tuple - (levels - lists of canonical grids, terminal scores, leaves by canonical grid)
+
+        throws:
+            HybridBudgetExceededError - when tree has more nodes than budget or deadline passes
+        '''
+
+        root = tuple(canonicalize(grid, grid_size)[0])
+        levels, terminal_scores, leaves = [[root]], {}, {}
+        nodes, expanded = 1, 0
+        player = moving_player
+        for depth in range(0, grid_size * grid_size + 1):
+            next_level = {}
+            for node in levels[depth]:
+                winner = get_winner(node, grid_size)
+                if winner != 0:
+                    score = WIN_SCORE - DEPTH_PENALTY * depth
+                    terminal_scores[node] = score if winner == moving_player else -score
+                elif 0 not in node:
+                    terminal_scores[node] = 0.0
+                elif depth > depth_limit:
+                    leaves[node] = True
+                else:
+                    for field in get_free_fields(node, grid_size):
+                        child = list(node)
+                        child[field] = player
+                        next_level.setdefault(tuple(canonicalize(child, grid_size)[0]), True)
+                    expanded += 1
+                    if expanded % DEADLINE_CHECK_NODES == 0:
+                        self.__check_budget(nodes + len(next_level), max_nodes, deadline)
+            nodes += len(next_level)
+            self.__check_budget(nodes, max_nodes, deadline)
+            if not next_level:
+                break
+            levels.append(list(next_level))
+            player = get_opponent(player)
+        return levels, terminal_scores, leaves
+
+    def __score_leaves(self, leaves, moving_player, deadline):
+        '''
+        Predicts leaves in batches of max. leaf batch size.
+
+        returns:
+            tuple - (scores by canonical grid, number of prediction calls)
+
+        throws:
+            HybridBudgetExceededError - when deadline passes
+        '''
+
+        opponent = get_opponent(moving_player)
+        scores, batches = {}, 0
+        leaves = list(leaves)
+        for offset in range(0, len(leaves), self._leaf_batch_size):
+            self.__check_budget(0, None, deadline)
+            batch = leaves[offset:offset + self._leaf_batch_size]
+            predictions = self._predict([list(leaf) for leaf in batch])
+            for leaf, leaf_predictions in zip(batch, predictions):
+                scores[leaf] = float(leaf_predictions[moving_player] - leaf_predictions[opponent])
+            batches += 1
+        return scores, batches
+
+    def search(self, grid, grid_size, moving_player, depth_limit, max_nodes=None, deadline=None):
+        '''
+        Searches the best move of position.
+
+        args:
+            grid            - type: list    - grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player)
+            grid_size       - type: int     - size of grid
+            moving_player   - type: int     - player for whom move is searched (1 - 'X', 2 - 'O')
+            depth_limit     - type: int     - tree processing depth limit (0 - only root children are scored)
+            max_nodes       - type: int     - max. number of tree nodes (None when not limited)
+            deadline        - type: float   - time ('time.monotonic') when search is stopped (None when not limited)
+
+        returns:
+            dict - chosen move, its score, numbers of tree nodes, scored leaves and prediction calls
+
+        throws:
+            HybridBudgetExceededError - when tree has more nodes than budget or search does not finish before deadline
+        '''
+
+        grid = [int(field) for field in grid]
+        levels, scores, leaves = self.__expand(grid, grid_size, moving_player, depth_limit, max_nodes, deadline)
+        leaves_scores, batches = self.__score_leaves(leaves, moving_player, deadline)
+        scores.update(leaves_scores)
+
+        # scores are propagated from the deepest level up (root player maximizes, opponent minimizes score)
+        for depth in range(len(levels) - 2, -1, -1):
+            player = moving_player if depth % 2 == 0 else get_opponent(moving_player)
+            choose = max if player == moving_player else min
+            for node in levels[depth]:
+                if node in scores:
+                    continue
+                children_scores = []
+                for field in get_free_fields(node, grid_size):
+                    child = list(node)
+                    child[field] = player
+                    children_scores.append(scores[tuple(canonicalize(child, grid_size)[0])])
+                scores[node] = choose(children_scores)
+
+        best_move, best_score = None, None
+        for field in get_free_fields(grid, grid_size):
+            child = list(grid)
+            child[field] = moving_player
+            score = scores[tuple(canonicalize(child, grid_size)[0])]
+            if best_score is None or score > best_score:
+                best_move, best_score = field, score
+
+        return {
+            'move': best_move,
+            'score': best_score,
+            'nodes': sum(len(level) for level in levels),
+            'leaves': len(leaves),
+            'batches': batches,
+        }
+
+    def make_move(self, grid, grid_size, moving_player, depth_limit, max_nodes=None, deadline=None):
+        return self.search(grid, grid_size, moving_player, depth_limit, max_nodes, deadline)['move']
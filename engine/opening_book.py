@@ -0,0 +1,95 @@
+'''
+Opening book - min-max moves of opening positions searched in advance (symmetric positions share single entry).
+
+Usage (rebuilds books shipped with server, library has to be built with 'make -C minmax/lib'):
+    python -m engine.opening_book
+'''
+import json
+import pathlib
+
+from engine.board import get_free_fields, get_opponent
+from engine.symmetry import canonicalize, get_canonical_key
+
+
+# books shipped with server: grid size => (book file, number of opening moves, search depth limit)
+OPENING_BOOKS_DIRECTORY = pathlib.Path(__file__).resolve().parent / "books"
+OPENING_BOOKS = {
+    4: (OPENING_BOOKS_DIRECTORY / "opening_book_4x4.json", 1, 5),
+    5: (OPENING_BOOKS_DIRECTORY / "opening_book_5x5.json", 2, 3),
+}
+
+
+def get_opening_positions(grid_size, plies):
+    '''
+    Finds canonical positions reachable from empty grid within given number of moves (game can be started by any player).
+
+    returns:
+        list - (canonical grid, moving player) tuples
+    '''
+
+    positions, keys = [], set()
+    level = [([0] * (grid_size * grid_size), first_player) for first_player in [1, 2]]
+    for ply in range(plies + 1):
+        next_level = []
+        for grid, moving_player in level:
+            key = get_canonical_key(grid, grid_size, moving_player)
+            if key in keys:
+                continue
+            keys.add(key)
+            positions.append((canonicalize(grid, grid_size)[0], moving_player))
+            for move in get_free_fields(grid, grid_size):
+                next_grid = list(grid)
+                next_grid[move] = moving_player
+                next_level.append((next_grid, get_opponent(moving_player)))
+        level = next_level
+    return positions
+
+
+def build_opening_book(minmax_library, grid_size, plies, depth_limit):
+    '''
+    Searches min-max moves of all opening positions.
+
+    args:
+        minmax_library  - type: MinMaxLibrary   - min-max library binding
+        grid_size       - type: int             - size of grid
+        plies           - type: int             - number of moves made in the deepest opening positions
+        depth_limit     - type: int             - tree processing depth limit of searches
+
+    returns:
+        dict - book entries (move of canonical grid and search depth limit) by canonical position key
+    '''
+
+    book = {}
+    for grid, moving_player in get_opening_positions(grid_size, plies):
+        move = minmax_library.make_move(grid, grid_size, moving_player, depth_limit)
+        book[get_canonical_key(grid, grid_size, moving_player)] = {'move': move, 'depth': depth_limit}
+    return book
+
+
+def load_opening_book(path):
+    '''
+    returns:
+        dict - book entries by canonical position key (empty book when file does not exist)
+    '''
+
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_opening_book(path, book):
+    with open(path, "w") as file:
+        json.dump(book, file, indent=0, sort_keys=True)
+
+
+if __name__ == "__main__":
+    from minmax.minmax_lib import MinMaxLibrary
+
+    minmax_library = MinMaxLibrary()
+    OPENING_BOOKS_DIRECTORY.mkdir(exist_ok=True)
+    for grid_size, (path, plies, depth_limit) in OPENING_BOOKS.items():
+        book = build_opening_book(minmax_library, grid_size, plies, depth_limit)
+        save_opening_book(path, book)
+        print("{path}: {entries} positions".format(path=path, entries=len(book)))
@@ -0,0 +1,162 @@
+'''
+Persistent positions results store - moves found by search are kept in local SQLite file, so they survive server
+restarts and deploys. Keys are compact binary encodings of canonical positions prefixed with store version (engine
+build and depth settings), so results of another engine version are never served.
+'''
+import hashlib
+import queue
+import sqlite3
+import struct
+import threading
+
+from engine.symmetry import canonicalize, map_canonical_move
+
+
+# key: version, grid size, moving player, depth limit, nodes limit (0 - not limited), fields packed by 2 bits
+POSITION_KEY_HEADER = struct.Struct("<8sBBBQ")
+WRITE_BATCH_SIZE = 256
+
+
+def get_store_version(engine_files, settings):
+    '''
+    Computes store version from engine files contents (e.g. compiled min-max library) and engine settings.
+
+    args:
+        engine_files    - type: list    - paths of files that define engine build (missing files are skipped)
+        settings        - type: object  - engine settings with stable 'repr' (e.g. default depth limits)
+
+    returns:
+        bytes - 8 bytes version
+    '''
+
+    version = hashlib.sha256(repr(settings).encode())
+    for path in engine_files:
+        try:
+            with open(path, "rb") as file:
+                version.update(file.read())
+        except FileNotFoundError:
+            continue
+    return version.digest()[:8]
+
+
+def encode_position_key(version, canonical_grid, grid_size, moving_player, depth_limit, max_nodes):
+    packed_grid = 0
+    for field in reversed(canonical_grid):
+        packed_grid = packed_grid << 2 | field
+    header = POSITION_KEY_HEADER.pack(version, grid_size, moving_player, depth_limit or 0, max_nodes or 0)
+    return header + packed_grid.to_bytes((len(canonical_grid) * 2 + 7) // 8, "little")
+
+
+def decode_position_key(key):
+    '''
+    returns:
+        tuple - (canonical grid, grid size, moving player, depth limit, nodes limit or None)
+    '''
+
+    version, grid_size, moving_player, depth_limit, max_nodes = POSITION_KEY_HEADER.unpack_from(key)
+    packed_grid = int.from_bytes(key[POSITION_KEY_HEADER.size:], "little")
+    grid = [packed_grid >> (2 * field) & 3 for field in range(grid_size * grid_size)]
+    return grid, grid_size, moving_player, depth_limit, max_nodes or None
+
+
+class PersistentResultStore():
+    '''
+    SQLite store of canonical positions moves. Reads are made by calling threads (each of them has own connection),
+    writes are queued and made in batches by store writer thread, so they don't delay requests.
+    '''
+
+    def __init__(self, path, version):
+        '''
+        Opens store file (it's created when it does not exist) and removes results of other store versions.
+
+        args:
+            path    - type: str     - store file path
+            version - type: bytes   - store version (see 'get_store_version')
+        '''
+
+        self._path = path
+        self._version = version
+        self._connections = threading.local()
+        self._writes = queue.Queue()
+
+        connection = self.__get_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS results (key BLOB PRIMARY KEY, move INTEGER NOT NULL) WITHOUT ROWID")
+        connection.execute("DELETE FROM results WHERE substr(key, 1, ?) != ?", (len(version), version))
+        connection.commit()
+
+        self._writer = threading.Thread(target=self.__write_results, name="persistent-store-writer", daemon=True)
+        self._writer.start()
+
+    def __get_connection(self):
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            # store file is shared by server workers - writers of other workers are waited for
+            connection = sqlite3.connect(self._path, timeout=30.0)
+            self._connections.connection = connection
+        return connection
+
+    def __get_key(self, grid, grid_size, moving_player, depth_limit, max_nodes):
+        canonical_grid, permutation = canonicalize(grid, grid_size)
+        key = encode_position_key(self._version, canonical_grid, grid_size, moving_player, depth_limit, max_nodes)
+        return key, permutation
+
+    def get(self, grid, grid_size, moving_player, depth_limit, max_nodes):
+        '''
+        returns:
+            int - stored move of position (None when position is not stored)
+        '''
+
+        key, permutation = self.__get_key(grid, grid_size, moving_player, depth_limit, max_nodes)
+        row = self.__get_connection().execute("SELECT move FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return map_canonical_move(row[0], permutation)
+
+    def put(self, grid, grid_size, moving_player, depth_limit, max_nodes, move):
+        # result is written later by writer thread
+        key, permutation = self.__get_key(grid, grid_size, moving_player, depth_limit, max_nodes)
+        self._writes.put((key, permutation.index(move)))
+
+    def __write_results(self):
+        connection = sqlite3.connect(self._path, timeout=30.0)
+        while True:
+            results = [self._writes.get()]
+            while len(results) < WRITE_BATCH_SIZE and not self._writes.empty():
+                results.append(self._writes.get())
+
+            # None is queued when store is closed
+            closed = None in results
+            results = [result for result in results if result is not None]
+            if results:
+                connection.executemany("INSERT OR REPLACE INTO results (key, move) VALUES (?, ?)", results)
+                connection.commit()
+            if closed:
+                connection.close()
+                return
+
+    def iterate_results(self):
+        '''
+        Yields all stored results of current store version.
+
+        returns:
+            generator - (grid, grid size, moving player, depth limit, nodes limit, move) tuples of canonical grids
+        '''
+
+        connection = sqlite3.connect(self._path, timeout=30.0)
+        try:
+            rows = connection.execute(
+                "SELECT key, move FROM results WHERE substr(key, 1, ?) = ?", (len(self._version), self._version)
+            )
+            for key, move in rows:
+                yield decode_position_key(key) + (move,)
+        finally:
+            connection.close()
+
+    def close(self):
+        '''
+        Waits until all queued results are written and stops writer thread.
+        '''
+
+        self._writes.put(None)
+        self._writer.join()
@@ -0,0 +1,167 @@
+import threading
+from contextlib import contextmanager
+
+from engine.board import GAME_IN_PROGRESS, get_free_fields, get_game_status, get_opponent, get_winning_lines
+
+
+def get_predicted_replies(grid, grid_size, player):
+    '''
+    Orders player moves from the most to the least probable one - fields of lines that player can still complete
+    (especially those with more player marks) go first.
+
+    args:
+        grid        - type: list    - grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player)
+        grid_size   - type: int     - size of grid
+        player      - type: int     - moving player (1 - 'X', 2 - 'O')
+
+    returns:
+        list - free fields indices
+    '''
+
+    opponent = get_opponent(player)
+    scores = {field: 0 for field in get_free_fields(grid, grid_size)}
+    for line in get_winning_lines(grid_size):
+        line_marks = [grid[field] for field in line]
+        if opponent in line_marks:
+            continue
+        line_score = 1 + line_marks.count(player)
+        for field in line:
+            if field in scores:
+                scores[field] += line_score * line_score
+    return sorted(scores, key=lambda field: -scores[field])
+
+
+class PonderingTask():
+    '''
+    Pondering of single session game - engine replies for opponent moves that can be made in given grid.
+    '''
+
+    def __init__(self, context, grid, grid_size, engine_player, depth_limit):
+        self.context = context
+        self.grid = list(grid)
+        self.grid_size = grid_size
+        self.engine_player = engine_player
+        self.depth_limit = depth_limit
+
+        # opponent move -> engine reply
+        self.replies = {}
+        self.cancelled = False
+        self.thread = None
+
+
+class Ponderer():
+    '''
+    Searches engine replies for predicted opponent moves of session games while opponents think (in background threads).
+    Pondering uses only idle worker CPU - number of pondering threads is limited and pondering searches are stopped
+    (and repeated later) whenever foreground search starts.
+    '''
+
+    def __init__(self, max_threads=1):
+        '''
+        args:
+            max_threads - type: int     - max. number of games pondered at the same time by worker
+        '''
+
+        self._max_threads = max_threads
+        self._condition = threading.Condition()
+        self._foreground_searches = 0
+        self._tasks = set()
+
+    def get_pondering_number(self):
+        with self._condition:
+            return len(self._tasks)
+
+    @contextmanager
+    def foreground(self):
+        '''
+        Marks code block as foreground search - pondering is paused until all foreground searches are finished.
+        '''
+
+        with self._condition:
+            self._foreground_searches += 1
+            for task in self._tasks:
+                task.context.stop()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._foreground_searches -= 1
+                self._condition.notify_all()
+
+    def start(self, context, grid, grid_size, engine_player, depth_limit):
+        '''
+        Starts pondering of game in which opponent is moving now.
+
+        args:
+            context         - type: MinMaxContext   - game search context (it cannot be used until pondering is cancelled)
+            grid            - type: list            - current grid state
+            grid_size       - type: int             - size of grid
+            engine_player   - type: int             - engine player (1 - 'X', 2 - 'O')
+            depth_limit     - type: int             - tree processing depth limit
+
+        returns:
+            PonderingTask - started task or None when pondering threads limit was reached
+        '''
+
+        task = PonderingTask(context, grid, grid_size, engine_player, depth_limit)
+        with self._condition:
+            if len(self._tasks) >= self._max_threads:
+                return None
+            self._tasks.add(task)
+
+        task.thread = threading.Thread(target=self.__ponder, args=(task,), daemon=True)
+        task.thread.start()
+        return task
+
+    def cancel(self, task):
+        '''
+        Stops pondering (search in progress is stopped cleanly) and waits until task thread ends.
+
+        returns:
+            dict - engine replies found for opponent moves before cancellation
+        '''
+
+        with self._condition:
+            task.cancelled = True
+            task.context.stop()
+            self._condition.notify_all()
+
+        task.thread.join()
+        task.context.resume()
+        return task.replies
+
+    def __wait_for_idle_worker(self, task):
+        '''
+        Waits until there is no foreground search and allows task context searches again.
+
+        returns:
+            bool - False if task was cancelled in the meantime
+        '''
+
+        with self._condition:
+            while self._foreground_searches > 0 and not task.cancelled:
+                self._condition.wait()
+            if task.cancelled:
+                return False
+            task.context.resume()
+            return True
+
+    def __ponder(self, task):
+        opponent = get_opponent(task.engine_player)
+        try:
+            for reply in get_predicted_replies(task.grid, task.grid_size, opponent):
+                grid = list(task.grid)
+                grid[reply] = opponent
+                if get_game_status(grid, task.grid_size) != GAME_IN_PROGRESS:
+                    continue
+
+                # search stopped by foreground search is repeated (results of finished subtrees are kept in context)
+                move = None
+                while move is None:
+                    if not self.__wait_for_idle_worker(task):
+                        return
+                    move = task.context.make_move(grid, task.engine_player, task.depth_limit)
+                task.replies[reply] = move
+        finally:
+            with self._condition:
+                self._tasks.discard(task)
@@ -0,0 +1,123 @@
+'''
+Engine processes pool - CPU-bound min-max searches and neural network predictions are run in separate processes,
+so they don't block event loop of async server (and don't compete for GIL with it).
+Every pool process loads min-max library and neural network models once, when it starts.
+Pool processes are spawned (not forked) - server process already runs threads (e.g. persistent store warm-up
+and writer), and forked process would inherit locks held by them.
+'''
+import concurrent.futures
+import multiprocessing
+import os
+import time
+
+from engine.hybrid import HybridBudgetExceededError, HybridSearch
+from engine.resolvers import ResolverUnavailableError
+from minmax.minmax_lib import MinMaxLibrary
+from neural_network.networks_config import (
+    network_configuration_3x3,
+    network_configuration_4x4,
+    network_configuration_5x5,
+    policy_network_configuration_3x3,
+    policy_network_configuration_4x4,
+    policy_network_configuration_5x5
+)
+from neural_network.neural_network_cls import NeuralNetworkSklearn as NeuralNetwork
+from neural_network.neural_network_cls import PolicyNeuralNetworkSklearn as PolicyNeuralNetwork
+
+
+# trained models files (relative to server working directory)
+NEURAL_NETWORK_MODELS = {
+    3: (network_configuration_3x3, "./neural_network/network_3x3"),
+    4: (network_configuration_4x4, "./neural_network/network_4x4"),
+    5: (network_configuration_5x5, "./neural_network/network_5x5"),
+}
+POLICY_NETWORK_MODELS = {
+    3: (policy_network_configuration_3x3, "./neural_network/network_policy_3x3"),
+    4: (policy_network_configuration_4x4, "./neural_network/network_policy_4x4"),
+    5: (policy_network_configuration_5x5, "./neural_network/network_policy_5x5"),
+}
+
+# engines loaded in pool process
+_minmax_library = None
+_neural_networks = None
+_neural_network_models_loaded = None
+_policy_networks = None
+
+
+def initialize_engine_process():
+    global _minmax_library, _neural_networks, _neural_network_models_loaded, _policy_networks
+
+    _minmax_library = MinMaxLibrary()
+    _neural_networks, _neural_network_models_loaded = {}, {}
+    for grid_size, (configuration, model_path) in NEURAL_NETWORK_MODELS.items():
+        neural_network = NeuralNetwork(configuration)
+        _neural_network_models_loaded[grid_size] = neural_network.load_model(model_path)
+        _neural_networks[grid_size] = neural_network
+    # policy networks whose models were not trained are not loaded
+    _policy_networks = {}
+    for grid_size, (configuration, model_path) in POLICY_NETWORK_MODELS.items():
+        policy_network = PolicyNeuralNetwork(configuration)
+        if policy_network.load_model(model_path):
+            _policy_networks[grid_size] = policy_network
+
+
+def get_engine_process_id():
+    # used to make sure that pool process has started (and loaded engines)
+    return os.getpid()
+
+
+def search_minmax_move(grid, grid_size, moving_player, depth_limit, max_nodes=None):
+    return _minmax_library.make_move(grid, grid_size, moving_player, depth_limit, max_nodes)
+
+
+def predict_neural_network_move(grid, grid_size, moving_player, model="value"):
+    '''
+    throws:
+        ResolverUnavailableError - when policy network model of grid size was not loaded
+    '''
+
+    if model == "policy":
+        if grid_size not in _policy_networks:
+            raise ResolverUnavailableError("Policy network model is not loaded.")
+        return _policy_networks[grid_size].make_move(grid, grid_size, moving_player)
+    return _neural_networks[grid_size].make_move(grid, grid_size, moving_player)
+
+
+def search_hybrid_move(grid, grid_size, moving_player, depth_limit, leaf_batch_size, max_nodes=None, time_limit=None):
+    '''
+    Runs hybrid search - value network move is returned when search exceeds nodes budget or time limit (in seconds,
+    measured from the start of the task).
+
+    throws:
+        ResolverUnavailableError - when value network model of grid size was not loaded
+    '''
+
+    if not _neural_network_models_loaded[grid_size]:
+        raise ResolverUnavailableError("Neural network model is not loaded.")
+    deadline = time.monotonic() + time_limit if time_limit else None
+    hybrid_search = HybridSearch(_neural_networks[grid_size].predict, leaf_batch_size)
+    try:
+        return hybrid_search.make_move(grid, grid_size, moving_player, depth_limit, max_nodes, deadline)
+    except HybridBudgetExceededError:
+        return _neural_networks[grid_size].make_move(grid, grid_size, moving_player)
+
+
+def create_engine_pool(workers_number):
+    '''
+    Creates engine processes pool and waits until all of its processes load engines.
+
+    args:
+        workers_number  - type: int     - number of pool processes
+
+    returns:
+        ProcessPoolExecutor - started pool
+    '''
+
+    pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers_number, mp_context=multiprocessing.get_context("spawn"), initializer=initialize_engine_process
+    )
+
+    # processes are started lazily - submit enough tasks to start all of them before the first request comes
+    futures = [pool.submit(get_engine_process_id) for i in range(workers_number)]
+    concurrent.futures.wait(futures)
+    return pool
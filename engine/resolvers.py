@@ -0,0 +1,356 @@
+'''
+Engine resolvers - every engine has ordered chain of resolvers for each grid size. Cheap resolvers (immediate win
+or block, results cache, solved positions table, opening book) answer first, expensive ones (full search) run only
+when none of previous resolvers found a move and the last ones serve as a fallback (e.g. when search deadline passes).
+'''
+import threading
+import time
+
+from engine.board import find_winning_field, get_opponent
+from engine.opening_book import load_opening_book
+from engine.symmetry import canonicalize, get_canonical_key, map_canonical_move
+from engine.tablebase import find_table_move, solve_game
+from metrics.metrics import RESOLVER_LATENCY, RESOLVER_RESULTS
+
+
+# resolver results (metrics label values)
+RESOLVER_HIT = "hit"
+RESOLVER_MISS = "miss"
+RESOLVER_UNAVAILABLE = "unavailable"
+
+
+class ResolverUnavailableError(Exception):
+    '''
+    Raised when resolver cannot answer now (e.g. search does not finish before deadline) - position is passed
+    to the next resolver of chain.
+    '''
+
+
+class ResolverBusyError(ResolverUnavailableError):
+    '''
+    Raised when server is overloaded (e.g. lane is saturated) - chain is stopped, so request is rejected instead
+    of being answered by fallback resolvers outside of lanes.
+    '''
+
+
+class Position():
+    '''
+    Position resolved by engine chain together with search budget of request.
+    '''
+
+    def __init__(self, grid, grid_size, moving_player, depth_limit=None, max_nodes=None, deadline=None, timer=None):
+        '''
+        args:
+            grid            - type: list        - grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player)
+            grid_size       - type: int         - size of grid
+            moving_player   - type: int         - player for whom move is searched (1 - 'X', 2 - 'O')
+            depth_limit     - type: int         - tree processing depth limit of search
+            max_nodes       - type: int         - max. number of nodes analysed by search (None when not limited)
+            deadline        - type: float       - time ('time.monotonic') when fallback resolver should answer
+            timer           - type: PhaseTimer  - request phases timer (None when phases are not measured)
+        '''
+
+        self.grid = list(grid)
+        self.grid_size = grid_size
+        self.moving_player = moving_player
+        self.depth_limit = depth_limit
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.timer = timer
+        # details of resolving (logged with slow requests)
+        self.details = {}
+
+    def get_remaining_time(self):
+        '''
+        returns:
+            float - time (in seconds) left until deadline (None when there is no deadline)
+        '''
+
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+
+class Resolver():
+    '''
+    Base resolver - finds move of position or passes position to the next resolver of chain.
+    '''
+
+    # resolver name (metrics label value)
+    name = None
+    # information whether moves found by resolver should be stored by previous resolvers of chain (e.g. cached)
+    storable = False
+
+    def resolve(self, position):
+        '''
+        returns:
+            int - index of field (None when resolver cannot find move of position)
+
+        throws:
+            ResolverUnavailableError - when resolver cannot answer now
+        '''
+
+        raise NotImplementedError
+
+    def store(self, position, move):
+        '''
+        Stores move found by one of the next resolvers of chain.
+        '''
+
+
+class ImmediateMoveResolver(Resolver):
+    '''
+    Wins the game when it's possible in single move, otherwise blocks opponent's single move win. Opponent's win
+    is blocked only when requested depth limit lets search see opponent's reply (search of depth 0 scores only
+    moves of moving player). Nodes budget does not limit immediate moves - they are found with single pass over
+    free fields, which is cheaper than any search.
+    '''
+
+    name = "immediate"
+
+    def resolve(self, position):
+        move = find_winning_field(position.grid, position.grid_size, position.moving_player)
+        if move is None and (position.depth_limit is None or position.depth_limit >= 1):
+            move = find_winning_field(position.grid, position.grid_size, get_opponent(position.moving_player))
+        return move
+
+
+class ResultCacheResolver(Resolver):
+    '''
+    Finds moves in results cache (symmetric positions searched with the same budget share cache entry).
+    '''
+
+    name = "cache"
+
+    def __init__(self, cache, namespace):
+        '''
+        args:
+            cache       - type: MemoryResultCache or SharedMemoryResultCache    - results cache
+            namespace   - type: str                                             - keys prefix (e.g. engine name),
+                                                                                  so engines can share cache
+        '''
+
+        self._cache = cache
+        self._namespace = namespace
+
+    def __get_key(self, position):
+        return "{namespace}:{position}:{depth}:{nodes}".format(
+            namespace=self._namespace, position=get_canonical_key(position.grid, position.grid_size, position.moving_player),
+            depth=position.depth_limit, nodes=position.max_nodes
+        )
+
+    def resolve(self, position):
+        canonical_move = self._cache.get(self.__get_key(position))
+        if canonical_move is None:
+            return None
+        return map_canonical_move(canonical_move, canonicalize(position.grid, position.grid_size)[1])
+
+    def store(self, position, move):
+        permutation = canonicalize(position.grid, position.grid_size)[1]
+        self._cache.set(self.__get_key(position), permutation.index(move))
+
+
+class PersistentStoreResolver(Resolver):
+    '''
+    Finds moves in persistent results store (moves found by the next resolvers are written to store asynchronously).
+    '''
+
+    name = "disk"
+    # moves read from disk are stored by previous resolvers (e.g. results cache)
+    storable = True
+
+    def __init__(self, store):
+        '''
+        args:
+            store   - type: PersistentResultStore   - persistent results store
+        '''
+
+        self._store = store
+
+    def resolve(self, position):
+        return self._store.get(
+            position.grid, position.grid_size, position.moving_player, position.depth_limit, position.max_nodes
+        )
+
+    def store(self, position, move):
+        self._store.put(
+            position.grid, position.grid_size, position.moving_player, position.depth_limit, position.max_nodes, move
+        )
+
+    def warm_up(self, resolver):
+        '''
+        Stores all results of persistent store in given resolver (e.g. results cache).
+
+        returns:
+            int - number of stored results
+        '''
+
+        results_number = 0
+        for grid, grid_size, moving_player, depth_limit, max_nodes, move in self._store.iterate_results():
+            resolver.store(Position(grid, grid_size, moving_player, depth_limit, max_nodes), move)
+            results_number += 1
+        return results_number
+
+
+class TablebaseResolver(Resolver):
+    '''
+    Finds the best move in table of solved positions (table is computed when it's used for the first time).
+    Table answers only positions whose request budget lets search analyse the whole game tree (depth limit
+    is not lower than number of free fields - 1 and nodes are not limited), so limited searches are not
+    replaced by perfect play.
+    '''
+
+    name = "table"
+
+    def __init__(self, grid_size):
+        self._grid_size = grid_size
+        self._table = None
+        self._lock = threading.Lock()
+
+    def __get_table(self):
+        with self._lock:
+            if self._table is None:
+                self._table = solve_game(self._grid_size)
+            return self._table
+
+    def resolve(self, position):
+        free_fields_number = position.grid.count(0)
+        if position.max_nodes is not None or position.depth_limit is not None and \
+                position.depth_limit < free_fields_number - 1:
+            return None
+        return find_table_move(self.__get_table(), position.grid, position.grid_size, position.moving_player)
+
+
+class OpeningBookResolver(Resolver):
+    '''
+    Finds move in opening book - book move is used only when it was searched at least as deep as requested
+    and nodes are not limited (book searches are not limited by nodes, so they may be deeper than budget allows).
+    '''
+
+    name = "book"
+
+    def __init__(self, book_path):
+        self._book = load_opening_book(book_path)
+
+    def get_entries_number(self):
+        return len(self._book)
+
+    def resolve(self, position):
+        if position.max_nodes is not None:
+            return None
+        canonical_key = get_canonical_key(position.grid, position.grid_size, position.moving_player)
+        entry = self._book.get(canonical_key, None)
+        if entry is None or position.depth_limit is not None and entry['depth'] < position.depth_limit:
+            return None
+        return map_canonical_move(entry['move'], canonicalize(position.grid, position.grid_size)[1])
+
+
+class FunctionResolver(Resolver):
+    '''
+    Finds move with function of position (e.g. min-max search or neural network prediction).
+    '''
+
+    def __init__(self, name, function, storable=False):
+        '''
+        args:
+            name        - type: str         - resolver name
+            function    - type: function    - function of Position, returns index of field or None
+            storable    - type: bool        - information whether found moves should be stored by previous resolvers
+        '''
+
+        self.name = name
+        self.storable = storable
+        self._function = function
+
+    def resolve(self, position):
+        return self._function(position)
+
+
+class ResolverChain():
+    '''
+    Ordered chain of engine resolvers - position is resolved by the first resolver that finds its move.
+    '''
+
+    def __init__(self, engine, resolvers):
+        '''
+        args:
+            engine      - type: str     - engine name (metrics label value)
+            resolvers   - type: list    - resolvers in order of use
+        '''
+
+        self._engine = engine
+        self._resolvers = list(resolvers)
+
+    @property
+    def resolvers(self):
+        return list(self._resolvers)
+
+    def __observe(self, resolver, position, result, duration):
+        labels = {'engine': self._engine, 'resolver': resolver.name, 'grid_size': str(position.grid_size)}
+        RESOLVER_RESULTS.labels(result=result, **labels).inc()
+        RESOLVER_LATENCY.labels(**labels).observe(duration)
+
+    def store(self, position, move, resolver_name):
+        '''
+        Stores move found by resolver (e.g. search finished after deadline) in all resolvers that precede it.
+        '''
+
+        for resolver in self._resolvers:
+            if resolver.name == resolver_name:
+                return
+            resolver.store(position, move)
+
+    def resolve(self, position):
+        '''
+        Passes position through resolvers until one of them finds move.
+
+        returns:
+            tuple - (index of field, name of resolver that found it)
+
+        throws:
+            ResolverUnavailableError - when none of resolvers found move
+            ResolverBusyError - when one of resolvers is overloaded
+        '''
+
+        for resolver in self._resolvers:
+            start = time.perf_counter()
+            try:
+                move = resolver.resolve(position)
+            except ResolverBusyError:
+                self.__observe(resolver, position, RESOLVER_UNAVAILABLE, time.perf_counter() - start)
+                raise
+            except ResolverUnavailableError:
+                self.__observe(resolver, position, RESOLVER_UNAVAILABLE, time.perf_counter() - start)
+                continue
+
+            self.__observe(resolver, position, RESOLVER_MISS if move is None else RESOLVER_HIT, time.perf_counter() - start)
+            if move is not None:
+                if resolver.storable:
+                    self.store(position, move, resolver.name)
+                return move, resolver.name
+
+        raise ResolverUnavailableError("None of '{engine}' resolvers found move.".format(engine=self._engine))
+
+
+class EngineRegistry():
+    '''
+    Registry of resolver chains by engine name and grid size.
+    '''
+
+    def __init__(self):
+        self._chains = {}
+
+    def register(self, engine, grid_size, resolvers):
+        '''
+        Registers resolvers chain of engine for grid size.
+
+        returns:
+            ResolverChain - registered chain
+        '''
+
+        chain = ResolverChain(engine, resolvers)
+        self._chains[(engine, grid_size)] = chain
+        return chain
+
+    def get_chain(self, engine, grid_size):
+        return self._chains[(engine, grid_size)]
@@ -0,0 +1,167 @@
+'''
+Results caches of engine resolvers - moves are cached by string key (e.g. canonical position and search budget).
+Memory cache is private to process, shared memory cache is a memory mapped file used by all server workers of node.
+'''
+import collections
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+
+class MemoryResultCache():
+    '''
+    Least recently used moves kept in process memory.
+    '''
+
+    def __init__(self, capacity):
+        '''
+        args:
+            capacity    - type: int     - max. number of cached moves
+        '''
+
+        self._capacity = capacity
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            move = self._entries.get(key, None)
+            if move is not None:
+                self._entries.move_to_end(key)
+            return move
+
+    def set(self, key, move):
+        with self._lock:
+            self._entries[key] = move
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def get_entries_number(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# shared cache file layout: header, clock hands of buckets, buckets of fixed width entries
+SHARED_CACHE_MAGIC = b"TTTC"
+SHARED_CACHE_VERSION = 1
+SHARED_CACHE_HEADER = struct.Struct("<4sII")
+SHARED_CACHE_HEADER_SIZE = 64
+# entry: sequence number (odd while entry is written), 64-bit key hash (0 - free entry), move, reference bit
+SHARED_CACHE_ENTRY = struct.Struct("<IQBB2x")
+SHARED_CACHE_SEQUENCE = struct.Struct("<I")
+SHARED_CACHE_REFERENCE_OFFSET = 13
+SHARED_CACHE_BUCKET_SIZE = 8
+# writers of the same bucket are serialized by file lock of bucket (and by thread lock inside process)
+SHARED_CACHE_THREAD_LOCKS = 64
+
+
+def get_shared_cache_key(key):
+    # key hash is never 0 (0 marks free entry)
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryResultCache():
+    '''
+    Fixed size hash table in memory mapped file shared by processes. Table is divided into buckets of 8 entries
+    (entries of bucket are replaced with clock algorithm). Readers don't take locks - entry is read again when
+    its sequence number shows that it was written at the same time.
+    '''
+
+    def __init__(self, path, entries_number):
+        '''
+        Opens cache file (file is created or reset when it does not match requested size).
+
+        args:
+            path            - type: str     - cache file path (e.g. in '/dev/shm' directory)
+            entries_number  - type: int     - number of table entries (rounded up to whole buckets)
+        '''
+
+        self._buckets_number = max((entries_number + SHARED_CACHE_BUCKET_SIZE - 1) // SHARED_CACHE_BUCKET_SIZE, 1)
+        self._hands_offset = SHARED_CACHE_HEADER_SIZE
+        self._entries_offset = self._hands_offset + (self._buckets_number + 7) // 8 * 8
+        size = self._entries_offset + self._buckets_number * SHARED_CACHE_BUCKET_SIZE * SHARED_CACHE_ENTRY.size
+
+        self._thread_locks = [threading.Lock() for i in range(SHARED_CACHE_THREAD_LOCKS)]
+        self._file = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._file, fcntl.LOCK_EX)
+        try:
+            header = SHARED_CACHE_HEADER.pack(SHARED_CACHE_MAGIC, SHARED_CACHE_VERSION, self._buckets_number)
+            if os.fstat(self._file).st_size != size or os.pread(self._file, len(header), 0) != header:
+                os.ftruncate(self._file, 0)
+                os.ftruncate(self._file, size)
+                os.pwrite(self._file, header, 0)
+            self._memory = mmap.mmap(self._file, size)
+        finally:
+            fcntl.lockf(self._file, fcntl.LOCK_UN)
+
+    def __get_entry_offset(self, bucket, slot):
+        return self._entries_offset + (bucket * SHARED_CACHE_BUCKET_SIZE + slot) * SHARED_CACHE_ENTRY.size
+
+    def get(self, key):
+        hashed_key = get_shared_cache_key(key)
+        bucket = hashed_key % self._buckets_number
+        for slot in range(SHARED_CACHE_BUCKET_SIZE):
+            offset = self.__get_entry_offset(bucket, slot)
+            sequence, entry_key, move, referenced = SHARED_CACHE_ENTRY.unpack_from(self._memory, offset)
+            if entry_key != hashed_key:
+                continue
+            # entry is being written or it was changed while it was read
+            if sequence % 2 == 1 or SHARED_CACHE_SEQUENCE.unpack_from(self._memory, offset)[0] != sequence:
+                return None
+            if not referenced:
+                self._memory[offset + SHARED_CACHE_REFERENCE_OFFSET] = 1
+            return move
+        return None
+
+    def __find_slot(self, bucket, hashed_key):
+        '''
+        Finds entry of key, free entry or entry replaced with clock algorithm (has to be called with bucket lock).
+        '''
+
+        entries = [
+            SHARED_CACHE_ENTRY.unpack_from(self._memory, self.__get_entry_offset(bucket, slot))
+            for slot in range(SHARED_CACHE_BUCKET_SIZE)
+        ]
+        for slot, (sequence, entry_key, move, referenced) in enumerate(entries):
+            if entry_key == hashed_key or entry_key == 0:
+                return slot
+
+        # recently used entries get second chance (their reference bit is cleared)
+        hand = self._memory[self._hands_offset + bucket] % SHARED_CACHE_BUCKET_SIZE
+        while self._memory[self.__get_entry_offset(bucket, hand) + SHARED_CACHE_REFERENCE_OFFSET]:
+            self._memory[self.__get_entry_offset(bucket, hand) + SHARED_CACHE_REFERENCE_OFFSET] = 0
+            hand = (hand + 1) % SHARED_CACHE_BUCKET_SIZE
+        self._memory[self._hands_offset + bucket] = (hand + 1) % SHARED_CACHE_BUCKET_SIZE
+        return hand
+
+    def set(self, key, move):
+        hashed_key = get_shared_cache_key(key)
+        bucket = hashed_key % self._buckets_number
+        bucket_offset = self.__get_entry_offset(bucket, 0)
+
+        with self._thread_locks[bucket % SHARED_CACHE_THREAD_LOCKS]:
+            fcntl.lockf(self._file, fcntl.LOCK_EX, 1, bucket_offset)
+            try:
+                offset = self.__get_entry_offset(bucket, self.__find_slot(bucket, hashed_key))
+                sequence = SHARED_CACHE_SEQUENCE.unpack_from(self._memory, offset)[0]
+                SHARED_CACHE_SEQUENCE.pack_into(self._memory, offset, (sequence + 1) & 0xFFFFFFFF)
+                SHARED_CACHE_ENTRY.pack_into(self._memory, offset, (sequence + 1) & 0xFFFFFFFF, hashed_key, move, 0)
+                SHARED_CACHE_SEQUENCE.pack_into(self._memory, offset, (sequence + 2) & 0xFFFFFFFF)
+            finally:
+                fcntl.lockf(self._file, fcntl.LOCK_UN, 1, bucket_offset)
+
+    def get_entries_number(self):
+        return len([
+            slot for bucket in range(self._buckets_number) for slot in range(SHARED_CACHE_BUCKET_SIZE)
+            if SHARED_CACHE_ENTRY.unpack_from(self._memory, self.__get_entry_offset(bucket, slot))[1] != 0
+        ])
+
+    def close(self):
+        if self._memory is not None:
+            self._memory.close()
+            os.close(self._file)
+            self._memory = None
@@ -0,0 +1,181 @@
+import concurrent.futures
+import threading
+from contextlib import contextmanager
+
+from metrics.metrics import LANE_QUEUE_DEPTH, LANE_REJECTED_REQUESTS
+
+
+# lanes names
+CHEAP_LANE = "cheap"
+EXPENSIVE_LANE = "expensive"
+
+
+class LaneSaturatedError(Exception):
+    '''
+    Raised when lane already has maximal number of queued and running requests.
+    '''
+
+    _lane = None
+
+    def __init__(self, lane=None):
+        super().__init__("Too many requests are waiting in '{lane}' lane.".format(lane=lane))
+        self._lane = lane
+
+
+def estimate_minmax_cost(free_fields_number, depth_limit, max_nodes=None):
+    '''
+    Estimates number of nodes analysed by min-max search (games that end before grid is full are not considered,
+    so estimation is an upper bound).
+
+    args:
+        free_fields_number  - type: int     - number of free fields in searched grid
+        depth_limit         - type: int     - tree processing depth limit
+        max_nodes           - type: int     - max. number of nodes analysed by search (None when not limited)
+
+    returns:
+        int - estimated number of tree nodes
+    '''
+
+    # nodes at depth d <= depth_limit are expanded, so tree has at most depth_limit + 2 levels
+    cost, level_nodes = 1, 1
+    for level in range(min(free_fields_number, depth_limit + 1)):
+        level_nodes *= free_fields_number - level
+        cost += level_nodes
+    return min(cost, max_nodes) if max_nodes is not None else cost
+
+
+def estimate_neural_network_cost(free_fields_number):
+    # neural network predicts result of each available move
+    return free_fields_number
+
+
+class Lane():
+    '''
+    Requests execution lane - requests of similar cost are run by lane threads, so long requests of one lane
+    cannot delay requests of another one. Number of queued and running requests of lane is limited.
+    '''
+
+    _name = None
+    _queue_limit = None
+    _executor = None
+    _lock = None
+    _queue_depth = None
+
+    def __init__(self, name, max_workers, queue_limit):
+        '''
+        args:
+            name        - type: str     - lane name (used as metrics label)
+            max_workers - type: int     - number of lane threads
+            queue_limit - type: int     - max. number of requests waiting in lane and being run by it
+        '''
+
+        self._name = name
+        self._queue_limit = queue_limit
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lane-" + name)
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+
+    @property
+    def name(self):
+        return self._name
+
+    def get_queue_depth(self):
+        with self._lock:
+            return self._queue_depth
+
+    def __acquire(self):
+        with self._lock:
+            if self._queue_depth >= self._queue_limit:
+                LANE_REJECTED_REQUESTS.labels(lane=self._name).inc()
+                raise LaneSaturatedError(self._name)
+            self._queue_depth += 1
+        LANE_QUEUE_DEPTH.labels(lane=self._name).inc()
+
+    def __release(self):
+        with self._lock:
+            self._queue_depth -= 1
+        LANE_QUEUE_DEPTH.labels(lane=self._name).dec()
+
+    @contextmanager
+    def admit(self):
+        '''
+        Admits request to lane for code block (request is counted to lane queue depth).
+
+        throws:
+            LaneSaturatedError - when lane queue limit is reached (request should be rejected immediately)
+        '''
+
+        self.__acquire()
+        try:
+            yield
+        finally:
+            self.__release()
+
+    def submit(self, function, *args):
+        '''
+        Submits function to lane thread - request is counted to lane queue depth until function ends.
+
+        returns:
+            Future - function result
+
+        throws:
+            LaneSaturatedError - when lane queue limit is reached
+        '''
+
+        # request leaves lane before its result is set, so waiting thread sees updated queue depth
+        def lane_function():
+            try:
+                return function(*args)
+            finally:
+                self.__release()
+
+        self.__acquire()
+        try:
+            return self._executor.submit(lane_function)
+        except BaseException:
+            self.__release()
+            raise
+
+    def run(self, function, *args, timeout=None):
+        '''
+        Runs function in lane thread and waits for its result.
+
+        args:
+            timeout - type: float   - max. time (in seconds) of waiting for result (None when not limited) - function
+                                      that has not finished in time is still run by lane
+
+        throws:
+            LaneSaturatedError - when lane queue limit is reached
+            TimeoutError - when function has not finished in time (concurrent.futures one)
+        '''
+
+        return self.submit(function, *args).result(timeout)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class LaneScheduler():
+    '''
+    Routes requests to cheap or expensive lane due to their estimated cost.
+    '''
+
+    _lanes = None
+    _cost_threshold = None
+
+    def __init__(self, cheap_lane, expensive_lane, cost_threshold):
+        '''
+        args:
+            cheap_lane      - type: Lane    - lane of requests which estimated cost is lower than threshold
+            expensive_lane  - type: Lane    - lane of the rest of requests
+            cost_threshold  - type: int     - estimated cost (number of analysed nodes) of expensive request
+        '''
+
+        self._lanes = {CHEAP_LANE: cheap_lane, EXPENSIVE_LANE: expensive_lane}
+        self._cost_threshold = cost_threshold
+
+    def get_lane(self, cost):
+        return self._lanes[EXPENSIVE_LANE if cost >= self._cost_threshold else CHEAP_LANE]
+
+    def get_lanes(self):
+        return list(self._lanes.values())
@@ -0,0 +1,238 @@
+import threading
+import time
+import uuid
+
+from engine.board import GAME_IN_PROGRESS, get_game_status, get_opponent
+from validators.exceptions import ValidationError
+
+
+class GameSession():
+    '''
+    Game played against min-max engine. Session keeps grid state and min-max search context
+    (transposition table), so positions analysed for previous moves are not analysed again.
+    '''
+
+    def __init__(self, grid_size, engine_player, first_player, depth_limit, context, pondering=False):
+        self.session_id = uuid.uuid4().hex
+        self.grid_size = grid_size
+        self.engine_player = engine_player
+        self.moving_player = first_player
+        self.depth_limit = depth_limit
+        self.grid = [0] * (grid_size * grid_size)
+        self.context = context
+        self.moves_number = 0
+        self.last_activity = time.monotonic()
+
+        # background search of engine replies made while opponent thinks (opt-in)
+        self.pondering = pondering
+        self.pondering_task = None
+        self.last_move_pondered = False
+        self.closed = False
+
+        # session cannot be changed by two requests at the same time
+        self.lock = threading.Lock()
+
+    def get_game_status(self):
+        return get_game_status(self.grid, self.grid_size)
+
+    def get_grid_state(self):
+        return "".join(str(field) for field in self.grid)
+
+    def apply_move(self, field, player):
+        self.grid[field] = player
+        self.moving_player = get_opponent(player)
+        self.moves_number += 1
+
+    def make_engine_move(self):
+        '''
+        Finds and applies engine move (it reuses results of previous searches made for this game).
+
+        returns:
+            int - field marked by engine
+        '''
+
+        move = self.context.make_move(self.grid, self.engine_player, self.depth_limit)
+        self.apply_move(move, self.engine_player)
+        return move
+
+    def to_dict(self):
+        return {
+            'session_id': self.session_id,
+            'grid': self.get_grid_state(),
+            'grid_size': self.grid_size,
+            'engine_player': self.engine_player,
+            'moving_player': self.moving_player,
+            'game_status': self.get_game_status(),
+            'pondering': self.pondering,
+        }
+
+    def close(self):
+        self.context.close()
+        self.closed = True
+
+
+class SessionLimitError(Exception):
+    '''
+    Raised when new session cannot be created, because sessions limit was reached.
+    '''
+
+
+class GameSessionStore():
+    '''
+    In-memory game sessions store of single worker process. Sessions expire after idle timeout and
+    each of them has limited memory for its search context.
+    '''
+
+    def __init__(self, minmax_library, depth_limits, idle_timeout=600.0, memory_limit=8 * 1024 * 1024, max_sessions=256,
+                 ponderer=None):
+        '''
+        args:
+            minmax_library  - type: MinMaxLibrary   - min-max library binding
+            depth_limits    - type: dict            - tree processing depth limit for each grid size
+            idle_timeout    - type: float           - seconds after which inactive session is removed
+            memory_limit    - type: int             - max. memory (in bytes) of single session search context
+            max_sessions    - type: int             - max. number of sessions kept at the same time
+            ponderer        - type: Ponderer        - background search of sessions (pondering is disabled when None)
+        '''
+
+        self._minmax_library = minmax_library
+        self._depth_limits = depth_limits
+        self._idle_timeout = idle_timeout
+        self._memory_limit = memory_limit
+        self._max_sessions = max_sessions
+        self._ponderer = ponderer
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def remove_expired_sessions(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session for session in self._sessions.values() if now - session.last_activity > self._idle_timeout
+            ]
+            for session in expired:
+                del self._sessions[session.session_id]
+
+        for session in expired:
+            with session.lock:
+                self.__stop_pondering(session)
+                session.close()
+
+    def __start_pondering(self, session):
+        if not session.pondering or self._ponderer is None or session.get_game_status() != GAME_IN_PROGRESS:
+            return
+        session.pondering_task = self._ponderer.start(
+            session.context, session.grid, session.grid_size, session.engine_player, session.depth_limit
+        )
+
+    def __stop_pondering(self, session):
+        '''
+        returns:
+            dict - engine replies found for opponent moves while pondering
+        '''
+
+        if session.pondering_task is None:
+            return {}
+        replies = self._ponderer.cancel(session.pondering_task)
+        session.pondering_task = None
+        return replies
+
+    def __make_engine_move(self, session):
+        if self._ponderer is None:
+            return session.make_engine_move()
+        with self._ponderer.foreground():
+            return session.make_engine_move()
+
+    def create_session(self, grid_size, engine_player, first_player, pondering=False):
+        '''
+        Creates new game session - if engine starts the game, its first move is made immediately.
+        When pondering is enabled, engine searches its replies in background while opponent thinks.
+
+        returns:
+            tuple - (created session, engine move or None)
+
+        throws:
+            SessionLimitError - when there are too many active sessions
+        '''
+
+        self.remove_expired_sessions()
+
+        with self._lock:
+            if len(self._sessions) >= self._max_sessions:
+                raise SessionLimitError("Too many active game sessions.")
+
+            context = self._minmax_library.create_context(grid_size, self._memory_limit)
+            session = GameSession(
+                grid_size, engine_player, first_player, self._depth_limits[grid_size], context, pondering=pondering
+            )
+            self._sessions[session.session_id] = session
+
+        engine_move = None
+        with session.lock:
+            if session.moving_player == engine_player:
+                engine_move = self.__make_engine_move(session)
+            self.__start_pondering(session)
+        return session, engine_move
+
+    def get_session(self, session_id):
+        self.remove_expired_sessions()
+        with self._lock:
+            return self._sessions.get(session_id, None)
+
+    def remove_session(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+
+        if session is not None:
+            with session.lock:
+                self.__stop_pondering(session)
+                session.close()
+        return session is not None
+
+    def play_opponent_move(self, session, move):
+        '''
+        Applies opponent move and makes engine reply (if game has not ended).
+
+        returns:
+            int - engine move or None when game ended after opponent move
+
+        throws:
+            ValidationError - when opponent move cannot be made in current game state
+        '''
+
+        with session.lock:
+            session.last_activity = time.monotonic()
+
+            # session could expire while request was waiting for its lock
+            if session.closed:
+                raise ValidationError("session", "Game session has expired.")
+            if session.get_game_status() != GAME_IN_PROGRESS:
+                raise ValidationError("move", "Game has already ended.")
+            if session.moving_player == session.engine_player:
+                raise ValidationError("move", "It's engine turn to move.")
+            if move < 0 or move >= session.grid_size * session.grid_size or session.grid[move] != 0:
+                raise ValidationError("move", "Field {move} cannot be marked.".format(move=move))
+
+            # context cannot be used by pondering and move search at the same time
+            pondered_replies = self.__stop_pondering(session)
+
+            session.apply_move(move, get_opponent(session.engine_player))
+            session.last_move_pondered = False
+            if session.get_game_status() != GAME_IN_PROGRESS:
+                return None
+
+            if move in pondered_replies:
+                engine_move = pondered_replies[move]
+                session.apply_move(engine_move, session.engine_player)
+                session.last_move_pondered = True
+            else:
+                engine_move = self.__make_engine_move(session)
+
+            self.__start_pondering(session)
+            session.last_activity = time.monotonic()
+            return engine_move
+
+    def get_sessions_number(self):
+        with self._lock:
+            return len(self._sessions)
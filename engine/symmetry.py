@@ -0,0 +1,67 @@
+# grid symmetries helpers - positions that differ only by rotation or reflection of grid are equivalent
+# (grid is a list of fields: 0 - free field, 1 - 'X' player, 2 - 'O' player)
+
+_symmetries = {}
+
+
+def get_symmetries(grid_size):
+    '''
+    Finds all symmetries of square grid (4 rotations, each of them with and without reflection).
+
+    returns:
+        list - permutations of fields indices, transformed grid is [grid[field] for field in permutation]
+    '''
+
+    if grid_size not in _symmetries:
+        permutations = []
+        for reflect in [False, True]:
+            for rotations in range(4):
+                permutation = []
+                for row in range(grid_size):
+                    for column in range(grid_size):
+                        source_row, source_column = row, column
+                        for i in range(rotations):
+                            source_row, source_column = grid_size - source_column - 1, source_row
+                        if reflect:
+                            source_column = grid_size - source_column - 1
+                        permutation.append(source_row * grid_size + source_column)
+                if permutation not in permutations:
+                    permutations.append(permutation)
+        _symmetries[grid_size] = permutations
+    return _symmetries[grid_size]
+
+
+def canonicalize(grid, grid_size):
+    '''
+    Finds canonical form of grid - the smallest (lexicographically) of all its symmetric forms.
+
+    returns:
+        tuple - (canonical grid, permutation that transforms grid into canonical one)
+    '''
+
+    canonical_grid, canonical_permutation = None, None
+    for permutation in get_symmetries(grid_size):
+        transformed_grid = [grid[field] for field in permutation]
+        if canonical_grid is None or transformed_grid < canonical_grid:
+            canonical_grid, canonical_permutation = transformed_grid, permutation
+    return canonical_grid, canonical_permutation
+
+
+def get_canonical_key(grid, grid_size, moving_player):
+    '''
+    returns:
+        str - key identifying position together with all its symmetric positions
+    '''
+
+    canonical_grid, permutation = canonicalize(grid, grid_size)
+    return "{size}-{player}-{grid}".format(
+        size=grid_size, player=moving_player, grid="".join(str(field) for field in canonical_grid)
+    )
+
+
+def map_canonical_move(move, permutation):
+    '''
+    Maps field index of canonical grid to field index of original grid.
+    '''
+
+    return permutation[move]
@@ -0,0 +1,82 @@
+# solved positions table - every position reachable from empty grid is solved exactly (game tree is small enough
+# only for 3x3 grid), symmetric positions share single table entry
+from engine.board import get_free_fields, get_opponent, get_winner
+from engine.symmetry import canonicalize
+
+# game results (from moving player point of view)
+RESULT_WIN = 1
+RESULT_DRAW = 0
+RESULT_LOSS = -1
+
+
+def get_table_key(canonical_grid, moving_player):
+    return "{player}-{grid}".format(player=moving_player, grid="".join(str(field) for field in canonical_grid))
+
+
+def get_move_preference(result, moves_number):
+    # win as fast as possible, lose as late as possible
+    return result, -moves_number if result == RESULT_WIN else moves_number
+
+
+def solve_position(grid, grid_size, moving_player, table):
+    '''
+    Solves position (recursively) and adds it and all positions reachable from it to table.
+
+    returns:
+        tuple - (game result for moving player, number of moves until game ends)
+    '''
+
+    canonical_grid, permutation = canonicalize(grid, grid_size)
+    key = get_table_key(canonical_grid, moving_player)
+    if key in table:
+        return table[key][0], table[key][1]
+
+    opponent = get_opponent(moving_player)
+    best_preference, best_entry = None, None
+    for move in get_free_fields(canonical_grid, grid_size):
+        canonical_grid[move] = moving_player
+        if get_winner(canonical_grid, grid_size) == moving_player:
+            result, moves_number = RESULT_WIN, 1
+        elif 0 not in canonical_grid:
+            result, moves_number = RESULT_DRAW, 1
+        else:
+            opponent_result, opponent_moves_number = solve_position(canonical_grid, grid_size, opponent, table)
+            result, moves_number = -opponent_result, opponent_moves_number + 1
+        canonical_grid[move] = 0
+
+        preference = get_move_preference(result, moves_number)
+        if best_preference is None or preference > best_preference:
+            best_preference, best_entry = preference, (result, moves_number, move)
+
+    table[key] = best_entry
+    return best_entry[0], best_entry[1]
+
+
+def solve_game(grid_size):
+    '''
+    Solves all positions reachable from empty grid (game can be started by any player).
+
+    returns:
+        dict - table entries (game result, number of moves until game ends, best move of canonical grid)
+               by canonical position key
+    '''
+
+    table = {}
+    for first_player in [1, 2]:
+        solve_position([0] * (grid_size * grid_size), grid_size, first_player, table)
+    return table
+
+
+def find_table_move(table, grid, grid_size, moving_player):
+    '''
+    Finds the best move of position in solved positions table.
+
+    returns:
+        int - index of field (None when position is not in table)
+    '''
+
+    canonical_grid, permutation = canonicalize(grid, grid_size)
+    entry = table.get(get_table_key(canonical_grid, moving_player), None)
+    if entry is None:
+        return None
+    return permutation[entry[2]]
@@ -0,0 +1,35 @@
+# gunicorn configuration (loaded automatically by 'gunicorn wsgi:server' from working directory)
+import os
+import shutil
+import tempfile
+
+
+# threads of each worker - concurrent identical requests inside worker share single computation
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+# directory where every worker stores its metrics - '/metrics' endpoint aggregates all of them
+# (it has to be set before 'prometheus_client' is imported by workers)
+_metrics_directory = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "tic-tac-toe-metrics")
+)
+
+# engine results cache shared by all workers (memory mapped file, in shared memory when it's available)
+_shared_cache_path = os.environ.setdefault(
+    "SHARED_CACHE_PATH",
+    os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "tic-tac-toe-cache")
+)
+
+
+def on_starting(server):
+    # remove metrics and cached results left by previous server run
+    shutil.rmtree(_metrics_directory, ignore_errors=True)
+    os.makedirs(_metrics_directory, exist_ok=True)
+    if os.path.exists(_shared_cache_path):
+        os.remove(_shared_cache_path)
+
+
+def child_exit(server, worker):
+    # live gauges of dead worker should not be reported anymore
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,150 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+
+# Metrics are aggregated across gunicorn workers when 'PROMETHEUS_MULTIPROC_DIR' environment variable is set
+# (see 'gunicorn.conf.py') - it has to be set before 'prometheus_client' is imported by worker.
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# latency buckets (in seconds) - from sub-millisecond 3x3 / NN requests up to long 5x5 min-max searches
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LABELS = ["endpoint", "grid_size", "moving_player"]
+
+REQUEST_LATENCY = Histogram(
+    "tic_tac_toe_request_duration_seconds",
+    "Time of handling tic-tac-toe move request.",
+    REQUEST_LABELS,
+    buckets=LATENCY_BUCKETS
+)
+ENGINE_LATENCY = Histogram(
+    "tic_tac_toe_engine_duration_seconds",
+    "Time spent by engine (min-max search or neural network) on finding move.",
+    REQUEST_LABELS,
+    buckets=LATENCY_BUCKETS
+)
+VALIDATION_LATENCY = Histogram(
+    "tic_tac_toe_validation_duration_seconds",
+    "Time of request data validation.",
+    REQUEST_LABELS,
+    buckets=LATENCY_BUCKETS
+)
+BAD_REQUESTS = Counter(
+    "tic_tac_toe_bad_requests_total",
+    "Number of requests rejected by request validator (HTTP 400).",
+    ["endpoint", "field"]
+)
+# results caches of engines are reported by resolvers metrics (see 'RESOLVER_RESULTS') and neural networks
+# predictions cache by 'PREDICTION_CACHE_LOOKUPS' - game sessions replies found by pondering are counted separately
+PONDERED_MOVES = Counter(
+    "tic_tac_toe_pondered_moves_total",
+    "Number of game session engine moves answered with reply found by pondering."
+)
+
+COALESCED_REQUESTS = Counter(
+    "tic_tac_toe_coalesced_requests_total",
+    "Number of requests that shared result of identical in-flight computation.",
+    ["endpoint"]
+)
+
+# requests waiting in scheduling lane or being run by it (summed up across live workers)
+LANE_QUEUE_DEPTH = Gauge(
+    "tic_tac_toe_lane_queue_depth",
+    "Number of requests queued or running in scheduling lane.",
+    ["lane"],
+    multiprocess_mode="livesum"
+)
+LANE_REJECTED_REQUESTS = Counter(
+    "tic_tac_toe_lane_rejected_requests_total",
+    "Number of requests rejected because scheduling lane was saturated (HTTP 503).",
+    ["lane"]
+)
+
+# engine resolvers chains (e.g. cache, opening book, search, neural network fallback)
+RESOLVER_RESULTS = Counter(
+    "tic_tac_toe_resolver_results_total",
+    "Number of positions answered (hit), passed on (miss) or skipped (unavailable) by engine resolver.",
+    ["engine", "resolver", "grid_size", "result"]
+)
+RESOLVER_LATENCY = Histogram(
+    "tic_tac_toe_resolver_duration_seconds",
+    "Time spent by engine resolver on position.",
+    ["engine", "resolver", "grid_size"],
+    buckets=LATENCY_BUCKETS
+)
+
+# neural network inference batches (rows of concurrent requests are predicted with single forward pass)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+INFERENCE_BATCH_REQUESTS = Histogram(
+    "tic_tac_toe_inference_batch_requests",
+    "Number of requests predicted with single neural network forward pass.",
+    ["grid_size"],
+    buckets=BATCH_SIZE_BUCKETS
+)
+INFERENCE_BATCH_ROWS = Histogram(
+    "tic_tac_toe_inference_batch_rows",
+    "Number of rows predicted with single neural network forward pass.",
+    ["grid_size"],
+    buckets=BATCH_SIZE_BUCKETS
+)
+
+# neural network predictions cache of canonical child grids (memory is summed up across live workers)
+PREDICTION_CACHE_LOOKUPS = Counter(
+    "tic_tac_toe_prediction_cache_lookups_total",
+    "Number of neural network child grids predictions looked up in predictions cache.",
+    ["grid_size", "result"]
+)
+PREDICTION_CACHE_MEMORY = Gauge(
+    "tic_tac_toe_prediction_cache_memory_bytes",
+    "Estimated memory used by neural network predictions cache.",
+    ["grid_size"],
+    multiprocess_mode="livesum"
+)
+
+
+def get_request_labels(endpoint, request_data):
+    '''
+    Prepares request metrics labels (values that did not pass validation are labeled 'invalid',
+    so labels cardinality stays bounded).
+
+    returns:
+        dict - labels for request histograms
+    '''
+
+    grid_size = request_data.get("grid_size", None)
+    moving_player = request_data.get("moving_player", None)
+    return {
+        'endpoint': endpoint,
+        'grid_size': str(grid_size) if grid_size in (3, 4, 5) else "invalid",
+        'moving_player': str(moving_player) if moving_player in (1, 2) else "invalid",
+    }
+
+
+def observe_bad_request(endpoint, errors):
+    for field in errors:
+        BAD_REQUESTS.labels(endpoint=endpoint, field=field).inc()
+
+
+def generate_metrics():
+    '''
+    Renders all metrics in Prometheus text format (aggregated from all workers in multiprocess mode).
+
+    returns:
+        bytes - metrics exposition
+    '''
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR", None):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,105 @@
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import pathlib
+
+
+# slow requests log configuration (can be changed with environment variables)
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+SLOW_REQUEST_LOG_PATH = os.environ.get("SLOW_REQUEST_LOG_PATH", "./logs/slow_requests.log")
+SLOW_REQUEST_LOG_MAX_BYTES = int(os.environ.get("SLOW_REQUEST_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+SLOW_REQUEST_LOG_BACKUP_COUNT = int(os.environ.get("SLOW_REQUEST_LOG_BACKUP_COUNT", "5"))
+
+
+def get_process_log_path(log_path, pid):
+    '''
+    Finds log file of server process ('slow_requests.log' -> 'slow_requests.<pid>.log').
+    '''
+
+    path = pathlib.Path(log_path)
+    return str(path.with_name("{stem}.{pid}{suffix}".format(stem=path.stem, pid=pid, suffix=path.suffix)))
+
+
+class SlowRequestLogger():
+    '''
+    Writes requests that took longer than threshold to rotating log file (one JSON document per line),
+    so they can be replayed later under profiler (see 'benchmarks/replay_slow_requests.py'). Every process
+    (e.g. gunicorn worker) writes and rotates its own log file, so rotation of one process does not lose
+    entries of the others.
+    '''
+
+    _threshold = None
+    _log_path = None
+    _max_bytes = None
+    _backup_count = None
+    _logger = None
+    _logger_pid = None
+
+    def __init__(self, threshold_ms=SLOW_REQUEST_THRESHOLD_MS, log_path=SLOW_REQUEST_LOG_PATH,
+                 max_bytes=SLOW_REQUEST_LOG_MAX_BYTES, backup_count=SLOW_REQUEST_LOG_BACKUP_COUNT):
+        '''
+        args:
+            threshold_ms    - type: float   - requests longer than threshold (in milliseconds) are logged
+            log_path        - type: str     - path of log file (process id is added to file name)
+            max_bytes       - type: int     - log file size that causes rotation
+            backup_count    - type: int     - number of rotated log files that are kept
+        '''
+
+        self._threshold = threshold_ms / 1000.0
+        self._log_path = log_path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+
+    def __get_logger(self):
+        # log file is created lazily - only when first slow request appears (forked process opens its own file)
+        if self._logger is None or self._logger_pid != os.getpid():
+            log_path = get_process_log_path(self._log_path, os.getpid())
+            pathlib.Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+
+            handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=self._max_bytes, backupCount=self._backup_count
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+
+            logger = logging.getLogger("tic_tac_toe.slow_requests.{path}".format(path=log_path))
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            self._logger = logger
+            self._logger_pid = os.getpid()
+        return self._logger
+
+    def log_request(self, endpoint, request_data, timer, **details):
+        '''
+        Logs request if its handling time exceeded threshold.
+
+        args:
+            endpoint        - type: str         - endpoint name ('min-max', 'neural-network' or 'hybrid')
+            request_data    - type: dict        - prefetched request data (grid, grid_size, moving_player)
+            timer           - type: PhaseTimer  - request phases timer
+            details         - any additional data needed to replay request (e.g. search depth)
+
+        returns:
+            bool - information whether request was logged or not
+        '''
+
+        total_time = timer.get_total_time()
+        if total_time < self._threshold:
+            return False
+
+        entry = {
+            'time': datetime.datetime.now().isoformat(),
+            'pid': os.getpid(),
+            'endpoint': endpoint,
+            'grid': request_data.get("grid", None),
+            'grid_size': request_data.get("grid_size", None),
+            'moving_player': request_data.get("moving_player", None),
+            'total_ms': total_time * 1000.0,
+            'phases_ms': {name: duration * 1000.0 for name, duration in timer.get_phases().items()},
+        }
+        entry.update(details)
+
+        self.__get_logger().info(json.dumps(entry))
+        return True
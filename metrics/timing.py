@@ -0,0 +1,68 @@
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer():
+    '''
+    Measures time of consecutive request handling phases (e.g. form parsing, validation, search).
+    '''
+
+    _start = None
+    _phases = None
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._phases = []
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        Measures time of code block as phase with given name (phases with the same name are summed up).
+
+        args:
+            name    - type: str     - phase name (used as 'Server-Timing' metric name, so it should be a token)
+        '''
+
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - phase_start)
+
+    def add_phase(self, name, duration):
+        for i, (phase_name, phase_duration) in enumerate(self._phases):
+            if phase_name == name:
+                self._phases[i] = (phase_name, phase_duration + duration)
+                return
+        self._phases.append((name, duration))
+
+    def get_phase_time(self, name):
+        for phase_name, phase_duration in self._phases:
+            if phase_name == name:
+                return phase_duration
+        return 0.0
+
+    def get_phases(self):
+        '''
+        returns:
+            dict - phases durations in seconds (in order of measurement)
+        '''
+
+        return dict(self._phases)
+
+    def get_total_time(self):
+        return time.perf_counter() - self._start
+
+    def get_server_timing_header(self):
+        '''
+        Formats measured phases as 'Server-Timing' response header value (durations in milliseconds).
+
+        returns:
+            str - header value, e.g. 'prefetch;dur=0.081, validation;dur=0.212, total;dur=0.35'
+        '''
+
+        metrics = [
+            "{name};dur={duration:.3f}".format(name=name, duration=duration * 1000.0) for name, duration in self._phases
+        ]
+        metrics.append("total;dur={duration:.3f}".format(duration=self.get_total_time() * 1000.0))
+        return ", ".join(metrics)
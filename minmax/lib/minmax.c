@@ -10,8 +10,32 @@
 #include <limits.h>
 #include <time.h>
 
+// number of min-max tree nodes analysed by the last search started in the calling thread
+static _Thread_local long long processed_nodes_number = 0;
+// max. number of nodes analysed by search started in the calling thread (0 if number of nodes is not limited)
+static _Thread_local long long processed_nodes_limit = 0;
+// random numbers state of the calling thread (seeded with current time unless 'set_minmax_random_seed' was called)
+static _Thread_local unsigned long long random_state = 0;
+static _Thread_local int is_random_seeded = 0;
+
 // additional functions
 
+/**
+ * Finds next random number of the calling thread (splitmix64 sequence).
+ * @returns Random number.
+ */
+static unsigned long long next_random_number()
+{
+    if (!is_random_seeded) {
+        random_state = (unsigned long long) time(NULL);
+        is_random_seeded = 1;
+    }
+    unsigned long long value = (random_state += 0x9E3779B97F4A7C15ULL);
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EBULL;
+    return value ^ (value >> 31);
+}
+
 /**
  * Finds all sequences of fields that make tic-tac-toe game ended.
  * @param grid_size Size of game board.
@@ -123,8 +147,7 @@ void assign_possible_endgame_result(grid_t* node, int root_player_mark, int curr
         endgame_moves[i] = node -> end_game_tree_depth + free_fields_number;
     }
 
-    srand(time(NULL));
-    int pivot_index = (rand() % (2 * node -> size + 3));
+    int pivot_index = (int) (next_random_number() % (2 * node -> size + 2));
     if (current_moving_player == root_player_mark) { // maximize result
         int max_game_result = game_results[pivot_index], end_turns = endgame_moves[pivot_index];//INT_MIN, end_turns = INT_MAX;
         // process all sequences data
@@ -331,6 +354,14 @@ grid_t* create_min_max_tree_node(grid_t* parent)
  */
 void get_result_from_children(grid_t* node, int root_player_mark, int current_player_mark)
 {
+    // node result is exact only if none of its children result was foreseen (tree depth limit was not reached)
+    node -> is_exact = 1;
+    for (int i = 0; i < node -> children_num; i++) {
+        if (!node -> children[i] -> is_exact) {
+            node -> is_exact = 0;
+        }
+    }
+
     if (current_player_mark == root_player_mark) { // maximize result -> getting best move for root player
         int max_game_result = INT_MIN, end_turns = INT_MAX;
         for (int i = 0; i < node -> children_num; i++) {
@@ -377,17 +408,113 @@ void get_result_from_children(grid_t* node, int root_player_mark, int current_pl
 }
 
 /**
- * Creates and analyse min-max tree starting from specific position for tic-tac-toe game. All necessary data, to choose final tic-tac-toe is held in root node and its' children.
- * @param start_node Reference to root node of a tree (node from which analysed tree will be created).
+ * Computes transposition table key for specific node (base-3 encoded grid and currently moving player).
+ * @param node Min-Max tree node.
+ * @param current_player_mark Id that represents player that currently makes move (1 - 'X' player, 2 - 'O' player).
+ * @returns Non-zero key that identifies position.
+ */
+unsigned long long get_transposition_key(grid_t* node, int current_player_mark)
+{
+    unsigned long long key = 0;
+    for (int i = 0; i < node -> size * node -> size; i++) {
+        key = key * 3 + node -> content[i];
+    }
+    return key * 2 + current_player_mark;
+}
+
+/**
+ * Finds result of already analysed position in search context and assigns it to node.
+ * @param context Min-Max search context.
+ * @param node Min-Max tree node (not analysed yet).
+ * @param current_player_mark Id that represents player that currently makes move (1 - 'X' player, 2 - 'O' player).
+ * @param remaining_depth Number of tree levels that would be analysed below node.
+ * @returns 1 if node result was assigned from context, 0 otherwise.
+ */
+int find_transposition(minmax_context_t* context, grid_t* node, int current_player_mark, int remaining_depth)
+{
+    unsigned long long key = get_transposition_key(node, current_player_mark);
+    transposition_entry_t* entry = &context -> entries[key % context -> capacity];
+
+    // stored result can be used only if it was analysed at least as deep as it would be now
+    if (entry -> key != key || entry -> remaining_depth < remaining_depth) {
+        return 0;
+    }
+
+    node -> game_result = entry -> game_result;
+    node -> end_game_tree_depth = node -> end_game_tree_depth + entry -> end_game_distance;
+    node -> is_exact = entry -> remaining_depth == INT_MAX;
+    return 1;
+}
+
+/**
+ * Stores result of analysed node in search context.
+ * @param context Min-Max search context.
+ * @param node Analysed min-max tree node.
+ * @param current_player_mark Id that represents player that currently makes move (1 - 'X' player, 2 - 'O' player).
+ * @param node_depth Depth of node in analysed tree.
+ * @param remaining_depth Number of tree levels that were analysed below node.
+ */
+void store_transposition(minmax_context_t* context, grid_t* node, int current_player_mark, int node_depth, int remaining_depth)
+{
+    unsigned long long key = get_transposition_key(node, current_player_mark);
+    transposition_entry_t* entry = &context -> entries[key % context -> capacity];
+
+    if (entry -> key == 0) {
+        context -> entries_number++;
+    }
+
+    entry -> key = key;
+    entry -> game_result = node -> game_result;
+    entry -> end_game_distance = node -> end_game_tree_depth - node_depth;
+    // exact results (whole subtree analysed) are valid for any remaining depth
+    entry -> remaining_depth = node -> is_exact ? INT_MAX : remaining_depth;
+}
+
+/**
+ * Checks whether search should end as soon as possible (stop was requested or nodes limit was exceeded).
+ * Once search is stopped, it stays stopped until its end.
+ * @param context Min-Max search context (NULL when not used).
+ * @returns 1 if search is stopped, 0 otherwise.
+ */
+int is_search_stopped(minmax_context_t* context)
+{
+    if (context != NULL && context -> stop_requested) {
+        return 1;
+    }
+    return processed_nodes_limit > 0 && processed_nodes_number > processed_nodes_limit;
+}
+
+/**
+ * Analyses min-max tree node (recursively) using search context, if it's provided.
+ * @param start_node Reference to analysed node.
  * @param root_player_mark Id that represents player for which created tree will be analysed (1 - 'X' player, 2 - 'O' player).
  * @param current_player_mark Id that represents player that currently makes move (1 - 'X' player, 2 - 'O' player).
  * @param tree_depth_limit Tree processing depth limit (when we don't want to analyse whole tree).
+ * @param context Min-Max search context with results of already analysed positions (NULL when not used).
  */
-void minmax_analysis(grid_t* start_node, int root_player_mark, int current_player_mark, int tree_depth_limit)
+void analyse_tree_node(grid_t* start_node, int root_player_mark, int current_player_mark, int tree_depth_limit, minmax_context_t* context)
 {
+    processed_nodes_number++;
+
+    int node_depth = start_node -> end_game_tree_depth;
+    int use_context = context != NULL && start_node -> parent != NULL;
+
+    // search was stopped - node result is meaningless, so it's neither analysed nor stored
+    if (start_node -> parent != NULL && is_search_stopped(context)) {
+        start_node -> game_result = 0;
+        start_node -> is_exact = 0;
+        return;
+    }
+
+    // position was already analysed deep enough (root node is always analysed - its children are needed to make move)
+    if (use_context && find_transposition(context, start_node, current_player_mark, tree_depth_limit - node_depth)) {
+        return;
+    }
+
     // find free fields number and current game grid result
     int free_fields_num = get_available_fields_number(start_node -> content, start_node -> size);
     int game_result = get_game_result(start_node -> content, start_node -> size, root_player_mark);
+    start_node -> is_exact = 1;
 
     // game surely ended (assign game result => only game result, tree depth is assigned automatically while creating tree leaves)
     if (game_result == 1 || game_result == -1) {
@@ -412,10 +539,10 @@ void minmax_analysis(grid_t* start_node, int root_player_mark, int current_playe
 
                 // recursively analyse tree starting from newly created node
                 if (current_player_mark == 1) {
-                    minmax_analysis(start_node -> children[i], root_player_mark, 2, tree_depth_limit);
+                    analyse_tree_node(start_node -> children[i], root_player_mark, 2, tree_depth_limit, context);
                 }
                 else if (current_player_mark == 2) {
-                    minmax_analysis(start_node -> children[i], root_player_mark, 1, tree_depth_limit);
+                    analyse_tree_node(start_node -> children[i], root_player_mark, 1, tree_depth_limit, context);
                 }
             }
 
@@ -432,9 +559,27 @@ void minmax_analysis(grid_t* start_node, int root_player_mark, int current_playe
             else {
                 // game has not ended yet & we have to foresee game result according to win/draw/loss probability
                 assign_possible_endgame_result(start_node, root_player_mark, current_player_mark);
+                start_node -> is_exact = 0;
             }
         }
     }
+
+    // results computed after stop request may be based on unanalysed children
+    if (use_context && !is_search_stopped(context)) {
+        store_transposition(context, start_node, current_player_mark, node_depth, tree_depth_limit - node_depth);
+    }
+}
+
+/**
+ * Creates and analyse min-max tree starting from specific position for tic-tac-toe game. All necessary data, to choose final tic-tac-toe is held in root node and its' children.
+ * @param start_node Reference to root node of a tree (node from which analysed tree will be created).
+ * @param root_player_mark Id that represents player for which created tree will be analysed (1 - 'X' player, 2 - 'O' player).
+ * @param current_player_mark Id that represents player that currently makes move (1 - 'X' player, 2 - 'O' player).
+ * @param tree_depth_limit Tree processing depth limit (when we don't want to analyse whole tree).
+ */
+void minmax_analysis(grid_t* start_node, int root_player_mark, int current_player_mark, int tree_depth_limit)
+{
+    analyse_tree_node(start_node, root_player_mark, current_player_mark, tree_depth_limit, NULL);
 }
 
 /**
@@ -474,16 +619,13 @@ int get_optimal_move(grid_t* root)
 } 
 
 /**
- * Makes Min-Max algorithm move in tic-tac-toe game.
+ * Creates min-max tree root for specific grid state.
  * @param grid Grid state for all calculations to be based on.
  * @param grid_size Size of grid.
- * @param root_player_mark Player sign for whom calculated is optimal move.
- * @param processing_depth_limit Tree processing depth limit.
- * @returns Selected by Min-Max algorithm optimal move for root player.
+ * @returns Min-Max tree root node.
  */
-int make_minmax_move(int* grid, int grid_size, int root_player_mark, int processing_depth_limit)
+grid_t* create_min_max_tree_root(int* grid, int grid_size)
 {
-    // create min-max tree root
     grid_t* tree_root = malloc(sizeof(grid_t));
     tree_root -> parent = NULL;
     tree_root -> content = malloc(sizeof(int) * grid_size * grid_size);
@@ -491,6 +633,24 @@ int make_minmax_move(int* grid, int grid_size, int root_player_mark, int process
     tree_root -> children = NULL;
     tree_root -> size = grid_size;
     tree_root -> end_game_tree_depth = 0;
+    return tree_root;
+}
+
+/**
+ * Makes Min-Max algorithm move in tic-tac-toe game.
+ * @param grid Grid state for all calculations to be based on.
+ * @param grid_size Size of grid.
+ * @param root_player_mark Player sign for whom calculated is optimal move.
+ * @param processing_depth_limit Tree processing depth limit.
+ * @returns Selected by Min-Max algorithm optimal move for root player.
+ */
+int make_minmax_move(int* grid, int grid_size, int root_player_mark, int processing_depth_limit)
+{
+    // create min-max tree root
+    grid_t* tree_root = create_min_max_tree_root(grid, grid_size);
+
+    // reset analysed nodes counter for the new search
+    processed_nodes_number = 0;
 
     // dynamically create and analyse min-max tree
     minmax_analysis(tree_root, root_player_mark, root_player_mark, processing_depth_limit);
@@ -499,3 +659,152 @@ int make_minmax_move(int* grid, int grid_size, int root_player_mark, int process
     int ai_move = get_optimal_move(tree_root);
     return ai_move;
 }
+
+/**
+ * Makes Min-Max algorithm move with limited number of analysed nodes. Tree is analysed with iterative deepening
+ * (processing depth limit is increased by one after each finished search) - when nodes limit is exceeded, search
+ * ends immediately and move found by the deepest finished search is returned.
+ * @param grid Grid state for all calculations to be based on.
+ * @param grid_size Size of grid.
+ * @param root_player_mark Player sign for whom calculated is optimal move.
+ * @param processing_depth_limit Tree processing depth limit.
+ * @param max_nodes Max. number of analysed nodes (all iterations included).
+ * @returns Selected by Min-Max algorithm optimal move for root player.
+ */
+int make_minmax_budget_move(int* grid, int grid_size, int root_player_mark, int processing_depth_limit, long long max_nodes)
+{
+    int ai_move = -1;
+    processed_nodes_number = 0;
+    processed_nodes_limit = max_nodes;
+
+    for (int depth_limit = 0; depth_limit <= processing_depth_limit; depth_limit++) {
+        grid_t* tree_root = create_min_max_tree_root(grid, grid_size);
+        minmax_analysis(tree_root, root_player_mark, root_player_mark, depth_limit);
+        int move = get_optimal_move(tree_root);
+
+        // result of interrupted search is not reliable (unless no search has been finished yet)
+        if (is_search_stopped(NULL)) {
+            if (ai_move == -1) {
+                ai_move = move;
+            }
+            break;
+        }
+        ai_move = move;
+    }
+
+    processed_nodes_limit = 0;
+    return ai_move;
+}
+
+/**
+ * Seeds random numbers of searches made in the calling thread, so the same sequence of searches gives the same moves.
+ * @param seed Random numbers seed.
+ */
+void set_minmax_random_seed(unsigned long long seed)
+{
+    random_state = seed;
+    is_random_seeded = 1;
+}
+
+/**
+ * Returns number of min-max tree nodes analysed by the last search made in the calling thread.
+ * @returns Number of nodes visited while last 'make_minmax_move' call (root node included).
+ */
+long long get_processed_nodes_number()
+{
+    return processed_nodes_number;
+}
+
+/**
+ * Creates min-max search context - transposition table that keeps results of analysed positions between searches
+ * (e.g. for consecutive moves of the same game).
+ * @param grid_size Size of grid analysed with context.
+ * @param capacity Max. number of stored positions (it determines context memory usage).
+ * @returns New search context (it has to be released with 'destroy_minmax_context').
+ */
+minmax_context_t* create_minmax_context(int grid_size, long long capacity)
+{
+    minmax_context_t* context = malloc(sizeof(minmax_context_t));
+    context -> size = grid_size;
+    context -> root_player_mark = 0;
+    context -> capacity = capacity > 0 ? capacity : 1;
+    context -> entries_number = 0;
+    context -> entries = calloc(context -> capacity, sizeof(transposition_entry_t));
+    context -> stop_requested = 0;
+    return context;
+}
+
+/**
+ * Removes all positions stored in min-max search context.
+ * @param context Min-Max search context.
+ */
+void clear_minmax_context(minmax_context_t* context)
+{
+    memset(context -> entries, 0, sizeof(transposition_entry_t) * context -> capacity);
+    context -> entries_number = 0;
+}
+
+/**
+ * Releases min-max search context.
+ * @param context Min-Max search context.
+ */
+void destroy_minmax_context(minmax_context_t* context)
+{
+    free(context -> entries);
+    free(context);
+}
+
+/**
+ * Makes Min-Max algorithm move using results of positions analysed by previous searches of the same context.
+ * @param context Min-Max search context.
+ * @param grid Grid state for all calculations to be based on.
+ * @param root_player_mark Player sign for whom calculated is optimal move.
+ * @param processing_depth_limit Tree processing depth limit.
+ * @returns Selected by Min-Max algorithm optimal move for root player (-1 if search was stopped).
+ */
+int make_minmax_context_move(minmax_context_t* context, int* grid, int root_player_mark, int processing_depth_limit)
+{
+    // stored results are evaluated from root player point of view
+    if (context -> root_player_mark != root_player_mark) {
+        clear_minmax_context(context);
+        context -> root_player_mark = root_player_mark;
+    }
+
+    grid_t* tree_root = create_min_max_tree_root(grid, context -> size);
+    processed_nodes_number = 0;
+
+    analyse_tree_node(tree_root, root_player_mark, root_player_mark, processing_depth_limit, context);
+    int move = get_optimal_move(tree_root);
+
+    // stopped search did not find reliable move
+    return context -> stop_requested ? -1 : move;
+}
+
+/**
+ * Requests stop of search made with context (it can be called from other thread than the searching one).
+ * Stopped search ends as soon as possible and stores no results, so context stays consistent.
+ * Stop request stays active until it's withdrawn with the same function.
+ * @param context Min-Max search context.
+ * @param stop_requested 1 to stop searches made with context, 0 to allow them again.
+ */
+void set_minmax_context_stop(minmax_context_t* context, int stop_requested)
+{
+    context -> stop_requested = stop_requested;
+}
+
+/**
+ * Returns number of positions stored in min-max search context.
+ * @param context Min-Max search context.
+ */
+long long get_minmax_context_entries_number(minmax_context_t* context)
+{
+    return context -> entries_number;
+}
+
+/**
+ * Returns size (in bytes) of single min-max search context entry.
+ */
+int get_transposition_entry_size()
+{
+    return sizeof(transposition_entry_t);
+}
\ No newline at end of file
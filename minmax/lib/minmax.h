@@ -16,14 +16,46 @@ typedef struct grid {
     int children_num;
     int game_result;
     int end_game_tree_depth;
+    int is_exact;
 } grid_t;
 
+// transposition table entry (result of already analysed position, end game distance is relative to position)
+typedef struct transposition_entry {
+    unsigned long long key;
+    int game_result;
+    int end_game_distance;
+    int remaining_depth;
+} transposition_entry_t;
+
+// min-max search context (transposition table kept between searches of the same game)
+typedef struct minmax_context {
+    int size;
+    int root_player_mark;
+    long long capacity;
+    long long entries_number;
+    transposition_entry_t* entries;
+    volatile int stop_requested;
+} minmax_context_t;
+
 // min-max algorithm functions
 grid_t* create_min_max_tree_node(grid_t* parent);
 void get_result_from_children(grid_t* node, int root_player_mark, int current_player_mark);
 void minmax_analysis(grid_t* start_node, int root_player_mark, int current_player_mark, int tree_depth_limit);
 int get_optimal_move(grid_t* root);
 int make_minmax_move(int* grid, int grid_size, int root_player_mark, int processing_depth_limit);
+int make_minmax_budget_move(int* grid, int grid_size, int root_player_mark, int processing_depth_limit, long long max_nodes);
+int is_search_stopped(minmax_context_t* context);
+long long get_processed_nodes_number();
+void set_minmax_random_seed(unsigned long long seed);
+
+// min-max search context functions
+minmax_context_t* create_minmax_context(int grid_size, long long capacity);
+void clear_minmax_context(minmax_context_t* context);
+void destroy_minmax_context(minmax_context_t* context);
+int make_minmax_context_move(minmax_context_t* context, int* grid, int root_player_mark, int processing_depth_limit);
+long long get_minmax_context_entries_number(minmax_context_t* context);
+void set_minmax_context_stop(minmax_context_t* context, int stop_requested);
+int get_transposition_entry_size();
 
 int* get_available_fields(int* grid, int size);
 int get_available_fields_number(int* grid, int size);
@@ -0,0 +1,184 @@
+import ctypes
+import pathlib
+
+
+# default location of compiled min-max library (build it with 'make -C minmax/lib')
+MINMAX_LIBRARY_PATH = pathlib.Path(__file__).resolve().parent / "lib" / "minmax.so"
+
+
+class MinMaxLibrary():
+    '''
+    Min-Max algorithm C implementation binding (wraps 'minmax.so' shared library).
+    '''
+
+    _library = None
+    _library_path = None
+
+    def __init__(self, library_path=None):
+        '''
+        Loads min-max shared library and declares its functions signatures.
+
+        args:
+            library_path    - type: str     - path to compiled 'minmax.so' library (default one is used when None)
+        '''
+
+        self._library_path = str(library_path if library_path is not None else MINMAX_LIBRARY_PATH)
+        self._library = ctypes.CDLL(self._library_path)
+
+        self._library.make_minmax_move.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        self._library.make_minmax_move.restype = ctypes.c_int
+        self._library.make_minmax_budget_move.argtypes = [
+            ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_longlong
+        ]
+        self._library.make_minmax_budget_move.restype = ctypes.c_int
+
+        self._library.get_processed_nodes_number.argtypes = []
+        self._library.get_processed_nodes_number.restype = ctypes.c_longlong
+        self._library.set_minmax_random_seed.argtypes = [ctypes.c_ulonglong]
+        self._library.set_minmax_random_seed.restype = None
+
+        # search context functions (context is passed as opaque pointer)
+        self._library.create_minmax_context.argtypes = [ctypes.c_int, ctypes.c_longlong]
+        self._library.create_minmax_context.restype = ctypes.c_void_p
+        self._library.clear_minmax_context.argtypes = [ctypes.c_void_p]
+        self._library.clear_minmax_context.restype = None
+        self._library.destroy_minmax_context.argtypes = [ctypes.c_void_p]
+        self._library.destroy_minmax_context.restype = None
+        self._library.make_minmax_context_move.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.c_int, ctypes.c_int
+        ]
+        self._library.make_minmax_context_move.restype = ctypes.c_int
+        self._library.get_minmax_context_entries_number.argtypes = [ctypes.c_void_p]
+        self._library.get_minmax_context_entries_number.restype = ctypes.c_longlong
+        self._library.set_minmax_context_stop.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self._library.set_minmax_context_stop.restype = None
+        self._library.get_transposition_entry_size.argtypes = []
+        self._library.get_transposition_entry_size.restype = ctypes.c_int
+
+    @property
+    def library_path(self):
+        return self._library_path
+
+    def make_move(self, grid, grid_size, moving_player, processing_depth_limit, max_nodes=None):
+        '''
+        Finds min-max algorithm move for given grid state.
+
+        args:
+            grid                    - type: list    - grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player)
+            grid_size               - type: int     - size of grid
+            moving_player           - type: int     - player for whom move is searched (1 - 'X', 2 - 'O')
+            processing_depth_limit  - type: int     - tree processing depth limit
+            max_nodes               - type: int     - max. number of analysed nodes (None when not limited) - limited
+                                                      search deepens iteratively and returns move of the deepest
+                                                      search finished within limit
+
+        returns:
+            int - index of field chosen by min-max algorithm
+        '''
+
+        GridStateCls = ctypes.c_int * len(grid)
+        if max_nodes is not None:
+            return self._library.make_minmax_budget_move(
+                GridStateCls(*grid), grid_size, moving_player, processing_depth_limit, max_nodes
+            )
+        return self._library.make_minmax_move(GridStateCls(*grid), grid_size, moving_player, processing_depth_limit)
+
+    def set_random_seed(self, seed):
+        '''
+        Seeds random numbers of searches made in the calling thread (without seed they are seeded with current
+        time, so the same searches may give different moves).
+        '''
+
+        self._library.set_minmax_random_seed(seed)
+
+    def get_processed_nodes_number(self):
+        '''
+        Returns number of tree nodes analysed by the last search made in the calling thread.
+        '''
+
+        return self._library.get_processed_nodes_number()
+
+    def create_context(self, grid_size, memory_limit):
+        '''
+        Creates search context that keeps results of analysed positions between searches.
+
+        args:
+            grid_size       - type: int     - size of grid analysed with context
+            memory_limit    - type: int     - max. memory (in bytes) used by context transposition table
+
+        returns:
+            MinMaxContext - new search context
+        '''
+
+        capacity = max(memory_limit // self._library.get_transposition_entry_size(), 1)
+        return MinMaxContext(self, grid_size, capacity)
+
+
+class MinMaxContext():
+    '''
+    Min-Max search context (transposition table kept in C library between searches of the same game).
+    Context must not be used by two threads at the same time.
+    '''
+
+    _minmax_library = None
+    _pointer = None
+    _grid_size = None
+    _capacity = None
+
+    def __init__(self, minmax_library, grid_size, capacity):
+        self._minmax_library = minmax_library
+        self._grid_size = grid_size
+        self._capacity = capacity
+        self._pointer = minmax_library._library.create_minmax_context(grid_size, capacity)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def memory_usage(self):
+        return self._capacity * self._minmax_library._library.get_transposition_entry_size()
+
+    def make_move(self, grid, moving_player, processing_depth_limit):
+        '''
+        Finds min-max algorithm move reusing results of previous searches made with this context.
+
+        args:
+            grid                    - type: list    - grid fields (0 - free field, 1 - 'X' player, 2 - 'O' player)
+            moving_player           - type: int     - player for whom move is searched (1 - 'X', 2 - 'O')
+            processing_depth_limit  - type: int     - tree processing depth limit
+
+        returns:
+            int - index of field chosen by min-max algorithm (None when search was stopped)
+        '''
+
+        GridStateCls = ctypes.c_int * len(grid)
+        move = self._minmax_library._library.make_minmax_context_move(
+            self._pointer, GridStateCls(*grid), moving_player, processing_depth_limit
+        )
+        return move if move >= 0 else None
+
+    def stop(self):
+        '''
+        Stops search made with context by other thread (and all following ones until 'resume' is called).
+        Stopped search does not store its partial results, so context can be still used.
+        '''
+
+        self._minmax_library._library.set_minmax_context_stop(self._pointer, 1)
+
+    def resume(self):
+        self._minmax_library._library.set_minmax_context_stop(self._pointer, 0)
+
+    def get_entries_number(self):
+        return self._minmax_library._library.get_minmax_context_entries_number(self._pointer)
+
+    def clear(self):
+        self._minmax_library._library.clear_minmax_context(self._pointer)
+
+    def close(self):
+        if self._pointer is not None:
+            self._minmax_library._library.destroy_minmax_context(self._pointer)
+            self._pointer = None
+
+    def __del__(self):
+        self.close()
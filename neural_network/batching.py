@@ -0,0 +1,111 @@
+import threading
+import time
+
+import numpy
+
+
+class _BatchRequest():
+    '''
+    Rows of single request waiting for batch forward pass.
+    '''
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.finished = threading.Event()
+        self.predictions = None
+        self.error = None
+
+
+class InferenceBatcher():
+    '''
+    Collects rows of concurrent requests and predicts them with single forward pass of model. Batch is predicted
+    when it has max. number of rows or when its first request waited for max. wait time.
+    '''
+
+    def __init__(self, predict, max_wait=0.002, max_rows=512, on_batch=None):
+        '''
+        args:
+            predict     - type: function    - model prediction function (takes rows matrix, returns predictions matrix)
+            max_wait    - type: float       - max. time (in seconds) of waiting for other requests rows
+            max_rows    - type: int         - max. number of rows of batch (request rows are never split)
+            on_batch    - type: function    - called after each batch with number of its requests and rows
+        '''
+
+        self._predict = predict
+        self._max_wait = max_wait
+        self._max_rows = max_rows
+        self._on_batch = on_batch
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._pending_rows = 0
+        self._thread = threading.Thread(target=self.__run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def predict(self, rows):
+        '''
+        Predicts rows together with rows of other requests and waits for predictions.
+
+        args:
+            rows    - type: list    - model input rows
+
+        returns:
+            numpy.ndarray - predictions of rows (in order of rows)
+        '''
+
+        request = _BatchRequest(rows)
+        with self._condition:
+            self._pending.append(request)
+            self._pending_rows += len(rows)
+            self._condition.notify()
+
+        request.finished.wait()
+        if request.error is not None:
+            raise request.error
+        return request.predictions
+
+    def __take_batch(self):
+        '''
+        Waits for the first request and then for max. number of rows or until max. wait time passes.
+
+        returns:
+            list - requests of batch
+        '''
+
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending)
+            deadline = time.monotonic() + self._max_wait
+            while self._pending_rows < self._max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch, rows_number = [], 0
+            while self._pending and (not batch or rows_number + len(self._pending[0].rows) <= self._max_rows):
+                request = self._pending.pop(0)
+                batch.append(request)
+                rows_number += len(request.rows)
+            self._pending_rows -= rows_number
+            return batch
+
+    def __run(self):
+        while True:
+            batch = self.__take_batch()
+            try:
+                predictions = self._predict(numpy.concatenate([request.rows for request in batch]))
+            except Exception as error:
+                for request in batch:
+                    request.error = error
+                    request.finished.set()
+                continue
+
+            # predictions are scattered back to requests
+            offset = 0
+            for request in batch:
+                request.predictions = predictions[offset:offset + len(request.rows)]
+                offset += len(request.rows)
+                request.finished.set()
+
+            if self._on_batch is not None:
+                self._on_batch(len(batch), offset)
@@ -0,0 +1,275 @@
+'''
+Neural networks learning datasets - binary dataset files are written by data generators ('--binary' flag, see
+'data_generator/dataset_writer.c') and read with numpy memory map, so rows are never parsed in Python. Text datasets
+('(0, 1, 2, ...) -> (0.0000, 1.0000, 0.0000)' lines) can be converted to binary ones.
+
+Binary file layout (little-endian): 32 bytes header - magic, version, grid size, labels number, record size and
+records number - followed by fixed width records. Record is grid fields packed by 2 bits (field 'i' in bits 2 * i)
+followed by float32 labels (draw, 'X' player win and 'O' player win probabilities).
+
+Generators can split output into chunk files ('--chunk-games' option - 'PATH.00000', 'PATH.00001', ...), chunked
+dataset is loaded with 'load_chunked_dataset'.
+
+Usage (from repository root):
+    python -m neural_network.dataset convert INPUT.dat OUTPUT.bin --grid-size 4
+'''
+import argparse
+import glob
+import os
+import re
+import struct
+import sys
+
+import numpy
+
+
+DATASET_MAGIC = b"TTTD"
+DATASET_VERSION = 1
+DATASET_HEADER = struct.Struct("<4sHBBIIQ")
+DATASET_HEADER_SIZE = 32
+DATASET_LABELS_NUMBER = 3
+# number of text lines converted at once
+CONVERSION_CHUNK_ROWS = 65536
+
+
+class DatasetFormatError(Exception):
+    '''
+    Raised when dataset file is not a binary dataset of supported version.
+    '''
+
+
+def get_record_dtype(grid_size):
+    return numpy.dtype([
+        ('grid', numpy.uint8, ((grid_size * grid_size * 2 + 7) // 8,)),
+        ('labels', "<f4", (DATASET_LABELS_NUMBER,)),
+    ])
+
+
+def read_header(path):
+    '''
+    returns:
+        tuple - (grid size, records number)
+
+    throws:
+        DatasetFormatError - when file is not a binary dataset
+    '''
+
+    with open(path, "rb") as file:
+        header = file.read(DATASET_HEADER_SIZE)
+    if len(header) < DATASET_HEADER_SIZE:
+        raise DatasetFormatError("Dataset file '{path}' is too short.".format(path=path))
+
+    magic, version, grid_size, labels_number, record_size, reserved, records_number = DATASET_HEADER.unpack_from(header)
+    if magic != DATASET_MAGIC or version != DATASET_VERSION:
+        raise DatasetFormatError("File '{path}' is not a binary dataset of version {version}.".format(
+            path=path, version=DATASET_VERSION
+        ))
+    if labels_number != DATASET_LABELS_NUMBER or record_size != get_record_dtype(grid_size).itemsize:
+        raise DatasetFormatError("Dataset file '{path}' has unsupported record layout.".format(path=path))
+    return grid_size, records_number
+
+
+def is_binary_dataset(path):
+    with open(path, "rb") as file:
+        return file.read(len(DATASET_MAGIC)) == DATASET_MAGIC
+
+
+def open_records(path):
+    '''
+    Maps dataset records (file is not read until records are used).
+
+    returns:
+        tuple - (grid size, numpy.memmap of records)
+
+    throws:
+        DatasetFormatError - when file has less records than its header declares
+    '''
+
+    grid_size, records_number = read_header(path)
+    record_dtype = get_record_dtype(grid_size)
+    file_records_number = max(os.path.getsize(path) - DATASET_HEADER_SIZE, 0) // record_dtype.itemsize
+    if records_number > file_records_number:
+        raise DatasetFormatError("Dataset file '{path}' is truncated - it has {file_records} of {records} records.".format(
+            path=path, file_records=file_records_number, records=records_number
+        ))
+    # records number of header is not updated until writer is closed - all whole records of unfinished file are used
+    # (partially written last record is skipped)
+    if records_number == 0:
+        records_number = file_records_number
+
+    records = numpy.memmap(path, dtype=record_dtype, mode="r", offset=DATASET_HEADER_SIZE, shape=(records_number,))
+    return grid_size, records
+
+
+def unpack_grids(packed_grids, grid_size):
+    '''
+    Unpacks grid fields of records.
+
+    returns:
+        numpy.ndarray - grids (rows of grid fields: 0 - free field, 1 - 'X' player, 2 - 'O' player)
+    '''
+
+    fields = numpy.arange(grid_size * grid_size)
+    return (packed_grids[:, fields // 4] >> (2 * (fields % 4)).astype(numpy.uint8)) & 3
+
+
+def load_dataset(path, start=0, stop=None):
+    '''
+    Loads rows of binary dataset.
+
+    args:
+        path    - type: str     - dataset file path
+        start   - type: int     - index of the first loaded record
+        stop    - type: int     - index of record after the last loaded one (None - all records)
+
+    returns:
+        tuple - (input rows - grids fields, output rows - labels)
+    '''
+
+    grid_size, records = open_records(path)
+    records = records[start:stop]
+    return unpack_grids(records['grid'], grid_size), numpy.array(records['labels'])
+
+
+def iterate_dataset(path, rows_number):
+    '''
+    Yields rows of binary dataset in chunks (e.g. for datasets that do not fit in memory).
+
+    returns:
+        generator - (input rows, output rows) chunks of max. rows number
+    '''
+
+    grid_size, records = open_records(path)
+    for start in range(0, len(records), rows_number):
+        chunk = records[start:start + rows_number]
+        yield unpack_grids(chunk['grid'], grid_size), numpy.array(chunk['labels'])
+
+
+def get_chunk_paths(path):
+    '''
+    Finds finished chunk files of dataset (unfinished '.part' chunks are skipped).
+
+    returns:
+        list - chunk files paths ordered by chunk number
+    '''
+
+    chunk_paths = [
+        chunk_path for chunk_path in glob.glob(glob.escape(path) + ".*") if re.fullmatch(r"\.\d+", chunk_path[len(path):])
+    ]
+    return sorted(chunk_paths, key=lambda chunk_path: int(chunk_path[len(path) + 1:]))
+
+
+def load_chunked_dataset(path):
+    '''
+    Loads rows of all finished chunks of binary dataset.
+
+    returns:
+        tuple - (input rows - grids fields, output rows - labels)
+    '''
+
+    chunks = [load_dataset(chunk_path) for chunk_path in get_chunk_paths(path)]
+    if not chunks:
+        raise FileNotFoundError("Dataset '{path}' has no finished chunks.".format(path=path))
+    return numpy.concatenate([chunk[0] for chunk in chunks]), numpy.concatenate([chunk[1] for chunk in chunks])
+
+
+def pack_grids(grids, grid_size):
+    grids = numpy.asarray(grids, dtype=numpy.uint8)
+    packed_grids = numpy.zeros((len(grids), (grid_size * grid_size * 2 + 7) // 8), dtype=numpy.uint8)
+    for field in range(grid_size * grid_size):
+        packed_grids[:, field // 4] |= grids[:, field] << (2 * (field % 4))
+    return packed_grids
+
+
+class DatasetWriter():
+    '''
+    Binary dataset writer (records number of header is updated when writer is closed).
+    '''
+
+    def __init__(self, path, grid_size):
+        self._file = open(path, "wb")
+        self._grid_size = grid_size
+        self._records_number = 0
+        self.__write_header()
+
+    def __write_header(self):
+        self._file.seek(0)
+        self._file.write(DATASET_HEADER.pack(
+            DATASET_MAGIC, DATASET_VERSION, self._grid_size, DATASET_LABELS_NUMBER,
+            get_record_dtype(self._grid_size).itemsize, 0, self._records_number
+        ).ljust(DATASET_HEADER_SIZE, b"\0"))
+        self._file.seek(0, 2)
+
+    def write(self, grids, labels):
+        records = numpy.zeros(len(grids), dtype=get_record_dtype(self._grid_size))
+        records['grid'] = pack_grids(grids, self._grid_size)
+        records['labels'] = labels
+        self._file.write(records.tobytes())
+        self._records_number += len(records)
+
+    @property
+    def records_number(self):
+        return self._records_number
+
+    def close(self):
+        self.__write_header()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def parse_text_line(line):
+    # '(0, 1, 2, ) -> (0.0000, 1.0000, 0.0000)' line is split without 'eval'
+    grid, labels = line.split("->")
+    grid = [int(field) for field in grid.strip(" ()\n").split(",") if field.strip() != ""]
+    labels = [float(label) for label in labels.strip(" ()\n").split(",")]
+    return grid, labels
+
+
+def convert_text_dataset(input_path, output_path, grid_size):
+    '''
+    Converts text dataset to binary one (empty lines are skipped).
+
+    returns:
+        int - number of converted records
+    '''
+
+    with open(input_path, "r") as input_file, DatasetWriter(output_path, grid_size) as writer:
+        grids, labels = [], []
+        for line in input_file:
+            if line.strip() == "":
+                continue
+            grid, grid_labels = parse_text_line(line)
+            grids.append(grid)
+            labels.append(grid_labels)
+            if len(grids) == CONVERSION_CHUNK_ROWS:
+                writer.write(grids, labels)
+                grids, labels = [], []
+        if grids:
+            writer.write(grids, labels)
+        return writer.records_number
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Neural network datasets tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="convert text dataset to binary one")
+    convert_parser.add_argument("input", help="text dataset file")
+    convert_parser.add_argument("output", help="binary dataset file")
+    convert_parser.add_argument("--grid-size", type=int, required=True, choices=[3, 4, 5], help="grid size of dataset")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    records_number = convert_text_dataset(arguments.input, arguments.output, arguments.grid_size)
+    print("Converted {records} records to '{output}'.".format(records=records_number, output=arguments.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
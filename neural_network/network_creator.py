@@ -3,11 +3,15 @@ import networks_config as config
 import sys
 # load trained model
 import pathlib
-from neural_network_cls import NeuralNetworkSklearn
 from random import randint
 import numpy
 import time
 import matplotlib.pyplot as plt
+# neural network class uses repository packages (e.g. grid symmetries)
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from neural_network_cls import NeuralNetworkSklearn, PolicyNeuralNetworkSklearn  # noqa: E402
+from neural_network.dataset import get_chunk_paths, load_chunked_dataset, load_dataset  # noqa: E402
+from neural_network.policy_dataset import make_policy_dataset  # noqa: E402
 
 allowed_sizes = [3, 4, 5]
 
@@ -29,26 +33,53 @@ elif size == 5:
     type = "games"
 
 
+# policy network (picks move with single forward pass) is created instead of value network with '--policy' flag
+policy = "--policy" in sys.argv
+
+# policy networks learning data are labelled by engine - min-max search depth limits
+POLICY_LABELS_DEPTH_LIMITS = {4: 5, 5: 3}
+
+
 def get_configuration(size: int):
     if size == 3:
-        return config.network_configuration_3x3
+        return config.policy_network_configuration_3x3 if policy else config.network_configuration_3x3
     elif size == 4:
-        return config.network_configuration_4x4
+        return config.policy_network_configuration_4x4 if policy else config.network_configuration_4x4
     elif size == 5:
-        return config.network_configuration_5x5
+        return config.policy_network_configuration_5x5 if policy else config.network_configuration_5x5
     return None
 
 
 configuration = get_configuration(size)
-network_sklearn = NeuralNetworkSklearn(configuration)
-
-if pathlib.Path("./network_{size}x{size}".format(size=size)).exists():
+if policy:
+    network_sklearn = PolicyNeuralNetworkSklearn(configuration)
+    model_filename = "network_policy_{size}x{size}".format(size=size)
+else:
+    network_sklearn = NeuralNetworkSklearn(configuration)
+    model_filename = "network_{size}x{size}".format(size=size)
+
+if pathlib.Path("./" + model_filename).exists():
     print("Loading neural network...")
-    network_sklearn.load_model("network_{size}x{size}".format(size=size))
+    network_sklearn.load_model(model_filename)
     print("Model loaded...")
 
 
+def load_binary_data(path: str):
+    # binary dataset (generator '--binary' output or converted text dataset) is memory mapped instead of parsed,
+    # chunked generator output ('--chunk-games') is loaded from all finished chunks
+    if pathlib.Path(path).exists():
+        return load_dataset(path)
+    if get_chunk_paths(path):
+        return load_chunked_dataset(path)
+    return None
+
+
 def load_data(size: int):
+    binary_data = load_binary_data("../data_generator/ttt_{size}x{size}_data.bin".format(size=size))
+    if binary_data is not None:
+        input_data, output_data = binary_data
+        return ({"input": input_data, "output": output_data}, {"input": input_data, "output": output_data})
+
     learning_dataset = {"input": [], "output": []}
     validation_dataset = {"input": [], "output": []}
 
@@ -92,7 +123,38 @@ def load_data(size: int):
     return (learning_dataset, validation_dataset)
 
 
-if "--learn" in sys.argv:
+def get_policy_labeller(size: int):
+    '''
+    Returns function that finds the best move of position - 3x3 positions are solved exactly, bigger ones are
+    searched by min-max library.
+    '''
+
+    if size == 3:
+        from engine.tablebase import find_table_move, solve_game
+        table = solve_game(size)
+        return lambda grid, grid_size, moving_player: find_table_move(table, grid, grid_size, moving_player)
+
+    from minmax.minmax_lib import MinMaxLibrary
+    minmax_library = MinMaxLibrary()
+    return lambda grid, grid_size, moving_player: minmax_library.make_move(
+        grid, grid_size, moving_player, POLICY_LABELS_DEPTH_LIMITS[grid_size]
+    )
+
+
+if "--learn" in sys.argv and policy:
+    print("Loading learning data...")
+    datasets = load_data(size)
+    print("Labelling learning data with engine moves...")
+    learning_input_data, learning_output_data = make_policy_dataset(
+        datasets[0]['input'], size, get_policy_labeller(size)
+    )
+    print("Learning data loaded...")
+
+    print("Learning network...")
+    network_sklearn.learn(numpy.array(learning_input_data), numpy.array(learning_output_data))
+    print("Network learnt...")
+
+elif "--learn" in sys.argv:
     print("Loading learning data...")
     datasets = load_data(size)
     print("Learning data loaded...")
@@ -248,7 +310,7 @@ def make_network_time_stats(network, games_number, grid_size):
 
 if "--learn" in sys.argv:
     print("Saving network to file...")
-    network_sklearn.save_model("network_{size}x{size}".format(size=size))
+    network_sklearn.save_model(model_filename)
     print("Network exported to file...")
 
 
@@ -41,3 +41,48 @@ network_configuration_5x5 = {
     'max_iter': 50,
     'n_iter_no_change': 50
 }
+
+# policy networks (MLPClassifier) - input is grid and moving player, output is distribution of the best move
+policy_network_configuration_3x3 = {
+    'hidden_layer_sizes': (200,),
+    'activation': 'relu',
+    'solver': 'adam',
+    'alpha': 0.0001,
+    'batch_size': 32,
+    'learning_rate': 'adaptive',
+    'learning_rate_init': 0.001,
+    'shuffle': True,
+    'momentum': 0.001,
+    'verbose': True,
+    'max_iter': 250,
+}
+
+policy_network_configuration_4x4 = {
+    'hidden_layer_sizes': (400, 250,),
+    'activation': 'relu',
+    'solver': 'adam',
+    'alpha': 0.005,
+    'batch_size': 32,
+    'learning_rate': 'adaptive',
+    'learning_rate_init': 0.01,
+    'shuffle': True,
+    'momentum': 0.001,
+    'verbose': True,
+    'max_iter': 50,
+    'n_iter_no_change': 50
+}
+
+policy_network_configuration_5x5 = {
+    'hidden_layer_sizes': (700, 500,),
+    'activation': 'relu',
+    'solver': 'adam',
+    'alpha': 0.0001,
+    'batch_size': 32,
+    'learning_rate': 'adaptive',
+    'learning_rate_init': 0.007,
+    'shuffle': True,
+    'momentum': 0.001,
+    'verbose': True,
+    'max_iter': 50,
+    'n_iter_no_change': 50
+}
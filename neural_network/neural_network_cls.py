@@ -1,20 +1,102 @@
-from sklearn.neural_network import MLPRegressor
+import collections
+import hashlib
+import sys
+import threading
+
+import numpy
+from sklearn.neural_network import MLPClassifier, MLPRegressor
 from joblib import dump, load
 
+from engine.symmetry import canonicalize
+
 
-class NeuralNetworkSklearn():
+class SklearnModelMixin():
+    '''
+    Model version, saving and loading of networks that wrap scikit-learn model (model is kept in '_model').
+    '''
 
     _model = None
     _model_config = None
+    _model_version = None
+
+    @property
+    def model_version(self):
+        return self._model_version
+
+    def _update_model_version(self):
+        # version is hash of model weights - it changes whenever model is learned or loaded
+        version = hashlib.sha1()
+        for weights in getattr(self._model, "coefs_", []) + getattr(self._model, "intercepts_", []):
+            version.update(weights.tobytes())
+        self._model_version = version.hexdigest()[:16]
+
+    def save_model(self, filename):
+        dump(self._model, filename)
+
+    def load_model(self, filename):
+        try:
+            self._model = load(filename)
+        except FileNotFoundError:
+            return False
+        self._update_model_version()
+        return True
+
+
+class NeuralNetworkSklearn(SklearnModelMixin):
+
+    _cache_size = None
+    _on_cache_lookup = None
+
+    def __init__(self, configuration, cache_size=0, on_cache_lookup=None):
+        '''
+        args:
+            configuration   - type: dict        - MLPRegressor parameters
+            cache_size      - type: int         - max. number of cached predictions of canonical boards (0 disables cache)
+            on_cache_lookup - type: function    - called after each move with numbers of cache hits and misses
+                                                  and cache memory usage (in bytes)
+        '''
 
-    def __init__(self, configuration):
         self._model = MLPRegressor(
             **configuration
         )
         self._model_config = configuration
+        self._cache_size = cache_size
+        self._on_cache_lookup = on_cache_lookup
+        self._cache_lock = threading.Lock()
+        self.__reset_cache()
+
+    def __reset_cache(self):
+        # cached predictions belong to model version - they are dropped whenever model changes
+        with self._cache_lock:
+            self._cache = collections.OrderedDict()
+            self._cache_memory = 0
+            self._cache_hits = 0
+            self._cache_misses = 0
+
+    def _update_model_version(self):
+        super()._update_model_version()
+        self.__reset_cache()
+
+    def get_cache_stats(self):
+        '''
+        returns:
+            dict - model version, number of cache hits and misses, hit ratio, entries number and memory usage (bytes)
+        '''
+
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'model_version': self._model_version,
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'hit_ratio': self._cache_hits / lookups if lookups > 0 else 0.0,
+                'entries': len(self._cache),
+                'memory_bytes': self._cache_memory,
+            }
 
     def learn(self, input_data, output_data):
         self._model.fit(input_data, output_data)
+        self._update_model_version()
 
     def __fetch_available_moves(self, grid, grid_size):
 
@@ -26,22 +108,84 @@ class NeuralNetworkSklearn():
 
         return free_fields
 
-    def make_move(self, grid, grid_size, neural_network_sign):
-        available_moves = self.__fetch_available_moves(grid, grid_size)
+    def get_children(self, grid, grid_size, neural_network_sign):
+        '''
+        Makes grids after each available move of neural network player.
 
-        final_move_value = 0
-        final_move_index = available_moves[0]
+        returns:
+            tuple - (available moves, grids after each of them)
+        '''
 
-        # predict game final status after each move
+        available_moves = self.__fetch_available_moves(grid, grid_size)
+
+        children = []
         for move in available_moves:
             grid_copy = [grid[i] for i in range(0, grid_size * grid_size)]
             grid_copy[move] = neural_network_sign
+            children.append(grid_copy)
+
+        return available_moves, children
+
+    def predict(self, rows):
+        return self._model.predict(rows)
+
+    def __predict_children(self, children, grid_size, predict):
+        '''
+        Predicts children grids using cache of canonical grids predictions - only grids that are not cached
+        (and are not symmetric to each other) are predicted.
+        '''
+
+        canonical_children = [tuple(canonicalize(child, grid_size)[0]) for child in children]
+        with self._cache_lock:
+            cached = {child: self._cache[child] for child in canonical_children if child in self._cache}
+            for child in cached:
+                self._cache.move_to_end(child)
+        missing = list(dict.fromkeys(child for child in canonical_children if child not in cached))
+
+        predictions = dict(cached)
+        if missing:
+            predictions.update(zip(missing, predict([list(child) for child in missing])))
+
+        with self._cache_lock:
+            for child in missing:
+                if child not in self._cache:
+                    self._cache_memory += sys.getsizeof(child) + predictions[child].nbytes
+                self._cache[child] = predictions[child]
+            while len(self._cache) > self._cache_size:
+                child, child_predictions = self._cache.popitem(last=False)
+                self._cache_memory -= sys.getsizeof(child) + child_predictions.nbytes
+            hits, misses = len(children) - len(missing), len(missing)
+            self._cache_hits += hits
+            self._cache_misses += misses
+            memory = self._cache_memory
+
+        if self._on_cache_lookup is not None:
+            self._on_cache_lookup(hits, misses, memory)
+        return [predictions[child] for child in canonical_children]
+
+    def make_move(self, grid, grid_size, neural_network_sign, predict=None):
+        '''
+        Chooses move which predicted game final status is the best one for neural network player.
+        Results of all available moves are predicted at once.
+
+        args:
+            predict - type: function    - rows prediction function (e.g. batcher shared with other requests),
+                                          model prediction is used when None
+        '''
+
+        available_moves, children = self.get_children(grid, grid_size, neural_network_sign)
 
-            # get predictions
-            predictions = self._model.predict([grid_copy])
-            predictions = predictions[0]
+        final_move_value = 0
+        final_move_index = available_moves[0]
 
-            current_move_value = max(predictions[0], predictions[neural_network_sign])
+        # predict game final status after each move (symmetric grids get the same cached prediction)
+        predict = predict if predict is not None else self.predict
+        if self._cache_size > 0:
+            predictions = self.__predict_children(children, grid_size, predict)
+        else:
+            predictions = predict(children)
+        for move, move_predictions in zip(available_moves, predictions):
+            current_move_value = max(move_predictions[0], move_predictions[neural_network_sign])
             # check if current move is better than current best one
             if current_move_value > final_move_value:
                 final_move_index = move
@@ -49,12 +193,61 @@ class NeuralNetworkSklearn():
 
         return final_move_index
 
-    def save_model(self, filename):
-        dump(self._model, filename)
 
-    def load_model(self, filename):
-        try:
-            self._model = load(filename)
-        except FileNotFoundError:
-            return False
-        return True
+class PolicyNeuralNetworkSklearn(SklearnModelMixin):
+    '''
+    Policy network - predicts distribution of the best move over grid fields for grid and moving player, so move
+    is chosen with single forward pass of single row (fields that are already taken are masked).
+    '''
+
+    def __init__(self, configuration):
+        '''
+        args:
+            configuration   - type: dict    - MLPClassifier parameters
+        '''
+
+        self._model = MLPClassifier(
+            **configuration
+        )
+        self._model_config = configuration
+
+    @staticmethod
+    def get_input_row(grid, moving_player):
+        # grid fields followed by moving player
+        return list(grid) + [moving_player]
+
+    def learn(self, input_data, output_data):
+        '''
+        args:
+            input_data  - type: list    - input rows (see 'get_input_row')
+            output_data - type: list    - the best move (index of field) of each row
+        '''
+
+        self._model.fit(input_data, output_data)
+        self._update_model_version()
+
+    def predict(self, rows):
+        '''
+        returns:
+            numpy.ndarray - probabilities of every grid field for each row (fields that never were the best move
+                            in learning data get probability 0)
+        '''
+
+        probabilities = self._model.predict_proba(rows)
+        fields_probabilities = numpy.zeros((len(probabilities), self._model.n_features_in_ - 1))
+        fields_probabilities[:, self._model.classes_] = probabilities
+        return fields_probabilities
+
+    def make_move(self, grid, grid_size, neural_network_sign, predict=None):
+        '''
+        Chooses free field with the highest predicted probability of being the best move.
+
+        args:
+            predict - type: function    - rows prediction function (e.g. batcher shared with other requests),
+                                          model prediction is used when None
+        '''
+
+        predict = predict if predict is not None else self.predict
+        probabilities = predict([self.get_input_row(grid, neural_network_sign)])[0]
+        free_fields = [i for i in range(0, grid_size * grid_size) if grid[i] == 0]
+        return max(free_fields, key=lambda field: probabilities[field])
@@ -0,0 +1,54 @@
+'''
+Policy networks learning data - grids of value networks datasets are labelled with the best move found by engine
+(every grid is labelled for each player that can move in it).
+'''
+from engine.board import GAME_IN_PROGRESS, get_game_status
+from neural_network.neural_network_cls import PolicyNeuralNetworkSklearn
+
+
+def get_moving_players(grid):
+    '''
+    Finds players that can move in grid (any player can start the game, so both of them can move when numbers
+    of their fields are equal).
+
+    returns:
+        list - moving players (1 - 'X', 2 - 'O')
+    '''
+
+    x_fields, o_fields = grid.count(1), grid.count(2)
+    if x_fields == o_fields:
+        return [1, 2]
+    if x_fields == o_fields + 1:
+        return [2]
+    if o_fields == x_fields + 1:
+        return [1]
+    return []
+
+
+def make_policy_dataset(grids, grid_size, find_move):
+    '''
+    Labels grids (duplicates and ended games are skipped) with the best move of each moving player.
+
+    args:
+        grids       - type: list        - grids (lists of fields)
+        grid_size   - type: int         - size of grids
+        find_move   - type: function    - finds the best move for grid, grid size and moving player
+
+    returns:
+        tuple - (input rows - grid fields followed by moving player, the best moves)
+    '''
+
+    input_data, output_data = [], []
+    labelled = set()
+    for grid in grids:
+        grid = [int(field) for field in grid]
+        if get_game_status(grid, grid_size) != GAME_IN_PROGRESS:
+            continue
+        for moving_player in get_moving_players(grid):
+            key = (tuple(grid), moving_player)
+            if key in labelled:
+                continue
+            labelled.add(key)
+            input_data.append(PolicyNeuralNetworkSklearn.get_input_row(grid, moving_player))
+            output_data.append(find_move(grid, grid_size, moving_player))
+    return input_data, output_data
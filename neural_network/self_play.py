@@ -0,0 +1,187 @@
+'''
+Self-play learning data - games of min-max engine (compiled min-max library) against itself. Every move is the
+min-max move of moving player, except moves randomized with epsilon probability (so games differ from each other).
+Games are played in engine processes pool and their positions, labelled with game result (draw, 'X' player win
+or 'O' player win - the same way as random games of data generators), are streamed to binary dataset in order of
+games, so the same seed gives the same dataset regardless of processes number.
+
+Usage (from repository root, min-max library has to be built with 'make -C minmax/lib'):
+    python -m neural_network.self_play OUTPUT.bin [--grid-size 4] [--games 1000] [--depth 2] [--epsilon 0.1]
+                                                  [--processes N] [--games-per-task 16] [--seed 0]
+'''
+import argparse
+import collections
+import concurrent.futures
+import os
+import random
+import sys
+import time
+
+import numpy
+
+from engine.board import get_free_fields, get_opponent, get_winner
+from minmax.minmax_lib import MINMAX_LIBRARY_PATH, MinMaxLibrary
+from neural_network.dataset import DatasetWriter
+
+
+# default depth limits of min-max moves (deeper searches are too slow for mass data generation)
+SELF_PLAY_DEPTH_LIMITS = {3: 5, 4: 2, 5: 1}
+# max. number of tasks waiting for being written (per pool process)
+PENDING_TASKS_PER_PROCESS = 4
+
+# min-max library loaded in pool process
+_minmax_library = None
+
+
+def initialize_self_play_process(library_path=None):
+    global _minmax_library
+
+    _minmax_library = MinMaxLibrary(library_path)
+
+
+def play_game(minmax_library, grid_size, depth_limit, epsilon, rng):
+    '''
+    Plays single self-play game (starting player is chosen randomly). Min-max library random numbers are seeded
+    from game random numbers, so the same game random numbers give the same game.
+
+    returns:
+        tuple - (grids of all game positions - empty grid included, winner: 0 - draw, 1 - 'X', 2 - 'O')
+    '''
+
+    grid = [0] * (grid_size * grid_size)
+    grids = [list(grid)]
+    moving_player = rng.choice([1, 2])
+    minmax_library.set_random_seed(rng.getrandbits(64))
+    while get_winner(grid, grid_size) == 0 and 0 in grid:
+        if rng.random() < epsilon:
+            move = rng.choice(get_free_fields(grid, grid_size))
+        else:
+            move = minmax_library.make_move(grid, grid_size, moving_player, depth_limit)
+        grid[move] = moving_player
+        grids.append(list(grid))
+        moving_player = get_opponent(moving_player)
+    return grids, get_winner(grid, grid_size)
+
+
+def play_games(first_game, games_number, grid_size, depth_limit, epsilon, seed):
+    '''
+    Plays range of self-play games in pool process (game random moves depend only on seed and game number).
+
+    returns:
+        tuple - (grids, labels, time of playing games in seconds)
+    '''
+
+    start = time.perf_counter()
+    grids, labels = [], []
+    for game in range(first_game, first_game + games_number):
+        game_grids, winner = play_game(
+            _minmax_library, grid_size, depth_limit, epsilon, random.Random("{seed}:{game}".format(seed=seed, game=game))
+        )
+        grids += game_grids
+        labels += [numpy.eye(3)[winner]] * len(game_grids)
+    return (
+        numpy.array(grids, dtype=numpy.uint8), numpy.array(labels, dtype=numpy.float32), time.perf_counter() - start
+    )
+
+
+def generate_self_play_dataset(path, grid_size, games_number, depth_limit, epsilon, processes_number,
+                               games_per_task=16, seed=0, library_path=None, on_progress=None):
+    '''
+    Plays self-play games in processes pool and writes their positions to binary dataset (only limited number
+    of finished tasks waits for being written, so memory usage does not depend on number of games).
+
+    args:
+        path                - type: str         - output dataset path
+        grid_size           - type: int         - size of grid
+        games_number        - type: int         - number of played games
+        depth_limit         - type: int         - tree processing depth limit of min-max moves
+        epsilon             - type: float       - probability of random move
+        processes_number    - type: int         - number of pool processes
+        games_per_task      - type: int         - number of games played by single pool task
+        seed                - type: int         - random moves seed
+        library_path        - type: str         - path to compiled min-max library (default one is used when None)
+        on_progress         - type: function    - called after each written task with numbers of written games
+                                                  and positions
+
+    returns:
+        dict - numbers of games and positions, wall time and time of playing games summed over processes
+    '''
+
+    start = time.perf_counter()
+    statistics = {'games': 0, 'positions': 0, 'play_time': 0.0}
+    max_pending_tasks = processes_number * PENDING_TASKS_PER_PROCESS
+
+    with DatasetWriter(path, grid_size) as writer, concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes_number, initializer=initialize_self_play_process, initargs=(library_path,)
+    ) as pool:
+        pending = collections.deque()
+
+        def write_next_task():
+            # tasks are written in order of games
+            task_games, future = pending.popleft()
+            grids, labels, task_time = future.result()
+            writer.write(grids, labels)
+            statistics['games'] += task_games
+            statistics['positions'] += len(grids)
+            statistics['play_time'] += task_time
+            if on_progress is not None:
+                on_progress(statistics['games'], statistics['positions'])
+
+        for first_game in range(0, games_number, games_per_task):
+            task_games = min(games_per_task, games_number - first_game)
+            pending.append((task_games, pool.submit(
+                play_games, first_game, task_games, grid_size, depth_limit, epsilon, seed
+            )))
+            if len(pending) >= max_pending_tasks:
+                write_next_task()
+        while pending:
+            write_next_task()
+
+    statistics['time'] = time.perf_counter() - start
+    return statistics
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Min-max self-play learning data generator.")
+    parser.add_argument("output", help="binary dataset file")
+    parser.add_argument("--grid-size", type=int, default=4, choices=[3, 4, 5], help="grid size of games")
+    parser.add_argument("--games", type=int, default=1000, help="number of played games")
+    parser.add_argument("--depth", type=int, default=None, help="depth limit of min-max moves (default by grid size)")
+    parser.add_argument("--epsilon", type=float, default=0.1, help="probability of random move")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="number of pool processes")
+    parser.add_argument("--games-per-task", type=int, default=16, help="number of games played by single task")
+    parser.add_argument("--seed", type=int, default=0, help="random moves seed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    if not MINMAX_LIBRARY_PATH.exists():
+        print("Min-max library is not built.")
+        return 1
+
+    depth_limit = arguments.depth if arguments.depth is not None else SELF_PLAY_DEPTH_LIMITS[arguments.grid_size]
+    last_report = [time.monotonic()]
+
+    def report_progress(games, positions):
+        # progress is printed at most once per second
+        if time.monotonic() - last_report[0] >= 1.0 or games == arguments.games:
+            last_report[0] = time.monotonic()
+            print("Played {games}/{total} games ({positions} positions)".format(
+                games=games, total=arguments.games, positions=positions
+            ))
+
+    statistics = generate_self_play_dataset(
+        arguments.output, arguments.grid_size, arguments.games, depth_limit, arguments.epsilon, arguments.processes,
+        arguments.games_per_task, arguments.seed, on_progress=report_progress
+    )
+    print("Positions per second: {total:.0f} ({per_process:.0f} per process, {processes} processes)".format(
+        total=statistics['positions'] / statistics['time'],
+        per_process=statistics['positions'] / max(statistics['play_time'], 1e-9),
+        processes=arguments.processes
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,290 @@
 # server configuration imports
 from enum import Enum
-from flask import Flask, request, make_response
+from flask import Flask, Response, request, make_response
 
 # min-max algorithm C implementation binding imports
-import ctypes
-import pathlib
+import atexit
+import concurrent.futures
+import contextlib
+import json
+import os
+import threading
+import time
 
 # neural network handling
 from neural_network.networks_config import (
     network_configuration_3x3,
     network_configuration_4x4,
-    network_configuration_5x5
+    network_configuration_5x5,
+    policy_network_configuration_3x3,
+    policy_network_configuration_4x4,
+    policy_network_configuration_5x5
 )
+from neural_network.batching import InferenceBatcher
 from neural_network.neural_network_cls import NeuralNetworkSklearn as NeuralNetwork
+from neural_network.neural_network_cls import PolicyNeuralNetworkSklearn as PolicyNeuralNetwork
 # request handling
-from validators.validators import TicTacToeRequestValidator
+from validators.validators import (
+    MINMAX_MAX_NODES_CAP,
+    AnalysisJobRequestValidator,
+    GameSessionMoveRequestValidator,
+    GameSessionRequestValidator,
+    HybridRequestValidator,
+    NeuralNetworkRequestValidator,
+    TicTacToeRequestValidator
+)
+from validators.exceptions import ValidationError
+from engine.analysis_jobs import AnalysisJobManager, AnalysisQueueFullError
+from engine.coalescing import SingleFlight, TooManyWaitersError
+from engine.hybrid import HybridBudgetExceededError, HybridSearch
+from engine.opening_book import OPENING_BOOKS
+from engine.persistent_cache import PersistentResultStore, get_store_version
+from engine.pondering import Ponderer
+from engine.result_cache import MemoryResultCache, SharedMemoryResultCache
+from engine.resolvers import (
+    EngineRegistry,
+    FunctionResolver,
+    ImmediateMoveResolver,
+    OpeningBookResolver,
+    PersistentStoreResolver,
+    Position,
+    ResolverBusyError,
+    ResolverUnavailableError,
+    ResultCacheResolver,
+    TablebaseResolver
+)
+from engine.scheduling import (
+    CHEAP_LANE,
+    EXPENSIVE_LANE,
+    Lane,
+    LaneSaturatedError,
+    LaneScheduler,
+    estimate_minmax_cost,
+    estimate_neural_network_cost
+)
+from engine.sessions import GameSessionStore, SessionLimitError
+from minmax.minmax_lib import MINMAX_LIBRARY_PATH, MinMaxLibrary
+# server instrumentation
+from metrics.metrics import (
+    ENGINE_LATENCY,
+    COALESCED_REQUESTS,
+    INFERENCE_BATCH_REQUESTS,
+    INFERENCE_BATCH_ROWS,
+    METRICS_CONTENT_TYPE,
+    PONDERED_MOVES,
+    PREDICTION_CACHE_LOOKUPS,
+    PREDICTION_CACHE_MEMORY,
+    REQUEST_LATENCY,
+    VALIDATION_LATENCY,
+    generate_metrics,
+    get_request_labels,
+    observe_bad_request
+)
+from metrics.slow_requests import SlowRequestLogger
+from metrics.timing import PhaseTimer
+
+
+# neural networks cache predictions of canonical child grids (symmetric grids share prediction), cache is reset
+# when model is loaded again (0 disables cache)
+NN_PREDICTION_CACHE_SIZE = int(os.environ.get("NN_PREDICTION_CACHE_SIZE", "65536"))
+
 
+def observe_prediction_cache(grid_size):
+    def observe_lookups(hits, misses, memory):
+        PREDICTION_CACHE_LOOKUPS.labels(grid_size=str(grid_size), result="hit").inc(hits)
+        PREDICTION_CACHE_LOOKUPS.labels(grid_size=str(grid_size), result="miss").inc(misses)
+        PREDICTION_CACHE_MEMORY.labels(grid_size=str(grid_size)).set(memory)
+    return observe_lookups
 
-neural_network_3x3 = NeuralNetwork(network_configuration_3x3)
-neural_network_4x4 = NeuralNetwork(network_configuration_4x4)
-neural_network_5x5 = NeuralNetwork(network_configuration_5x5)
 
-# load trained models from files
-neural_network_3x3.load_model("./neural_network/network_3x3")
-neural_network_4x4.load_model("./neural_network/network_4x4")
-neural_network_5x5.load_model("./neural_network/network_5x5")
+neural_network_3x3 = NeuralNetwork(network_configuration_3x3, NN_PREDICTION_CACHE_SIZE, observe_prediction_cache(3))
+neural_network_4x4 = NeuralNetwork(network_configuration_4x4, NN_PREDICTION_CACHE_SIZE, observe_prediction_cache(4))
+neural_network_5x5 = NeuralNetwork(network_configuration_5x5, NN_PREDICTION_CACHE_SIZE, observe_prediction_cache(5))
+
+# load trained models from files (information whether model was loaded is kept for each grid size)
+neural_networks = {3: neural_network_3x3, 4: neural_network_4x4, 5: neural_network_5x5}
+neural_network_models_loaded = {
+    3: neural_network_3x3.load_model("./neural_network/network_3x3"),
+    4: neural_network_4x4.load_model("./neural_network/network_4x4"),
+    5: neural_network_5x5.load_model("./neural_network/network_5x5")
+}
+
+# policy networks (neural network endpoint with 'model=policy') - move is predicted with single forward pass
+policy_networks = {
+    3: PolicyNeuralNetwork(policy_network_configuration_3x3),
+    4: PolicyNeuralNetwork(policy_network_configuration_4x4),
+    5: PolicyNeuralNetwork(policy_network_configuration_5x5)
+}
+policy_network_models_loaded = {
+    grid_size: policy_network.load_model("./neural_network/network_policy_{size}x{size}".format(size=grid_size))
+    for grid_size, policy_network in policy_networks.items()
+}
 
 
 # response status enum class
 class ResponseStatus(Enum):
     HTTP_200_OK = 200
+    HTTP_201_CREATED = 201
+    HTTP_202_ACCEPTED = 202
+    HTTP_204_NO_CONTENT = 204
     HTTP_400_BAD_REQUEST = 400
     HTTP_404_NOT_FOUND = 404
+    HTTP_499_CLIENT_CLOSED_REQUEST = 499
     HTTP_500_INTERNAL_SERVER_ERROR = 500
-
+    HTTP_503_SERVICE_UNAVAILABLE = 503
+
+
+# max. number of requests waiting for the same in-flight min-max computation
+COALESCING_MAX_WAITERS = int(os.environ.get("COALESCING_MAX_WAITERS", "32"))
+
+# game sessions configuration (sessions are kept in memory of worker process)
+SESSION_IDLE_TIMEOUT_S = float(os.environ.get("SESSION_IDLE_TIMEOUT_S", "600"))
+SESSION_MEMORY_LIMIT_BYTES = int(os.environ.get("SESSION_MEMORY_LIMIT_BYTES", str(8 * 1024 * 1024)))
+SESSION_LIMIT = int(os.environ.get("SESSION_LIMIT", "256"))
+# max. number of session games pondered at the same time by worker (0 disables pondering)
+PONDERING_MAX_THREADS = int(os.environ.get("PONDERING_MAX_THREADS", "1"))
+
+# deep analysis jobs configuration (jobs and results are stored in jobs directory)
+ANALYSIS_JOBS_DIRECTORY = os.environ.get("ANALYSIS_JOBS_DIRECTORY", "./analysis_jobs")
+ANALYSIS_JOBS_WORKERS = int(os.environ.get("ANALYSIS_JOBS_WORKERS", "1"))
+ANALYSIS_JOBS_QUEUE_LIMIT = int(os.environ.get("ANALYSIS_JOBS_QUEUE_LIMIT", "16"))
+ANALYSIS_JOB_TIME_LIMIT_S = float(os.environ.get("ANALYSIS_JOB_TIME_LIMIT_S", "300"))
+ANALYSIS_JOB_MEMORY_LIMIT_BYTES = int(os.environ.get("ANALYSIS_JOB_MEMORY_LIMIT_BYTES", str(64 * 1024 * 1024)))
+
+# scheduling lanes configuration - requests which estimated cost (number of analysed nodes) reaches threshold are
+# run by expensive lane, the rest of them by cheap lane (expensive lane queue limit should be lower than number
+# of server threads, so cheap requests always have threads to be handled by)
+LANE_COST_THRESHOLD = int(os.environ.get("LANE_COST_THRESHOLD", "1000000"))
+LANE_CHEAP_WORKERS = int(os.environ.get("LANE_CHEAP_WORKERS", "4"))
+LANE_CHEAP_QUEUE_LIMIT = int(os.environ.get("LANE_CHEAP_QUEUE_LIMIT", "64"))
+LANE_EXPENSIVE_WORKERS = int(os.environ.get("LANE_EXPENSIVE_WORKERS", "1"))
+LANE_EXPENSIVE_QUEUE_LIMIT = int(os.environ.get("LANE_EXPENSIVE_QUEUE_LIMIT", "2"))
+
+# engine resolvers configuration - min-max search which does not finish before deadline is replaced by neural
+# network move (0 disables deadline)
+MINMAX_SEARCH_DEADLINE_S = float(os.environ.get("MINMAX_SEARCH_DEADLINE_S", "30"))
+# found moves are cached in shared memory file used by all workers of node when its path is set (see
+# 'gunicorn.conf.py'), otherwise every worker keeps its own cache
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "4096"))
+SHARED_CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "")
+SHARED_CACHE_ENTRIES = int(os.environ.get("SHARED_CACHE_ENTRIES", "262144"))
+# moves found by min-max search are kept in persistent store file when its path is set (store should be placed
+# on volume, so it survives deploys) - store is loaded to results cache in background when server starts
+PERSISTENT_CACHE_PATH = os.environ.get("PERSISTENT_CACHE_PATH", "")
+
+# neural network inference batching - rows of concurrent requests are predicted together, batch waits for other
+# requests up to max. wait time or until it has max. number of rows (0 ms wait disables batching)
+NN_BATCH_MAX_WAIT_MS = float(os.environ.get("NN_BATCH_MAX_WAIT_MS", "2"))
+NN_BATCH_MAX_ROWS = int(os.environ.get("NN_BATCH_MAX_ROWS", "512"))
+
+# hybrid engine - min-max search whose cutoff leaves are scored by value network in batches of max. leaf batch size
+# (request 'max_depth' overrides default depth limit of grid size)
+HYBRID_LEAF_BATCH_SIZE = int(os.environ.get("HYBRID_LEAF_BATCH_SIZE", "4096"))
+HYBRID_TREE_PROCESSING_LIMITS = {
+    3: int(os.environ.get("HYBRID_3x3_DEPTH_LIMIT", "2")),
+    4: int(os.environ.get("HYBRID_4x4_DEPTH_LIMIT", "3")),
+    5: int(os.environ.get("HYBRID_5x5_DEPTH_LIMIT", "2"))
+}
+# hybrid search holds interpreter lock of worker, so it is limited by number of tree nodes and deadline - search
+# that exceeds its budget is replaced by neural network move (0 disables deadline)
+HYBRID_MAX_NODES = int(os.environ.get("HYBRID_MAX_NODES", "100000"))
+HYBRID_SEARCH_DEADLINE_S = float(os.environ.get("HYBRID_SEARCH_DEADLINE_S", "1"))
 
 # Tree depth limits
 MINMAX_3x3_TREE_PROCESSING_LIMIT = 10
 MINMAX_4x4_TREE_PROCESSING_LIMIT = 5
 MINMAX_5x5_TREE_PROCESSING_LIMIT = 3
+MINMAX_TREE_PROCESSING_LIMITS = {
+    3: MINMAX_3x3_TREE_PROCESSING_LIMIT,
+    4: MINMAX_4x4_TREE_PROCESSING_LIMIT,
+    5: MINMAX_5x5_TREE_PROCESSING_LIMIT
+}
 
 server = Flask(__name__)
+slow_request_logger = SlowRequestLogger()
+minmax_requests_coalescing = SingleFlight(max_waiters=COALESCING_MAX_WAITERS)
+minmax_library = None
+minmax_library_lock = threading.Lock()
+game_sessions = None
+analysis_jobs = None
+inference_batchers = {}
+inference_batchers_lock = threading.Lock()
+ponderer = Ponderer(max_threads=PONDERING_MAX_THREADS) if PONDERING_MAX_THREADS > 0 else None
+lane_scheduler = LaneScheduler(
+    Lane(CHEAP_LANE, LANE_CHEAP_WORKERS, LANE_CHEAP_QUEUE_LIMIT),
+    Lane(EXPENSIVE_LANE, LANE_EXPENSIVE_WORKERS, LANE_EXPENSIVE_QUEUE_LIMIT),
+    LANE_COST_THRESHOLD
+)
+
+
+def get_minmax_library():
+    '''
+    Returns min-max library binding shared by worker threads (library is loaded when it's used for the first time).
+    '''
+
+    global minmax_library
+    with minmax_library_lock:
+        if minmax_library is None:
+            minmax_library = MinMaxLibrary()
+        return minmax_library
+
+
+def get_game_sessions():
+    '''
+    Returns game sessions store (min-max library is loaded when the first session is created).
+    '''
+
+    global game_sessions
+    if game_sessions is None:
+        game_sessions = GameSessionStore(
+            get_minmax_library(),
+            MINMAX_TREE_PROCESSING_LIMITS,
+            idle_timeout=SESSION_IDLE_TIMEOUT_S,
+            memory_limit=SESSION_MEMORY_LIMIT_BYTES,
+            max_sessions=SESSION_LIMIT,
+            ponderer=ponderer
+        )
+    return game_sessions
+
+
+def get_analysis_jobs():
+    '''
+    Returns deep analysis jobs manager (min-max library is loaded when the first job is submitted).
+    '''
+
+    global analysis_jobs
+    if analysis_jobs is None:
+        analysis_jobs = AnalysisJobManager(
+            get_minmax_library(),
+            ANALYSIS_JOBS_DIRECTORY,
+            max_workers=ANALYSIS_JOBS_WORKERS,
+            queue_limit=ANALYSIS_JOBS_QUEUE_LIMIT,
+            time_limit=ANALYSIS_JOB_TIME_LIMIT_S,
+            memory_limit=ANALYSIS_JOB_MEMORY_LIMIT_BYTES
+        )
+    return analysis_jobs
+
+
+def foreground_search():
+    '''
+    Returns context manager that pauses pondering of session games while foreground search is running.
+    '''
+
+    return ponderer.foreground() if ponderer is not None else contextlib.nullcontext()
+
+
+def prefetch_integer_field(request, field_name):
+    '''
+    Prefetches integer form field - value that is not an integer is treated as missing one.
+    '''
+
+    try:
+        value = request.form.get(field_name, None)
+        if value is not None:
+            value = int(value)
+    except ValueError:
+        value = None
+    return value
 
 
 # common function for request handlers
@@ -54,77 +298,360 @@ def prefetch_request_data(request):
     request_data = {
         'moving_player': None,
         'grid': None,
-        'grid_size': None
+        'grid_size': None,
+        'max_depth': None,
+        'max_nodes': None
     }
 
     # prefetch 'grid_size'
-    try:
-        grid_size = request.form.get("grid_size", None)
-        if grid_size is not None:
-            grid_size = int(grid_size)
-    except ValueError:
-        grid_size = None
+    grid_size = prefetch_integer_field(request, "grid_size")
 
     # prefetch 'grid'
     grid = request.form.get("grid", None)
 
     # prefetch 'moving_player'
-    try:
-        moving_player = request.form.get("moving_player", None)
-        if moving_player is not None:
-            moving_player = int(moving_player)
-    except ValueError:
-        moving_player = None
+    moving_player = prefetch_integer_field(request, "moving_player")
 
     # assign prefetched request data
     request_data['moving_player'] = moving_player
     request_data['grid'] = grid
     request_data['grid_size'] = grid_size
 
+    # prefetch optional compute budget fields
+    request_data['max_depth'] = prefetch_integer_field(request, "max_depth")
+    request_data['max_nodes'] = prefetch_integer_field(request, "max_nodes")
+
+    # prefetch optional neural network model type
+    request_data['model'] = request.form.get("model", None)
+
     return request_data
 
 
+def get_minmax_budget(request_data):
+    '''
+    Finds min-max search budget of validated request. Default depth limit is used when request does not set
+    'max_depth' - search deeper than default one is always limited by number of analysed nodes.
+
+    returns:
+        tuple - (tree processing depth limit, max. number of analysed nodes or None when it's not limited)
+    '''
+
+    default_depth_limit = MINMAX_TREE_PROCESSING_LIMITS[request_data['grid_size']]
+    depth_limit = request_data.get('max_depth', None)
+    if depth_limit is None:
+        depth_limit = default_depth_limit
+
+    max_nodes = request_data.get('max_nodes', None)
+    if max_nodes is None and depth_limit > default_depth_limit:
+        max_nodes = MINMAX_MAX_NODES_CAP
+    return depth_limit, max_nodes
+
+
+def make_busy_response(message="Server is busy - try again later."):
+    response = make_response({'error': message}, ResponseStatus.HTTP_503_SERVICE_UNAVAILABLE.value)
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+def submit_to_lane(lane, timer, function):
+    '''
+    Submits function to scheduling lane - time spent in lane queue is measured as 'queue' phase.
+
+    returns:
+        Future - function result
+
+    throws:
+        LaneSaturatedError - when lane queue limit is reached
+    '''
+
+    queued_at = time.perf_counter()
+
+    def lane_function():
+        timer.add_phase("queue", time.perf_counter() - queued_at)
+        return function()
+
+    return lane.submit(lane_function)
+
+
+def run_in_lane(lane, timer, function):
+    '''
+    Runs function in scheduling lane and waits for its result.
+
+    throws:
+        LaneSaturatedError - when lane queue limit is reached
+    '''
+
+    return submit_to_lane(lane, timer, function).result()
+
+
+def search_minmax_position(position):
+    '''
+    Runs min-max search of position in lane chosen due to its estimated cost (identical searches that are run
+    at the same time share single computation). Search that does not finish before position deadline keeps
+    running and its move is stored by min-max resolvers chain when it finishes.
+
+    throws:
+        ResolverBusyError - when lane is saturated or too many requests wait for the same search
+        ResolverUnavailableError - when search does not finish before deadline
+    '''
+
+    timer, grid_size, moving_player = position.timer, position.grid_size, position.moving_player
+    depth_limit, max_nodes = position.depth_limit, position.max_nodes
+
+    def search():
+        with timer.phase("search"), foreground_search():
+            return get_minmax_library().make_move(position.grid, grid_size, moving_player, depth_limit, max_nodes)
+
+    def run_search():
+        future = submit_to_lane(lane, timer, search)
+        try:
+            return future.result(position.get_remaining_time())
+        except concurrent.futures.TimeoutError:
+            future.add_done_callback(lambda future: store_minmax_move(position, future))
+            raise
+
+    lane = lane_scheduler.get_lane(estimate_minmax_cost(position.grid.count(0), depth_limit, max_nodes))
+    position.details['lane'] = lane.name
+
+    # identical requests that are being processed at the same time share single computation
+    coalescing_key = ("".join(str(field) for field in position.grid), grid_size, moving_player, depth_limit, max_nodes)
+    wait_start = time.perf_counter()
+    try:
+        move, coalesced = minmax_requests_coalescing.run(coalescing_key, run_search)
+    except (TooManyWaitersError, LaneSaturatedError) as error:
+        raise ResolverBusyError(str(error))
+    except concurrent.futures.TimeoutError:
+        raise ResolverUnavailableError("Search did not finish before deadline.")
+
+    position.details['coalesced'] = coalesced
+    if coalesced:
+        # request waited for the same computation started by another one
+        timer.add_phase("coalesced", time.perf_counter() - wait_start)
+        COALESCED_REQUESTS.labels(endpoint="min-max").inc()
+    return move
+
+
+def search_hybrid_position(position):
+    '''
+    Runs hybrid search of position (min-max tree leaves are scored by value network) in lane chosen due to its
+    estimated cost. Search is stopped when it exceeds nodes budget or deadline of position.
+
+    throws:
+        ResolverBusyError - when lane is saturated
+        ResolverUnavailableError - when value network model is not loaded or search exceeds its budget
+    '''
+
+    if not neural_network_models_loaded[position.grid_size]:
+        raise ResolverUnavailableError("Neural network model is not loaded.")
+
+    hybrid_search = HybridSearch(neural_networks[position.grid_size].predict, HYBRID_LEAF_BATCH_SIZE)
+
+    def search():
+        with position.timer.phase("search"):
+            return hybrid_search.search(
+                position.grid, position.grid_size, position.moving_player, position.depth_limit, position.max_nodes,
+                position.deadline
+            )
+
+    lane = lane_scheduler.get_lane(estimate_minmax_cost(position.grid.count(0), position.depth_limit, position.max_nodes))
+    position.details['lane'] = lane.name
+    try:
+        result = run_in_lane(lane, position.timer, search)
+    except LaneSaturatedError as error:
+        raise ResolverBusyError(str(error))
+    except HybridBudgetExceededError as error:
+        raise ResolverUnavailableError(str(error))
+
+    position.details.update(nodes=result['nodes'], leaves=result['leaves'], leaf_batches=result['batches'])
+    return result['move']
+
+
+def store_minmax_move(position, future):
+    # move of search that finished after deadline is stored for the next requests of the same position
+    if not future.cancelled() and future.exception() is None:
+        engine_registry.get_chain("min-max", position.grid_size).store(position, future.result(), "search")
+
+
+def get_inference_batcher(grid_size, model="value"):
+    '''
+    Returns inference batcher of neural network (batcher thread is started when it's used for the first time).
+    '''
+
+    with inference_batchers_lock:
+        if (model, grid_size) not in inference_batchers:
+            def observe_batch(requests_number, rows_number):
+                INFERENCE_BATCH_REQUESTS.labels(grid_size=str(grid_size)).observe(requests_number)
+                INFERENCE_BATCH_ROWS.labels(grid_size=str(grid_size)).observe(rows_number)
+
+            network = policy_networks[grid_size] if model == "policy" else neural_networks[grid_size]
+            inference_batchers[(model, grid_size)] = InferenceBatcher(
+                network.predict, NN_BATCH_MAX_WAIT_MS / 1000.0, NN_BATCH_MAX_ROWS, on_batch=observe_batch
+            )
+        return inference_batchers[(model, grid_size)]
+
+
+def predict_neural_network_position(position):
+    '''
+    Predicts move of position with neural network trained for position grid size (rows are batched with rows
+    of concurrent requests when batching is enabled).
+
+    throws:
+        ResolverUnavailableError - when neural network model was not loaded
+    '''
+
+    if not neural_network_models_loaded[position.grid_size]:
+        raise ResolverUnavailableError("Neural network model is not loaded.")
+
+    predict = get_inference_batcher(position.grid_size).predict if NN_BATCH_MAX_WAIT_MS > 0 else None
+    return neural_networks[position.grid_size].make_move(
+        position.grid, position.grid_size, position.moving_player, predict=predict
+    )
+
+
+def predict_policy_network_position(position):
+    '''
+    Predicts move of position with policy network trained for position grid size.
+
+    throws:
+        ResolverUnavailableError - when policy network model was not loaded
+    '''
+
+    if not policy_network_models_loaded[position.grid_size]:
+        raise ResolverUnavailableError("Policy network model is not loaded.")
+
+    predict = get_inference_batcher(position.grid_size, "policy").predict if NN_BATCH_MAX_WAIT_MS > 0 else None
+    return policy_networks[position.grid_size].make_move(
+        position.grid, position.grid_size, position.moving_player, predict=predict
+    )
+
+
+def create_persistent_store_resolver(result_cache):
+    '''
+    Opens persistent results store (versioned by min-max library build and search settings) and starts loading its
+    results to results cache in background. Queued writes are finished when worker exits.
+
+    returns:
+        PersistentStoreResolver - store resolver
+    '''
+
+    store_version = get_store_version([MINMAX_LIBRARY_PATH], (MINMAX_TREE_PROCESSING_LIMITS, MINMAX_MAX_NODES_CAP))
+    store = PersistentResultStore(PERSISTENT_CACHE_PATH, store_version)
+    atexit.register(store.close)
+
+    store_resolver = PersistentStoreResolver(store)
+    threading.Thread(
+        target=store_resolver.warm_up, args=(ResultCacheResolver(result_cache, "min-max"),), daemon=True
+    ).start()
+    return store_resolver
+
+
+def create_engine_registry():
+    '''
+    Creates resolvers chains of engines - min-max engine answers with cheap resolvers first, runs search only when
+    none of them found move and falls back to neural network when search cannot answer before deadline.
+
+    returns:
+        EngineRegistry - engines registry
+    '''
+
+    if SHARED_CACHE_PATH:
+        result_cache = SharedMemoryResultCache(SHARED_CACHE_PATH, SHARED_CACHE_ENTRIES)
+    else:
+        result_cache = MemoryResultCache(RESULT_CACHE_SIZE)
+
+    store_resolver = create_persistent_store_resolver(result_cache) if PERSISTENT_CACHE_PATH else None
+
+    registry = EngineRegistry()
+    for grid_size in [3, 4, 5]:
+        resolvers = [ImmediateMoveResolver(), ResultCacheResolver(result_cache, "min-max")]
+        if store_resolver is not None:
+            resolvers.append(store_resolver)
+        if grid_size == 3:
+            resolvers.append(TablebaseResolver(grid_size))
+        if grid_size in OPENING_BOOKS:
+            resolvers.append(OpeningBookResolver(OPENING_BOOKS[grid_size][0]))
+        resolvers.append(FunctionResolver("search", search_minmax_position, storable=True))
+        resolvers.append(FunctionResolver("neural-network", predict_neural_network_position))
+        registry.register("min-max", grid_size, resolvers)
+
+        registry.register("neural-network", grid_size, [
+            ResultCacheResolver(result_cache, "neural-network"),
+            FunctionResolver("neural-network", predict_neural_network_position, storable=True)
+        ])
+        registry.register("hybrid", grid_size, [
+            ImmediateMoveResolver(),
+            ResultCacheResolver(result_cache, "hybrid"),
+            FunctionResolver("hybrid-search", search_hybrid_position, storable=True),
+            FunctionResolver("neural-network", predict_neural_network_position)
+        ])
+        registry.register("neural-network-policy", grid_size, [
+            ResultCacheResolver(result_cache, "neural-network-policy"),
+            FunctionResolver("policy-network", predict_policy_network_position, storable=True)
+        ])
+    return registry
+
+
+engine_registry = create_engine_registry()
+
+
+def finish_request(endpoint, timer, labels, request_data, response, **details):
+    '''
+    Adds phases timing to response, observes request latency and logs request if it was slow.
+    '''
+
+    response.headers["Server-Timing"] = timer.get_server_timing_header()
+    REQUEST_LATENCY.labels(**labels).observe(timer.get_total_time())
+    slow_request_logger.log_request(endpoint, request_data, timer, status=response.status_code, **details)
+    return response
+
+
 @server.route("/tic-tac-toe/min-max", methods=["POST"])
 def tic_tac_toe_min_max_request_handler():
     '''
     Handles request that is sent for '/tic-tac-toe/min-max' url.
     '''
 
+    timer = PhaseTimer()
+
     # get request data from incoming request
-    request_data = prefetch_request_data(request)
-    validator = TicTacToeRequestValidator(request_data)
+    with timer.phase("prefetch"):
+        request_data = prefetch_request_data(request)
 
     # check if received request data are correct
-    validator_valid = validator.is_valid()
-    if not validator_valid:
-        return make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+    with timer.phase("validation"):
+        validator = TicTacToeRequestValidator(request_data)
+        validator_valid = validator.is_valid()
 
-    # assign min-max algorithm to calculate next move
-    minmax_libname = str(pathlib.Path().absolute()) + "/minmax/lib/minmax.so"
-    minmax_lib = ctypes.CDLL(minmax_libname)
-
-    # prepare grid state array for loaded C library
-    grid_state = request_data['grid']
-    grid = [0 for i in range(len(grid_state))]
-    for i in range(0, len(grid_state)):
-        grid[i] = int(grid_state[i])
-
-    GridStateCls = ctypes.c_int * len(grid)
-    grid = GridStateCls(*grid)
+    labels = get_request_labels("min-max", request_data)
+    VALIDATION_LATENCY.labels(**labels).observe(timer.get_phase_time("validation"))
+    if not validator_valid:
+        observe_bad_request("min-max", validator.errors)
+        response = make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+        return finish_request("min-max", timer, labels, request_data, response)
 
     grid_size = request_data['grid_size']
-    if grid_size == 3:
-        minmax_move = minmax_lib.make_minmax_move(grid, request_data['grid_size'],
-                                                  request_data['moving_player'], MINMAX_3x3_TREE_PROCESSING_LIMIT)
-    elif grid_size == 4:
-        minmax_move = minmax_lib.make_minmax_move(grid, request_data['grid_size'],
-                                                  request_data['moving_player'], MINMAX_4x4_TREE_PROCESSING_LIMIT)
-    elif grid_size == 5:
-        minmax_move = minmax_lib.make_minmax_move(grid, request_data['grid_size'],
-                                                  request_data['moving_player'], MINMAX_5x5_TREE_PROCESSING_LIMIT)
+    depth_limit, max_nodes = get_minmax_budget(request_data)
+    deadline = time.monotonic() + MINMAX_SEARCH_DEADLINE_S if MINMAX_SEARCH_DEADLINE_S > 0 else None
+    position = Position(
+        [int(field) for field in request_data['grid']], grid_size, request_data['moving_player'], depth_limit, max_nodes,
+        deadline, timer
+    )
+
+    # position is resolved by the first resolver of grid size chain that finds its move
+    try:
+        minmax_move, resolver = engine_registry.get_chain("min-max", grid_size).resolve(position)
+    except ResolverUnavailableError:
+        response = make_busy_response()
+        return finish_request("min-max", timer, labels, request_data, response, **position.details)
+
+    if resolver == "search" and not position.details['coalesced']:
+        ENGINE_LATENCY.labels(**labels).observe(timer.get_phase_time("search"))
 
     response = make_response({'move': minmax_move}, ResponseStatus.HTTP_200_OK.value)
-    return response
+    return finish_request(
+        "min-max", timer, labels, request_data, response, depth=depth_limit, max_nodes=max_nodes, move=minmax_move,
+        resolver=resolver, **position.details
+    )
 
 
 @server.route("/tic-tac-toe/neural-network", methods=["POST"])
@@ -133,14 +660,23 @@ def tic_tac_toe_neural_network_request_handler():
     Handles request that is sent for '/tic-tac-toe/neural-network' url.
     '''
 
+    timer = PhaseTimer()
+
     # get request data from incoming request
-    request_data = prefetch_request_data(request)
-    validator = TicTacToeRequestValidator(request_data)
+    with timer.phase("prefetch"):
+        request_data = prefetch_request_data(request)
 
     # check if received request data are correct
-    validator_valid = validator.is_valid()
+    with timer.phase("validation"):
+        validator = NeuralNetworkRequestValidator(request_data)
+        validator_valid = validator.is_valid()
+
+    labels = get_request_labels("neural-network", request_data)
+    VALIDATION_LATENCY.labels(**labels).observe(timer.get_phase_time("validation"))
     if not validator_valid:
-        return make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+        observe_bad_request("neural-network", validator.errors)
+        response = make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+        return finish_request("neural-network", timer, labels, request_data, response)
 
     # prepare grid state array for loaded neural network
     grid_state = request_data['grid']
@@ -148,16 +684,234 @@ def tic_tac_toe_neural_network_request_handler():
     for i in range(0, len(grid_state)):
         grid.append(int(grid_state[i]))
 
-    grid_size = request_data['grid_size']
+    position = Position(grid, request_data['grid_size'], request_data['moving_player'], timer=timer)
+    # value network predicts every child grid, policy network predicts single row
+    model = request_data['model'] or "value"
+    engine = "neural-network-policy" if model == "policy" else "neural-network"
+
+    def inference():
+        with timer.phase("inference"):
+            return engine_registry.get_chain(engine, position.grid_size).resolve(position)[0]
 
-    if grid_size == 3:
-        nn_move = neural_network_3x3.make_move(grid, grid_size, request_data['moving_player'])
-    elif grid_size == 4:
-        nn_move = neural_network_4x4.make_move(grid, grid_size, request_data['moving_player'])
-    elif grid_size == 5:
-        nn_move = neural_network_5x5.make_move(grid, grid_size, request_data['moving_player'])
+    lane = lane_scheduler.get_lane(estimate_neural_network_cost(1 if model == "policy" else grid.count(0)))
+    try:
+        nn_move = run_in_lane(lane, timer, inference)
+    except LaneSaturatedError:
+        response = make_busy_response()
+        return finish_request("neural-network", timer, labels, request_data, response, lane=lane.name, model=model)
+    except ResolverUnavailableError:
+        response = make_busy_response("Neural network model is not available.")
+        return finish_request("neural-network", timer, labels, request_data, response, lane=lane.name, model=model)
+    ENGINE_LATENCY.labels(**labels).observe(timer.get_phase_time("inference"))
 
     response = make_response({'move': nn_move}, ResponseStatus.HTTP_200_OK.value)
+    return finish_request(
+        "neural-network", timer, labels, request_data, response, move=nn_move, lane=lane.name, model=model
+    )
+
+
+@server.route("/tic-tac-toe/hybrid", methods=["POST"])
+def tic_tac_toe_hybrid_request_handler():
+    '''
+    Handles request that is sent for '/tic-tac-toe/hybrid' url - min-max search with neural network leaves scores.
+    '''
+
+    timer = PhaseTimer()
+
+    # get request data from incoming request
+    with timer.phase("prefetch"):
+        request_data = prefetch_request_data(request)
+
+    # check if received request data are correct
+    with timer.phase("validation"):
+        validator = HybridRequestValidator(request_data)
+        validator_valid = validator.is_valid()
+
+    labels = get_request_labels("hybrid", request_data)
+    VALIDATION_LATENCY.labels(**labels).observe(timer.get_phase_time("validation"))
+    if not validator_valid:
+        observe_bad_request("hybrid", validator.errors)
+        response = make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+        return finish_request("hybrid", timer, labels, request_data, response)
+
+    grid_size = request_data['grid_size']
+    depth_limit = request_data['max_depth']
+    if depth_limit is None:
+        depth_limit = HYBRID_TREE_PROCESSING_LIMITS[grid_size]
+    deadline = time.monotonic() + HYBRID_SEARCH_DEADLINE_S if HYBRID_SEARCH_DEADLINE_S > 0 else None
+    position = Position(
+        [int(field) for field in request_data['grid']], grid_size, request_data['moving_player'], depth_limit,
+        HYBRID_MAX_NODES, deadline, timer
+    )
+
+    try:
+        hybrid_move, resolver = engine_registry.get_chain("hybrid", grid_size).resolve(position)
+    except ResolverUnavailableError as error:
+        response = make_busy_response(str(error))
+        return finish_request("hybrid", timer, labels, request_data, response, depth=depth_limit, **position.details)
+
+    if resolver == "hybrid-search":
+        ENGINE_LATENCY.labels(**labels).observe(timer.get_phase_time("search"))
+
+    response = make_response({'move': hybrid_move}, ResponseStatus.HTTP_200_OK.value)
+    return finish_request(
+        "hybrid", timer, labels, request_data, response, depth=depth_limit, move=hybrid_move, resolver=resolver,
+        **position.details
+    )
+
+
+@server.route("/tic-tac-toe/sessions", methods=["POST"])
+def tic_tac_toe_session_create_request_handler():
+    '''
+    Handles request that is sent for '/tic-tac-toe/sessions' url - creates game against min-max engine.
+    If engine starts the game, response contains its first move.
+    '''
+
+    request_data = {
+        'grid_size': prefetch_integer_field(request, "grid_size"),
+        'engine_player': prefetch_integer_field(request, "engine_player"),
+        'first_player': prefetch_integer_field(request, "first_player"),
+        'pondering': prefetch_integer_field(request, "pondering"),
+    }
+
+    validator = GameSessionRequestValidator(request_data)
+    if not validator.is_valid():
+        observe_bad_request("sessions", validator.errors)
+        return make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+
+    # 'X' player starts the game by default
+    first_player = request_data['first_player'] if request_data['first_player'] is not None else 1
+    try:
+        session, engine_move = get_game_sessions().create_session(
+            request_data['grid_size'], request_data['engine_player'], first_player,
+            pondering=request_data['pondering'] == 1
+        )
+    except SessionLimitError as error:
+        return make_busy_response(str(error))
+
+    response_data = session.to_dict()
+    response_data['move'] = engine_move
+    return make_response(response_data, ResponseStatus.HTTP_201_CREATED.value)
+
+
+@server.route("/tic-tac-toe/sessions/<session_id>/moves", methods=["POST"])
+def tic_tac_toe_session_move_request_handler(session_id):
+    '''
+    Handles request that is sent for '/tic-tac-toe/sessions/<session_id>/moves' url - applies opponent move
+    and responds with engine reply.
+    '''
+
+    timer = PhaseTimer()
+
+    session = get_game_sessions().get_session(session_id)
+    if session is None:
+        return make_response({'error': "Game session not found."}, ResponseStatus.HTTP_404_NOT_FOUND.value)
+
+    request_data = {'move': prefetch_integer_field(request, "move")}
+    validator = GameSessionMoveRequestValidator(request_data)
+    if not validator.is_valid():
+        observe_bad_request("sessions", validator.errors)
+        return make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+
+    try:
+        with timer.phase("search"):
+            engine_move = get_game_sessions().play_opponent_move(session, request_data['move'])
+    except ValidationError as error:
+        observe_bad_request("sessions", {error._field: error._message})
+        return make_response({error._field: error._message}, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+
+    if session.last_move_pondered:
+        PONDERED_MOVES.inc()
+
+    response_data = session.to_dict()
+    response_data['move'] = engine_move
+    response = make_response(response_data, ResponseStatus.HTTP_200_OK.value)
+    response.headers["Server-Timing"] = timer.get_server_timing_header()
+    return response
+
+
+@server.route("/tic-tac-toe/sessions/<session_id>", methods=["DELETE"])
+def tic_tac_toe_session_delete_request_handler(session_id):
+    '''
+    Handles request that is sent for '/tic-tac-toe/sessions/<session_id>' url - ends game session.
+    '''
+
+    if not get_game_sessions().remove_session(session_id):
+        return make_response({'error': "Game session not found."}, ResponseStatus.HTTP_404_NOT_FOUND.value)
+    return make_response("", ResponseStatus.HTTP_204_NO_CONTENT.value)
+
+
+@server.route("/tic-tac-toe/analysis-jobs", methods=["POST"])
+def tic_tac_toe_analysis_job_create_request_handler():
+    '''
+    Handles request that is sent for '/tic-tac-toe/analysis-jobs' url - submits deep min-max analysis of position
+    (identical submissions get the same job). Analysis depth is limited by 'depth' field, time limit of analysis
+    and number of free fields.
+    '''
+
+    request_data = prefetch_request_data(request)
+    request_data['depth'] = prefetch_integer_field(request, "depth")
+
+    validator = AnalysisJobRequestValidator(request_data)
+    if not validator.is_valid():
+        observe_bad_request("analysis-jobs", validator.errors)
+        return make_response(validator.errors, ResponseStatus.HTTP_400_BAD_REQUEST.value)
+
+    grid = [int(field) for field in request_data['grid']]
+    # without depth limit, position is analysed as deep as time limit allows
+    max_depth = request_data['depth'] if request_data['depth'] is not None else len(grid)
+    try:
+        job, created = get_analysis_jobs().submit(grid, request_data['grid_size'], request_data['moving_player'], max_depth)
+    except AnalysisQueueFullError as error:
+        return make_busy_response(str(error))
+
+    response = make_response(job.to_dict(), ResponseStatus.HTTP_202_ACCEPTED.value)
+    response.headers["Location"] = "/tic-tac-toe/analysis-jobs/{job_id}".format(job_id=job.job_id)
+    return response
+
+
+@server.route("/tic-tac-toe/analysis-jobs/<job_id>", methods=["GET"])
+def tic_tac_toe_analysis_job_request_handler(job_id):
+    '''
+    Handles request that is sent for '/tic-tac-toe/analysis-jobs/<job_id>' url - returns job progress
+    (reached depth, current best move, analysed nodes) or its final result.
+    '''
+
+    job = get_analysis_jobs().get_job(job_id)
+    if job is None:
+        return make_response({'error': "Analysis job not found."}, ResponseStatus.HTTP_404_NOT_FOUND.value)
+    return make_response(job.to_dict(), ResponseStatus.HTTP_200_OK.value)
+
+
+@server.route("/tic-tac-toe/analysis-jobs/<job_id>/events", methods=["GET"])
+def tic_tac_toe_analysis_job_events_request_handler(job_id):
+    '''
+    Handles request that is sent for '/tic-tac-toe/analysis-jobs/<job_id>/events' url - streams job progress
+    updates as server-sent events until job is finished.
+    '''
+
+    if get_analysis_jobs().get_job(job_id) is None:
+        return make_response({'error': "Analysis job not found."}, ResponseStatus.HTTP_404_NOT_FOUND.value)
+
+    def generate_events():
+        for job_state in get_analysis_jobs().iterate_updates(job_id):
+            if job_state is None:
+                # comment line keeps idle connection open
+                yield ": keep-alive\n\n"
+            else:
+                yield "event: progress\ndata: {data}\n\n".format(data=json.dumps(job_state))
+
+    return Response(generate_events(), mimetype="text/event-stream", headers={'Cache-Control': "no-cache"})
+
+
+@server.route("/metrics", methods=["GET"])
+def metrics_request_handler():
+    '''
+    Handles request that is sent for '/metrics' url (Prometheus text format).
+    '''
+
+    response = make_response(generate_metrics(), ResponseStatus.HTTP_200_OK.value)
+    response.headers["Content-Type"] = METRICS_CONTENT_TYPE
     return response
 
 
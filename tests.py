@@ -1,9 +1,74 @@
 from unittest import TestCase
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
 import unittest
 
+import numpy
+
 from validators.validators import IntegerFieldValidator, StringFieldValidator
 from validators.exceptions import ValidatorFieldError
-from validators.validators import TicTacToeRequestValidator
+from validators.validators import MINMAX_MAX_NODES_CAP, TicTacToeRequestValidator
+from validators.validators import GameSessionMoveRequestValidator, GameSessionRequestValidator
+from validators.validators import NeuralNetworkRequestValidator
+from validators.exceptions import ValidationError
+from neural_network.batching import InferenceBatcher
+from neural_network.dataset import (
+    DatasetFormatError,
+    DatasetWriter,
+    convert_text_dataset,
+    get_chunk_paths,
+    iterate_dataset,
+    load_chunked_dataset,
+    load_dataset,
+    parse_text_line,
+    read_header
+)
+from neural_network.networks_config import network_configuration_3x3, network_configuration_4x4
+from neural_network.neural_network_cls import NeuralNetworkSklearn, PolicyNeuralNetworkSklearn
+from neural_network.policy_dataset import get_moving_players, make_policy_dataset
+from neural_network.self_play import generate_self_play_dataset, play_game
+from engine.coalescing import SingleFlight, TooManyWaitersError
+from engine.hybrid import HybridBudgetExceededError, HybridSearch
+from starlette.testclient import TestClient
+import asgi
+import server
+from asgi import NO_MOVE, application, parse_move_message, parse_start_message
+from engine.board import get_free_fields, get_opponent, get_winner
+from engine.pondering import Ponderer, get_predicted_replies
+from engine.analysis_jobs import JOB_DONE, AnalysisJobManager
+from engine.persistent_cache import PersistentResultStore, decode_position_key, encode_position_key, get_store_version
+from engine.opening_book import get_opening_positions, save_opening_book
+from engine.resolvers import (
+    EngineRegistry,
+    FunctionResolver,
+    ImmediateMoveResolver,
+    OpeningBookResolver,
+    PersistentStoreResolver,
+    Position,
+    ResolverChain,
+    ResolverUnavailableError,
+    ResultCacheResolver,
+    TablebaseResolver
+)
+from engine.result_cache import MemoryResultCache, SharedMemoryResultCache
+from engine.tablebase import find_table_move, get_table_key, solve_game, solve_position
+from engine.symmetry import canonicalize, get_canonical_key, get_symmetries, map_canonical_move
+from engine.scheduling import Lane, LaneSaturatedError, LaneScheduler, estimate_minmax_cost
+from engine.sessions import GameSessionStore, SessionLimitError
+from minmax.minmax_lib import MINMAX_LIBRARY_PATH, MinMaxLibrary
+from benchmarks.engine_benchmark import count_reference_nodes
+from benchmarks.http_benchmark import CONNECTION_ERROR_STATUS, TIMEOUT_STATUS, HttpSender, build_positions_mix, percentile
+from benchmarks.replay_slow_requests import read_slow_requests
+from metrics.metrics import get_request_labels
+from metrics.slow_requests import SlowRequestLogger, get_process_log_path
+from metrics.timing import PhaseTimer
 
 # VALIDATOR FIELDS TESTS
 
@@ -1036,6 +1101,1692 @@ class TicTacToeValidatorTest(TestCase):
 
         self.assertTrue(not valid_3x3 and not valid_4x4 and not valid_5x5)
 
+    def test_validators_do_not_share_fields_values(self):
+        '''
+        Tests that validator instances keep their own fields values (requests can be validated concurrently).
+        '''
+
+        valid_validator = TicTacToeRequestValidator({'grid_size': 3, 'moving_player': 1, 'grid': "000000000"})
+        TicTacToeRequestValidator({'grid_size': 9, 'moving_player': 7, 'grid': None})
+
+        self.assertTrue(valid_validator.is_valid())
+
+
+# ENGINE TESTS
+
+
+class SingleFlightTest(TestCase):
+    '''
+    Identical in-flight computations coalescing tests class.
+    '''
+
+    def __run_concurrently(self, single_flight, key, function, requests_number):
+        results, errors = [], []
+
+        def request():
+            try:
+                results.append(single_flight.run(key, function))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=request) for i in range(requests_number)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def __wait_for_waiters(self, single_flight, key, waiters_number):
+        while key not in single_flight._calls or single_flight._calls[key].waiters < waiters_number:
+            time.sleep(0.001)
+
+    def test_concurrent_requests_share_computation(self):
+        '''
+        Tests that concurrent requests with the same key wait for single computation and get its result.
+        '''
+
+        single_flight = SingleFlight(max_waiters=10)
+        release, calls = threading.Event(), []
+
+        def computation():
+            calls.append(1)
+            release.wait(5)
+            return 4
+
+        threads, results, errors = self.__run_concurrently(single_flight, "key", computation, 5)
+        self.__wait_for_waiters(single_flight, "key", 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([], errors)
+        self.assertEqual([4] * 5, [result[0] for result in results])
+        self.assertEqual(4, len([result for result in results if result[1]]))
+        self.assertEqual(0, single_flight.get_in_flight_number())
+
+    def test_error_is_propagated_to_waiters(self):
+        '''
+        Tests that exception raised by computation is raised for every waiting request.
+        '''
+
+        single_flight = SingleFlight(max_waiters=10)
+        release, calls = threading.Event(), []
+
+        def computation():
+            calls.append(1)
+            release.wait(5)
+            raise ValueError("search failed")
+
+        threads, results, errors = self.__run_concurrently(single_flight, "key", computation, 3)
+        # leader fails only after both requests wait for its computation
+        self.__wait_for_waiters(single_flight, "key", 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([], results)
+        self.assertEqual(3, len([error for error in errors if isinstance(error, ValueError)]))
+
+    def test_waiters_number_is_bounded(self):
+        '''
+        Tests that requests above waiters limit are rejected instead of waiting.
+        '''
+
+        single_flight = SingleFlight(max_waiters=1)
+        started, release = threading.Event(), threading.Event()
+
+        def computation():
+            started.set()
+            release.wait(5)
+            return 1
+
+        threads, results, errors = self.__run_concurrently(single_flight, "key", computation, 1)
+        started.wait(5)
+        waiter_threads, waiter_results, waiter_errors = self.__run_concurrently(single_flight, "key", computation, 1)
+        self.__wait_for_waiters(single_flight, "key", 1)
+
+        with self.assertRaises(TooManyWaitersError):
+            single_flight.run("key", computation)
+
+        release.set()
+        for thread in threads + waiter_threads:
+            thread.join()
+        self.assertEqual([(1, False)], results)
+        self.assertEqual([(1, True)], waiter_results)
+
+
+# METRICS TESTS
+
+
+class RequestMetricsLabelsTest(TestCase):
+    '''
+    Request metrics labels tests class.
+    '''
+
+    def test_labels_for_valid_request_data(self):
+        '''
+        Tests that grid size and moving player are used as labels when they are acceptable.
+        '''
+
+        labels = get_request_labels("min-max", {'grid_size': 4, 'moving_player': 2, 'grid': "0" * 16})
+        self.assertEqual({'endpoint': "min-max", 'grid_size': "4", 'moving_player': "2"}, labels)
+
+    def test_labels_for_invalid_request_data(self):
+        '''
+        Tests that unexpected values are labeled 'invalid' (labels cardinality has to stay bounded).
+        '''
+
+        labels = get_request_labels("neural-network", {'grid_size': 1000, 'moving_player': None, 'grid': None})
+        self.assertEqual({'endpoint': "neural-network", 'grid_size': "invalid", 'moving_player': "invalid"}, labels)
+
+
+class PhaseTimerTest(TestCase):
+    '''
+    Request phases timer and slow requests logger tests class.
+    '''
+
+    def test_server_timing_header(self):
+        '''
+        Tests that phases are reported in measurement order (repeated phases are summed) with total time at the end.
+        '''
+
+        timer = PhaseTimer()
+        timer.add_phase("prefetch", 0.001)
+        timer.add_phase("search", 0.5)
+        timer.add_phase("prefetch", 0.002)
+
+        self.assertEqual(["prefetch", "search"], list(timer.get_phases().keys()))
+        self.assertAlmostEqual(0.003, timer.get_phase_time("prefetch"))
+
+        header_metrics = timer.get_server_timing_header().split(", ")
+        self.assertEqual("prefetch;dur=3.000", header_metrics[0])
+        self.assertEqual("search;dur=500.000", header_metrics[1])
+        self.assertTrue(header_metrics[2].startswith("total;dur="))
+
+    def test_only_slow_requests_are_logged(self):
+        '''
+        Tests that request is logged (with phases and replay details) only when it exceeds threshold.
+        '''
+
+        request_data = {'grid': "000000000", 'grid_size': 3, 'moving_player': 1}
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "slow.log")
+
+            self.assertFalse(SlowRequestLogger(threshold_ms=60000, log_path=log_path).log_request(
+                "min-max", request_data, PhaseTimer()
+            ))
+            self.assertEqual([], os.listdir(directory))
+
+            timer = PhaseTimer()
+            timer.add_phase("search", 0.25)
+            self.assertTrue(SlowRequestLogger(threshold_ms=0, log_path=log_path).log_request(
+                "min-max", request_data, timer, depth=10
+            ))
+
+            with open(get_process_log_path(log_path, os.getpid()), "r") as log_file:
+                entry = json.loads(log_file.readline())
+            self.assertEqual("000000000", entry["grid"])
+            self.assertEqual(10, entry["depth"])
+            self.assertEqual(250.0, entry["phases_ms"]["search"])
+
+    def test_processes_write_own_log_files(self):
+        '''
+        Tests that every process writes its own slow requests log file and replay tool reads all of them.
+        '''
+
+        request_data = {'grid': "000000000", 'grid_size': 3, 'moving_player': 1}
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = os.path.join(directory, "slow.log")
+            logger = SlowRequestLogger(threshold_ms=0, log_path=log_path)
+            logger.log_request("min-max", request_data, PhaseTimer())
+
+            # forked process (e.g. gunicorn worker) opens its own log file
+            process = multiprocessing.get_context("fork").Process(
+                target=logger.log_request, args=("hybrid", request_data, PhaseTimer())
+            )
+            process.start()
+            process.join()
+            logger.log_request("neural-network", request_data, PhaseTimer())
+
+            self.assertEqual(
+                sorted([os.path.basename(get_process_log_path(log_path, pid)) for pid in [os.getpid(), process.pid]]),
+                sorted(os.listdir(directory))
+            )
+            entries = read_slow_requests(log_path)
+            self.assertEqual(["min-max", "hybrid", "neural-network"], [entry["endpoint"] for entry in entries])
+            self.assertEqual({os.getpid(), process.pid}, {entry["pid"] for entry in entries})
+
+
+# BENCHMARKS TESTS
+
+
+class EngineBenchmarkReferenceTest(TestCase):
+    '''
+    Min-Max benchmark reference implementation tests class.
+    '''
+
+    def test_winner_detection(self):
+        '''
+        Tests reference winner detection for rows, columns and both diagonals.
+        '''
+
+        self.assertEqual(1, get_winner([1, 1, 1, 2, 2, 0, 0, 0, 0], 3))
+        self.assertEqual(2, get_winner([2, 1, 1, 2, 1, 0, 2, 0, 0], 3))
+        self.assertEqual(1, get_winner([1, 2, 0, 2, 1, 0, 0, 0, 1], 3))
+        self.assertEqual(2, get_winner([1, 1, 2, 1, 2, 0, 2, 0, 0], 3))
+        self.assertEqual(0, get_winner([1, 2, 1, 1, 2, 2, 2, 1, 1], 3))
+
+    def test_reference_nodes_number(self):
+        '''
+        Tests reference tree nodes counting - leaves below depth limit are counted, finished games are not expanded.
+        '''
+
+        # empty grid with depth limit 0 => root and its 9 children
+        self.assertEqual(10, count_reference_nodes([0] * 9, 3, 1, 0))
+        # empty grid with depth limit 1 => 1 + 9 + 9 * 8 nodes
+        self.assertEqual(82, count_reference_nodes([0] * 9, 3, 1, 1))
+        # winning 'X' player move is not expanded, the other one leads to the last 'O' player move => 1 + 1 + 2 nodes
+        self.assertEqual(4, count_reference_nodes([1, 1, 0, 2, 2, 1, 1, 2, 0], 3, 1, 10))
+
+
+class HttpBenchmarkTest(TestCase):
+    '''
+    HTTP benchmark helpers tests class.
+    '''
+
+    def test_percentile_nearest_rank(self):
+        '''
+        Tests percentiles calculation (nearest-rank method).
+        '''
+
+        values = [i for i in range(1, 101)]
+        self.assertEqual(50, percentile(values, 50))
+        self.assertEqual(95, percentile(values, 95))
+        self.assertEqual(99, percentile(values, 99))
+        self.assertEqual(7, percentile([7], 99))
+
+    def test_positions_mix_is_reproducible_and_valid(self):
+        '''
+        Tests that positions mix depends only on seed and contains only positions accepted by request validator.
+        '''
+
+        requests = build_positions_mix([3, 4, 5], ["min-max", "neural-network"], 60, None, 7)
+        self.assertEqual(requests, build_positions_mix([3, 4, 5], ["min-max", "neural-network"], 60, None, 7))
+
+        for request in requests:
+            request_data = dict(request["data"])
+            self.assertTrue(TicTacToeRequestValidator(request_data).is_valid())
+            self.assertEqual(request["move_number"], len(request_data["grid"]) - request_data["grid"].count("0"))
+
+    def test_http_sender_connection_errors(self):
+        '''
+        Tests that refused and timed out requests are reported as error statuses instead of stopping benchmark.
+        '''
+
+        with socket.socket() as listening_socket:
+            listening_socket.bind(("127.0.0.1", 0))
+            port = listening_socket.getsockname()[1]
+            # server that accepts connections but never responds
+            listening_socket.listen(8)
+            url = "http://127.0.0.1:{port}".format(port=port)
+            self.assertEqual(TIMEOUT_STATUS, HttpSender(url, 0.1).send("/tic-tac-toe/min-max", {'grid': "0" * 9}))
+
+        # nothing listens on port anymore
+        self.assertEqual(CONNECTION_ERROR_STATUS, HttpSender(url, 0.1).send("/tic-tac-toe/min-max", {'grid': "0" * 9}))
+
+
+class FirstFreeFieldContext():
+    '''
+    Search context replacement that always chooses the first free field.
+    '''
+
+    closed = False
+
+    def make_move(self, grid, moving_player, processing_depth_limit):
+        return grid.index(0)
+
+    def close(self):
+        self.closed = True
+
+
+class FirstFreeFieldLibrary():
+    def create_context(self, grid_size, memory_limit):
+        return FirstFreeFieldContext()
+
+
+class GameSessionTest(TestCase):
+    '''
+    Game sessions store and session requests validators tests class.
+    '''
+
+    def test_session_requests_validators(self):
+        '''
+        Tests session creation and move requests validation.
+        '''
+
+        self.assertTrue(GameSessionRequestValidator({'grid_size': 4, 'engine_player': 2, 'first_player': None}).is_valid())
+        self.assertTrue(GameSessionRequestValidator({'grid_size': 3, 'engine_player': 1, 'first_player': 2}).is_valid())
+        self.assertFalse(GameSessionRequestValidator({'grid_size': 6, 'engine_player': 1, 'first_player': None}).is_valid())
+        self.assertFalse(GameSessionRequestValidator({'grid_size': 3, 'engine_player': None, 'first_player': 1}).is_valid())
+        self.assertFalse(GameSessionRequestValidator({'grid_size': 3, 'engine_player': 1, 'first_player': 3}).is_valid())
+
+        self.assertTrue(GameSessionMoveRequestValidator({'move': 0}).is_valid())
+        self.assertFalse(GameSessionMoveRequestValidator({'move': 25}).is_valid())
+        self.assertFalse(GameSessionMoveRequestValidator({'move': None}).is_valid())
+
+    def test_session_game_flow(self):
+        '''
+        Tests that engine replies to opponent moves and invalid moves are rejected.
+        '''
+
+        store = GameSessionStore(FirstFreeFieldLibrary(), {3: 10})
+        session, engine_move = store.create_session(3, 1, 1)
+        self.assertEqual(0, engine_move)
+        self.assertEqual("100000000", session.get_grid_state())
+
+        # occupied field and field outside of grid
+        self.assertRaises(ValidationError, store.play_opponent_move, session, 0)
+        self.assertRaises(ValidationError, store.play_opponent_move, session, 9)
+
+        self.assertEqual(1, store.play_opponent_move(session, 4))
+        self.assertEqual(2, store.play_opponent_move(session, 8))
+        self.assertEqual("x_won", session.to_dict()["game_status"])
+        self.assertRaises(ValidationError, store.play_opponent_move, session, 5)
+
+        self.assertTrue(store.remove_session(session.session_id))
+        self.assertTrue(session.context.closed)
+        self.assertFalse(store.remove_session(session.session_id))
+
+    def test_sessions_expiry_and_limit(self):
+        '''
+        Tests that idle sessions are removed and sessions number is limited.
+        '''
+
+        store = GameSessionStore(FirstFreeFieldLibrary(), {3: 10}, idle_timeout=0.05, max_sessions=1)
+        session, engine_move = store.create_session(3, 2, 1)
+        self.assertIsNone(engine_move)
+        self.assertRaises(SessionLimitError, store.create_session, 3, 2, 1)
+
+        time.sleep(0.1)
+        self.assertIsNone(store.get_session(session.session_id))
+        self.assertTrue(session.context.closed)
+        store.create_session(3, 2, 1)
+        self.assertEqual(1, store.get_sessions_number())
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_context_reuses_previous_search(self):
+        '''
+        Tests that search context keeps results between moves of the same game and respects memory limit.
+        '''
+
+        library = MinMaxLibrary()
+        context = library.create_context(3, 1024 * 1024)
+        self.assertLessEqual(context.memory_usage, 1024 * 1024)
+
+        grid = [0] * 9
+        grid[context.make_move(grid, 1, 10)] = 1
+        self.assertGreater(context.get_entries_number(), 0)
+        cold_nodes = library.get_processed_nodes_number()
+
+        grid[grid.index(0)] = 2
+        context.make_move(grid, 1, 10)
+        self.assertLess(library.get_processed_nodes_number(), cold_nodes)
+
+        context.clear()
+        self.assertEqual(0, context.get_entries_number())
+        context.close()
+
+    def test_predicted_replies_order(self):
+        '''
+        Tests that replies completing player lines are predicted first.
+        '''
+
+        # 'O' player can win at field 2 and block 'X' player at field 8
+        grid = [2, 2, 0, 1, 1, 0, 0, 0, 0]
+        replies = get_predicted_replies(grid, 3, 2)
+        self.assertEqual(2, replies[0])
+        self.assertEqual(sorted(replies), [2, 5, 6, 7, 8])
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_pondering_finds_engine_replies(self):
+        '''
+        Tests that pondered replies are the same as foreground search ones and cancelled pondering keeps context usable.
+        '''
+
+        library = MinMaxLibrary()
+        ponderer = Ponderer(max_threads=1)
+        grid = [1, 0, 0, 0, 2, 0, 0, 0, 0]
+
+        # 'X' player (opponent) is moving, engine plays as 'O' player
+        # pondering waits until foreground search ends, so pondering threads limit is reached
+        context = library.create_context(3, 1024 * 1024)
+        with ponderer.foreground():
+            task = ponderer.start(context, grid, 3, 2, 10)
+            self.assertIsNone(ponderer.start(library.create_context(3, 1024), grid, 3, 2, 10))
+            self.assertEqual({}, task.replies)
+        task.thread.join()
+        replies = ponderer.cancel(task)
+        self.assertEqual(0, ponderer.get_pondering_number())
+        self.assertEqual([1, 2, 3, 5, 6, 7, 8], sorted(replies))
+
+        for reply, move in replies.items():
+            reply_grid = list(grid)
+            reply_grid[reply] = 1
+            self.assertEqual(library.make_move(reply_grid, 3, 2, 10), move)
+
+        # pondering cancelled right after start
+        context.clear()
+        ponderer.cancel(ponderer.start(context, grid, 3, 2, 10))
+        grid[8] = 1
+        self.assertEqual(library.make_move(grid, 3, 2, 10), context.make_move(grid, 2, 10))
+
+
+class GameChannelTest(TestCase):
+    '''
+    WebSocket game channel tests class.
+    '''
+
+    def test_start_message_parsing(self):
+        '''
+        Tests game start message validation.
+        '''
+
+        parameters = parse_start_message({'text': json.dumps({'type': "start", 'grid_size': 4, 'engine_player': 2})})
+        self.assertEqual({'grid_size': 4, 'engine_player': 2, 'first_player': 1, 'pondering': False}, parameters)
+
+        invalid_messages = [
+            {'text': "start"},
+            {'bytes': b"\x00"},
+            {'text': json.dumps({'type': "move", 'move': 1})},
+            {'text': json.dumps({'type': "start", 'grid_size': 6, 'engine_player': 2})},
+            {'text': json.dumps({'type': "start", 'grid_size': 3, 'engine_player': 1, 'pondering': 2})},
+        ]
+        for message in invalid_messages:
+            self.assertRaises(ValidationError, parse_start_message, message)
+
+    def test_move_message_parsing(self):
+        '''
+        Tests JSON and binary move messages parsing.
+        '''
+
+        self.assertEqual(7, parse_move_message({'text': json.dumps({'type': "move", 'move': 7})}))
+        self.assertEqual(24, parse_move_message({'bytes': bytes([24])}))
+
+        invalid_messages = [
+            {'bytes': bytes([25])},
+            {'bytes': bytes([1, 2])},
+            {'text': json.dumps({'type': "move", 'move': "1"})},
+            {'text': json.dumps({'type': "move"})},
+            {'text': "[1]"},
+        ]
+        for message in invalid_messages:
+            self.assertRaises(ValidationError, parse_move_message, message)
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_game_over_channel(self):
+        '''
+        Tests game played over WebSocket channel (moves are validated only against current game board).
+        '''
+
+        client = TestClient(application)
+        with client.websocket_connect("/tic-tac-toe/games") as websocket:
+            websocket.send_text(json.dumps({'type': "start", 'grid_size': 3, 'engine_player': 2}))
+            state = websocket.receive_json()
+            self.assertEqual("000000000", state["grid"])
+            self.assertIsNone(state["move"])
+
+            websocket.send_bytes(bytes([4]))
+            engine_move, game_status = websocket.receive_bytes()
+            self.assertNotEqual(NO_MOVE, engine_move)
+            self.assertEqual(0, game_status)
+
+            # field that is already marked
+            websocket.send_text(json.dumps({'type': "move", 'move': 4}))
+            self.assertEqual("error", websocket.receive_json()["type"])
+
+            free_field = [field for field in range(9) if field not in [4, engine_move]][0]
+            websocket.send_text(json.dumps({'type': "move", 'move': free_field}))
+            state = websocket.receive_json()
+            self.assertEqual("state", state["type"])
+            self.assertEqual(5, state["grid"].count("0"))
+
+
+class AsyncServingTest(TestCase):
+    '''
+    ASGI application (async serving mode) tests class.
+    '''
+
+    def setUp(self):
+        self._pool_workers = asgi.ENGINE_POOL_WORKERS
+        asgi.ENGINE_POOL_WORKERS = 1
+
+    def tearDown(self):
+        asgi.ENGINE_POOL_WORKERS = self._pool_workers
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_routes_and_payloads_are_kept(self):
+        '''
+        Tests that async server accepts the same form payloads and returns the same responses as WSGI server.
+        '''
+
+        with TestClient(application) as client:
+            response = client.post("/tic-tac-toe/min-max", data={'grid': "120120000", 'grid_size': "3", 'moving_player': "1"})
+            self.assertEqual(200, response.status_code)
+            self.assertEqual({'move': 6}, response.json())
+            self.assertIn("search;dur=", response.headers["Server-Timing"])
+
+            response = client.post("/tic-tac-toe/min-max", data={'grid': "12", 'grid_size': "3", 'moving_player': "1"})
+            self.assertEqual(400, response.status_code)
+            self.assertIn("grid", response.json())
+
+            # routes without async handlers are served by WSGI server
+            response = client.post("/tic-tac-toe/sessions", data={'grid_size': "3", 'engine_player': "2"})
+            self.assertEqual(201, response.status_code)
+            self.assertEqual(204, client.delete("/tic-tac-toe/sessions/" + response.json()["session_id"]).status_code)
+
+
+class LaneSchedulingTest(TestCase):
+    '''
+    Cost-aware lanes scheduling tests class.
+    '''
+
+    def test_minmax_cost_estimation(self):
+        '''
+        Tests that estimated cost is equal to number of analysed nodes when game cannot end during search.
+        '''
+
+        # 5x5 empty grid with depth limit 2 => 1 + 25 + 25 * 24 + 25 * 24 * 23 nodes
+        self.assertEqual(14426, estimate_minmax_cost(25, 2))
+        # search cannot be deeper than number of free fields
+        self.assertEqual(1 + 2 + 2, estimate_minmax_cost(2, 10))
+        self.assertEqual(1, estimate_minmax_cost(0, 10))
+        # estimation is an upper bound of analysed nodes (3x3 empty grid full search analyses 549946 nodes)
+        self.assertGreaterEqual(estimate_minmax_cost(9, 10), 549946)
+
+    def test_lanes_routing_and_saturation(self):
+        '''
+        Tests that requests are routed due to cost and saturated lane rejects requests immediately.
+        '''
+
+        cheap_lane, expensive_lane = Lane("cheap", 2, 8), Lane("expensive", 1, 2)
+        scheduler = LaneScheduler(cheap_lane, expensive_lane, 1000)
+        self.assertIs(cheap_lane, scheduler.get_lane(999))
+        self.assertIs(expensive_lane, scheduler.get_lane(1000))
+
+        release = threading.Event()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(expensive_lane.run(release.wait))) for i in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        while expensive_lane.get_queue_depth() < 2:
+            time.sleep(0.001)
+
+        # one request is running and one is queued => lane is saturated, but cheap lane still runs requests
+        self.assertRaises(LaneSaturatedError, expensive_lane.run, lambda: 0)
+        self.assertEqual(7, cheap_lane.run(lambda: 7))
+
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True, True], results)
+        self.assertEqual(0, expensive_lane.get_queue_depth())
+
+
+class AnalysisJobsTest(TestCase):
+    '''
+    Grid symmetries and deep analysis jobs tests class.
+    '''
+
+    def test_grid_symmetries(self):
+        '''
+        Tests that symmetric positions have the same canonical form and moves are mapped back correctly.
+        '''
+
+        for grid_size in [3, 4, 5]:
+            self.assertEqual(8, len(get_symmetries(grid_size)))
+
+        # the same position rotated by 90 degrees and reflected
+        grid = [1, 2, 0, 0, 0, 0, 0, 0, 0]
+        rotated_grid = [0, 0, 1, 0, 0, 2, 0, 0, 0]
+        reflected_grid = [0, 2, 1, 0, 0, 0, 0, 0, 0]
+        self.assertEqual(get_canonical_key(grid, 3, 1), get_canonical_key(rotated_grid, 3, 1))
+        self.assertEqual(get_canonical_key(grid, 3, 1), get_canonical_key(reflected_grid, 3, 1))
+        self.assertNotEqual(get_canonical_key(grid, 3, 1), get_canonical_key(grid, 3, 2))
+
+        for original_grid in [grid, rotated_grid, reflected_grid]:
+            canonical_grid, permutation = canonicalize(original_grid, 3)
+            for field in range(9):
+                self.assertEqual(canonical_grid[field], original_grid[map_canonical_move(field, permutation)])
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_analysis_jobs_deduplication_and_results_reuse(self):
+        '''
+        Tests that identical jobs are deduplicated and results of symmetric positions are reused.
+        '''
+
+        with tempfile.TemporaryDirectory() as jobs_directory:
+            manager = AnalysisJobManager(MinMaxLibrary(), jobs_directory)
+
+            # 'X' player has to block 'O' player at field 8
+            job, created = manager.submit([1, 1, 2, 0, 2, 0, 0, 0, 0], 3, 1, 9)
+            self.assertTrue(created)
+            self.assertIs(job, manager.submit([1, 1, 2, 0, 2, 0, 0, 0, 0], 3, 1, 9)[0])
+
+            states = [state for state in manager.iterate_updates(job.job_id) if state is not None]
+            self.assertEqual(JOB_DONE, states[-1]["status"])
+            self.assertEqual(6, states[-1]["best_move"])
+            # the whole tree is analysed at depth 4 - streamed states are the latest ones, so depths that finished
+            # before iteration started may be skipped, but streamed depths never decrease
+            self.assertEqual(4, states[-1]["depth"])
+            depths = [state["depth"] for state in states if state["depth"] is not None]
+            self.assertEqual(sorted(depths), depths)
+            self.assertTrue(set(depths) <= {1, 2, 3, 4})
+
+            # the same position reflected (left to right columns) - result is reused and mapped to reflected grid
+            reflected_job, created = manager.submit([2, 1, 1, 0, 2, 0, 0, 0, 0], 3, 1, 4)
+            states = [state for state in manager.iterate_updates(reflected_job.job_id) if state is not None]
+            self.assertTrue(states[-1]["cached"])
+            self.assertEqual(8, states[-1]["best_move"])
+
+            # job is read from jobs directory by another manager (e.g. of another server worker)
+            self.assertEqual(JOB_DONE, AnalysisJobManager(MinMaxLibrary(), jobs_directory).get_job(job.job_id).status)
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_single_free_field_job(self):
+        '''
+        Tests that job of position with single free field finds its move.
+        '''
+
+        with tempfile.TemporaryDirectory() as jobs_directory:
+            manager = AnalysisJobManager(MinMaxLibrary(), jobs_directory)
+            job, created = manager.submit([1, 2, 1, 1, 2, 2, 2, 1, 0], 3, 1, 9)
+            states = [state for state in manager.iterate_updates(job.job_id) if state is not None]
+            self.assertEqual(JOB_DONE, states[-1]["status"])
+            self.assertEqual(8, states[-1]["best_move"])
+            self.assertEqual(1, states[-1]["depth"])
+
+
+class ComputeBudgetTest(TestCase):
+    '''
+    Per-request min-max compute budget tests class.
+    '''
+
+    def test_budget_fields_validation(self):
+        '''
+        Tests that budget fields are optional and limited by server caps.
+        '''
+
+        request_data = {'grid': "0" * 16, 'grid_size': 4, 'moving_player': 1}
+        self.assertTrue(TicTacToeRequestValidator(request_data).is_valid())
+        self.assertTrue(TicTacToeRequestValidator(dict(request_data, max_depth=6, max_nodes=1000)).is_valid())
+
+        validator = TicTacToeRequestValidator(dict(request_data, max_depth=7))
+        self.assertFalse(validator.is_valid())
+        self.assertIn("max_depth", validator.errors)
+        validator = TicTacToeRequestValidator(dict(request_data, max_nodes=99))
+        self.assertFalse(validator.is_valid())
+        self.assertIn("max_nodes", validator.errors)
+
+        # default depth is used when not requested, deeper searches are always limited by number of nodes
+        self.assertEqual((5, None), server.get_minmax_budget(dict(request_data, max_depth=None, max_nodes=None)))
+        self.assertEqual((2, 500), server.get_minmax_budget(dict(request_data, max_depth=2, max_nodes=500)))
+        self.assertEqual((6, MINMAX_MAX_NODES_CAP), server.get_minmax_budget(dict(request_data, max_depth=6, max_nodes=None)))
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_nodes_limited_search(self):
+        '''
+        Tests that search stops right after nodes limit is exceeded and returns move of the deepest finished search.
+        '''
+
+        minmax_library = MinMaxLibrary()
+        grid = [0] * 16
+        for max_nodes in [100, 5000, 100000]:
+            move = minmax_library.make_move(grid, 4, 1, 5, max_nodes)
+            self.assertIn(move, range(16))
+            # search is interrupted at the first node analysed after limit was exceeded by each tree level
+            self.assertLess(minmax_library.get_processed_nodes_number(), max_nodes + 100)
+
+        # 'X' player has to block 'O' player at field 6 - it's found by shallow search finished within budget
+        grid = [1, 1, 2, 0, 2, 0, 0, 0, 0]
+        self.assertEqual(6, minmax_library.make_move(grid, 3, 1, 10, 1000))
+        # search that fits in budget returns the same move as unlimited one
+        self.assertEqual(minmax_library.make_move(grid, 3, 1, 10), minmax_library.make_move(grid, 3, 1, 10, 10 ** 6))
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_budget_request(self):
+        '''
+        Tests that min-max endpoint accepts budget fields.
+        '''
+
+        client = server.server.test_client()
+        form = {'grid': "0" * 16, 'grid_size': "4", 'moving_player': "1", 'max_depth': "6", 'max_nodes': "2000"}
+        response = client.post("/tic-tac-toe/min-max", data=form)
+        self.assertEqual(200, response.status_code)
+        self.assertIn(response.get_json()["move"], range(16))
+
+        response = client.post("/tic-tac-toe/min-max", data=dict(form, max_depth="11"))
+        self.assertEqual(400, response.status_code)
+        self.assertIn("max_depth", response.get_json())
+
+
+class EngineResolversTest(TestCase):
+    '''
+    Engine resolvers chains tests class.
+    '''
+
+    def test_immediate_move_resolver(self):
+        '''
+        Tests that winning move is preferred to blocking one.
+        '''
+
+        resolver = ImmediateMoveResolver()
+        # 'X' player can win at field 2, 'O' player threatens field 8
+        self.assertEqual(2, resolver.resolve(Position([1, 1, 0, 2, 2, 0, 0, 0, 0], 3, 1)))
+        self.assertEqual(5, resolver.resolve(Position([1, 1, 0, 2, 2, 0, 1, 0, 0], 3, 2)))
+        self.assertEqual(6, resolver.resolve(Position([1, 1, 2, 0, 2, 0, 0, 0, 0], 3, 1)))
+        self.assertIsNone(resolver.resolve(Position([1, 0, 0, 0, 2, 0, 0, 0, 0], 3, 1)))
+        # search of depth 0 does not see opponent's win, so it's not blocked
+        self.assertIsNone(resolver.resolve(Position([1, 1, 2, 0, 2, 0, 0, 0, 0], 3, 1, depth_limit=0)))
+        self.assertEqual(2, resolver.resolve(Position([1, 1, 0, 2, 2, 0, 0, 0, 0], 3, 1, depth_limit=0)))
+
+    def test_tablebase_resolver_budget(self):
+        '''
+        Tests that solved positions table answers only requests whose budget covers the whole game tree.
+        '''
+
+        resolver = TablebaseResolver(3)
+        grid = [1, 1, 2, 0, 2, 0, 0, 0, 0]
+        self.assertEqual(6, resolver.resolve(Position(grid, 3, 1)))
+        self.assertEqual(6, resolver.resolve(Position(grid, 3, 1, depth_limit=4)))
+        self.assertIsNone(resolver.resolve(Position(grid, 3, 1, depth_limit=3)))
+        self.assertIsNone(resolver.resolve(Position(grid, 3, 1, depth_limit=10, max_nodes=1000)))
+
+    def test_solved_positions_table(self):
+        '''
+        Tests that 3x3 table finds game results and the fastest wins.
+        '''
+
+        table = solve_game(3)
+        self.assertEqual((0, 9, 0), table[get_table_key([0] * 9, 1)])
+        # 'O' player has to block at field 6 (then 'X' player loses fork at fields 3 and 7 is not possible)
+        self.assertEqual(6, find_table_move(table, [1, 1, 2, 0, 2, 0, 0, 0, 0], 3, 1))
+        # reflected position gets reflected move
+        self.assertEqual(8, find_table_move(table, [2, 1, 1, 0, 2, 0, 0, 0, 0], 3, 1))
+
+    def test_result_cache_resolver(self):
+        '''
+        Tests that cached move is reused for symmetric positions searched with the same budget.
+        '''
+
+        memory_cache = MemoryResultCache(capacity=1)
+        cache = ResultCacheResolver(memory_cache, "min-max")
+        cache.store(Position([1, 2, 0, 0, 0, 0, 0, 0, 0], 3, 1, depth_limit=2), 4)
+        self.assertEqual(4, cache.resolve(Position([0, 2, 1, 0, 0, 0, 0, 0, 0], 3, 1, depth_limit=2)))
+        self.assertIsNone(cache.resolve(Position([1, 2, 0, 0, 0, 0, 0, 0, 0], 3, 1, depth_limit=3)))
+        self.assertIsNone(
+            ResultCacheResolver(memory_cache, "neural-network").resolve(Position([1, 2] + [0] * 7, 3, 1, depth_limit=2))
+        )
+
+        # the least recently used entry is removed
+        cache.store(Position([1, 0, 0, 0, 2, 0, 0, 0, 0], 3, 1, depth_limit=2), 8)
+        self.assertEqual(1, memory_cache.get_entries_number())
+        self.assertIsNone(cache.resolve(Position([1, 2, 0, 0, 0, 0, 0, 0, 0], 3, 1, depth_limit=2)))
+
+    def test_resolvers_chain(self):
+        '''
+        Tests that chain passes position through resolvers and stores moves of storable ones.
+        '''
+
+        def unavailable_search(position):
+            raise ResolverUnavailableError("Search did not finish before deadline.")
+
+        cache = ResultCacheResolver(MemoryResultCache(capacity=8), "test")
+        registry = EngineRegistry()
+        chain = registry.register("test", 4, [
+            ImmediateMoveResolver(), cache, FunctionResolver("search", lambda position: 5, storable=True)
+        ])
+        self.assertIs(chain, registry.get_chain("test", 4))
+
+        position = Position([1, 2] + [0] * 14, 4, 1, depth_limit=5)
+        self.assertEqual((5, "search"), chain.resolve(position))
+        self.assertEqual((5, "cache"), chain.resolve(position))
+
+        # fallback resolver answers when search is unavailable
+        chain = ResolverChain("test", [
+            FunctionResolver("search", unavailable_search), FunctionResolver("fallback", lambda position: 0)
+        ])
+        self.assertEqual((0, "fallback"), chain.resolve(position))
+        self.assertRaises(ResolverUnavailableError, ResolverChain("test", chain.resolvers[:1]).resolve, position)
+
+    def test_opening_positions(self):
+        '''
+        Tests that opening positions are deduplicated by symmetry.
+        '''
+
+        # empty grid and 3 different first moves (corner, edge, center) of each player
+        self.assertEqual(8, len(get_opening_positions(3, 1)))
+        # book moves are fields of canonical grid ('X' player mark at field 15), field 10 is its diagonal neighbour
+        book = {get_canonical_key([1] + [0] * 15, 4, 2): {'move': 10, 'depth': 5}}
+        with tempfile.TemporaryDirectory() as books_directory:
+            book_path = os.path.join(books_directory, "book.json")
+            save_opening_book(book_path, book)
+            resolver = OpeningBookResolver(book_path)
+
+        # symmetric position (first move at field 3) gets its diagonal neighbour too
+        self.assertEqual(6, resolver.resolve(Position([0, 0, 0, 1] + [0] * 12, 4, 2, depth_limit=5)))
+        self.assertIsNone(resolver.resolve(Position([0, 0, 0, 1] + [0] * 12, 4, 2, depth_limit=6)))
+        # book moves are not used by searches limited by nodes budget
+        self.assertIsNone(resolver.resolve(Position([0, 0, 0, 1] + [0] * 12, 4, 2, depth_limit=5, max_nodes=1000)))
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_saturated_lane_rejects_request(self):
+        '''
+        Tests that request of saturated lane is rejected (not answered by neural network fallback).
+        '''
+
+        expensive_lane = server.lane_scheduler.get_lane(server.LANE_COST_THRESHOLD)
+        release = threading.Event()
+        futures = []
+        try:
+            while True:
+                futures.append(expensive_lane.submit(release.wait))
+        except LaneSaturatedError:
+            pass
+
+        try:
+            client = server.server.test_client()
+            form = {'grid': "1200100000000000", 'grid_size': "4", 'moving_player': "2", 'max_depth': "5"}
+            response = client.post("/tic-tac-toe/min-max", data=form)
+        finally:
+            release.set()
+            concurrent.futures.wait(futures)
+        self.assertEqual(503, response.status_code)
+        self.assertEqual("1", response.headers["Retry-After"])
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_search_deadline_fallback(self):
+        '''
+        Tests that neural network answers when search misses deadline and late search move is cached.
+        '''
+
+        deadline = server.MINMAX_SEARCH_DEADLINE_S
+        server.MINMAX_SEARCH_DEADLINE_S = 1e-9
+        try:
+            client = server.server.test_client()
+            form = {'grid': "1000020000000000", 'grid_size': "4", 'moving_player': "1", 'max_depth': "2"}
+            response = client.post("/tic-tac-toe/min-max", data=form)
+        finally:
+            server.MINMAX_SEARCH_DEADLINE_S = deadline
+        self.assertEqual(200, response.status_code)
+
+        cache = server.engine_registry.get_chain("min-max", 4).resolvers[1]
+        position = Position([1, 0, 0, 0, 0, 2] + [0] * 10, 4, 1, depth_limit=2)
+        for i in range(100):
+            if cache.resolve(position) is not None:
+                break
+            time.sleep(0.01)
+        self.assertEqual(MinMaxLibrary().make_move(position.grid, 4, 1, 2), cache.resolve(position))
+
+
+def fill_shared_cache(path, keys_number):
+    # run by another process (as another server worker would do)
+    cache = SharedMemoryResultCache(path, 1024)
+    for i in range(keys_number):
+        cache.set("key-{i}".format(i=i), i % 25)
+    cache.close()
+
+
+class SharedResultCacheTest(TestCase):
+    '''
+    Shared memory results cache tests class.
+    '''
+
+    def test_cache_is_shared_by_processes(self):
+        '''
+        Tests that moves written by one process are read by another one.
+        '''
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            path = os.path.join(cache_directory, "cache")
+            cache = SharedMemoryResultCache(path, 1024)
+            process = multiprocessing.get_context("fork").Process(target=fill_shared_cache, args=(path, 100))
+            process.start()
+            process.join()
+
+            self.assertEqual(0, process.exitcode)
+            self.assertEqual([i % 25 for i in range(100)], [cache.get("key-{i}".format(i=i)) for i in range(100)])
+            self.assertIsNone(cache.get("key-100"))
+            self.assertEqual(100, cache.get_entries_number())
+            cache.close()
+
+            # cache file that does not match requested size is reset
+            cache = SharedMemoryResultCache(path, 2048)
+            self.assertEqual(0, cache.get_entries_number())
+            cache.close()
+
+    def test_clock_eviction(self):
+        '''
+        Tests that recently read entries get second chance when bucket is full.
+        '''
+
+        with tempfile.TemporaryDirectory() as cache_directory:
+            # single bucket of 8 entries
+            cache = SharedMemoryResultCache(os.path.join(cache_directory, "cache"), 8)
+            for i in range(8):
+                cache.set("key-{i}".format(i=i), i)
+            self.assertEqual(0, cache.get("key-0"))
+
+            cache.set("key-8", 8)
+            self.assertEqual(8, cache.get_entries_number())
+            self.assertEqual(0, cache.get("key-0"))
+            self.assertIsNone(cache.get("key-1"))
+            self.assertEqual(8, cache.get("key-8"))
+
+            # concurrent writers and readers of the same bucket
+            def write_keys(first_key):
+                for i in range(200):
+                    cache.set("key-{i}".format(i=first_key + i % 4), (first_key + i) % 25)
+                    cache.get("key-{i}".format(i=first_key + i % 3))
+
+            threads = [threading.Thread(target=write_keys, args=(first_key,)) for first_key in [100, 200, 300]]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(8, cache.get_entries_number())
+            cache.close()
+
+
+class PersistentResultStoreTest(TestCase):
+    '''
+    Persistent positions results store tests class.
+    '''
+
+    def test_position_keys(self):
+        '''
+        Tests that position keys are compact and decoded back to the same positions.
+        '''
+
+        grid = [1, 2, 0, 0, 1] + [0] * 19 + [2]
+        key = encode_position_key(b"version1", grid, 5, 1, 3, None)
+        self.assertEqual(8 + 3 + 8 + 7, len(key))
+        self.assertEqual((grid, 5, 1, 3, None), decode_position_key(key))
+        key = encode_position_key(b"version1", [0] * 9, 3, 2, 10, 5000)
+        self.assertEqual(([0] * 9, 3, 2, 10, 5000), decode_position_key(key))
+
+    def test_results_survive_restart(self):
+        '''
+        Tests that results are read after store is opened again, but only by the same store version.
+        '''
+
+        with tempfile.TemporaryDirectory() as store_directory:
+            path = os.path.join(store_directory, "positions.sqlite3")
+            store = PersistentResultStore(path, get_store_version([], {4: 5}))
+            store.put([1, 2] + [0] * 14, 4, 1, 5, None, 5)
+            store.close()
+
+            # restarted server - symmetric position (reflected left to right) gets reflected move
+            store = PersistentResultStore(path, get_store_version([], {4: 5}))
+            self.assertEqual(6, store.get([0, 0, 2, 1] + [0] * 12, 4, 1, 5, None))
+            self.assertIsNone(store.get([0, 0, 2, 1] + [0] * 12, 4, 1, 4, None))
+
+            # results are loaded to results cache
+            cache = MemoryResultCache(capacity=8)
+            self.assertEqual(1, PersistentStoreResolver(store).warm_up(ResultCacheResolver(cache, "min-max")))
+            self.assertEqual(5, ResultCacheResolver(cache, "min-max").resolve(Position([1, 2] + [0] * 14, 4, 1, 5)))
+            store.close()
+
+            # results of another engine version are removed
+            store = PersistentResultStore(path, get_store_version([], {4: 6}))
+            self.assertIsNone(store.get([1, 2] + [0] * 14, 4, 1, 5, None))
+            self.assertEqual([], list(store.iterate_results()))
+            store.close()
+
+
+class InferenceBatchingTest(TestCase):
+    '''
+    Neural network inference micro-batching tests class.
+    '''
+
+    def test_concurrent_requests_are_batched(self):
+        '''
+        Tests that rows of concurrent requests are predicted together and predictions are scattered back.
+        '''
+
+        batches = []
+        batcher = InferenceBatcher(
+            lambda rows: rows * 10, max_wait=0.05, max_rows=16, on_batch=lambda requests, rows: batches.append(rows)
+        )
+
+        results = {}
+
+        def make_request(i):
+            results[i] = batcher.predict([[i, i + 1], [i + 2, i + 3]]).tolist()
+
+        threads = [threading.Thread(target=make_request, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({i: [[i * 10, i * 10 + 10], [i * 10 + 20, i * 10 + 30]] for i in range(20)}, results)
+        self.assertEqual(40, sum(batches))
+        # requests rows are never split and batch never exceeds max. rows
+        self.assertLess(len(batches), 20)
+        self.assertTrue(all(rows <= 16 and rows % 2 == 0 for rows in batches))
+
+    def test_prediction_error_is_propagated(self):
+        '''
+        Tests that all requests of failed batch get prediction error.
+        '''
+
+        def predict(rows):
+            raise ValueError("Model is not fitted.")
+
+        batcher = InferenceBatcher(predict, max_wait=0.001)
+        self.assertRaises(ValueError, batcher.predict, [[0, 0]])
+
+    def test_batched_neural_network_move(self):
+        '''
+        Tests that neural network predicts all available moves at once.
+        '''
+
+        predicted_rows = []
+
+        def predict(rows):
+            predicted_rows.append(len(rows))
+            # 'X' player wins after move at field 4
+            return numpy.array([[0.1, 0.9 if row[4] == 1 else 0.2, 0.0] for row in rows])
+
+        neural_network = NeuralNetworkSklearn(network_configuration_3x3)
+        self.assertEqual(4, neural_network.make_move([1, 2, 0, 0, 0, 0, 0, 0, 0], 3, 1, predict=predict))
+        self.assertEqual([7], predicted_rows)
+
+
+class PredictionCacheTest(TestCase):
+    '''
+    Neural network canonical child grids predictions cache tests class.
+    '''
+
+    @staticmethod
+    def predict(rows):
+        return numpy.array([[0.1, 0.3 + 0.1 * row[4], 0.2] for row in rows])
+
+    def test_symmetric_children_are_predicted_once(self):
+        '''
+        Tests that only canonical child grids missing in cache are predicted.
+        '''
+
+        predicted_rows = []
+
+        def predict(rows):
+            predicted_rows.append(len(rows))
+            return self.predict(rows)
+
+        lookups = []
+        neural_network = NeuralNetworkSklearn(
+            network_configuration_3x3, cache_size=100, on_cache_lookup=lambda *lookup: lookups.append(lookup)
+        )
+        # empty grid children: corner, edge and center grids
+        self.assertEqual(4, neural_network.make_move([0] * 9, 3, 1, predict=predict))
+        self.assertEqual(4, neural_network.make_move([0] * 9, 3, 1, predict=predict))
+        self.assertEqual([3], predicted_rows)
+
+        stats = neural_network.get_cache_stats()
+        self.assertEqual((15, 3, 3), (stats['hits'], stats['misses'], stats['entries']))
+        self.assertAlmostEqual(15 / 18, stats['hit_ratio'])
+        self.assertGreater(stats['memory_bytes'], 0)
+        self.assertEqual([(6, 3, stats['memory_bytes']), (9, 0, stats['memory_bytes'])], lookups)
+
+    def test_cache_is_bounded(self):
+        '''
+        Tests that least recently used predictions are evicted and memory usage follows cache entries.
+        '''
+
+        neural_network = NeuralNetworkSklearn(network_configuration_3x3, cache_size=2)
+        neural_network.make_move([0] * 9, 3, 1, predict=self.predict)
+        stats = neural_network.get_cache_stats()
+        self.assertEqual(2, stats['entries'])
+
+        neural_network.make_move([1, 2, 1, 2, 1, 2, 0, 0, 0], 3, 2, predict=self.predict)
+        self.assertEqual(2, neural_network.get_cache_stats()['entries'])
+        self.assertEqual(stats['memory_bytes'], neural_network.get_cache_stats()['memory_bytes'])
+
+    def test_cache_is_reset_when_model_changes(self):
+        '''
+        Tests that cached predictions are dropped when model is loaded again or trained.
+        '''
+
+        neural_network = NeuralNetworkSklearn(network_configuration_4x4, cache_size=100)
+        if not neural_network.load_model("./neural_network/network_4x4"):
+            self.skipTest("4x4 neural network model is not trained")
+        version = neural_network.model_version
+        neural_network.make_move([0] * 16, 4, 1)
+        self.assertEqual(3, neural_network.get_cache_stats()['entries'])
+
+        neural_network.load_model("./neural_network/network_4x4")
+        self.assertEqual(version, neural_network.model_version)
+        self.assertEqual(0, neural_network.get_cache_stats()['entries'])
+
+        neural_network.make_move([0] * 16, 4, 1)
+        neural_network.learn([[0] * 16, [1] * 16], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        self.assertNotEqual(version, neural_network.model_version)
+        self.assertEqual({'hits': 0, 'misses': 0, 'entries': 0}, {
+            key: value for key, value in neural_network.get_cache_stats().items() if key in ['hits', 'misses', 'entries']
+        })
+
+
+class PolicyNetworkTest(TestCase):
+    '''
+    Policy network (single forward pass move) tests class.
+    '''
+
+    configuration = {'hidden_layer_sizes': (128,), 'max_iter': 500, 'random_state': 0}
+
+    def make_dataset(self):
+        # all 3x3 positions labelled with solved positions table moves
+        table = solve_game(3)
+        grids = [[int(field) for field in key.split("-")[1]] for key in table]
+        return make_policy_dataset(
+            grids, 3, lambda grid, grid_size, moving_player: find_table_move(table, grid, grid_size, moving_player)
+        )
+
+    def test_policy_dataset(self):
+        '''
+        Tests that grids are labelled for every player that can move and ended games are skipped.
+        '''
+
+        self.assertEqual([1, 2], get_moving_players([0] * 9))
+        self.assertEqual([2], get_moving_players([1] + [0] * 8))
+        self.assertEqual([], get_moving_players([1, 1] + [0] * 7))
+
+        labelled = []
+
+        def find_move(grid, grid_size, moving_player):
+            labelled.append(moving_player)
+            return grid.index(0)
+
+        grids = [[0] * 9, [0] * 9, [1, 1, 1, 2, 2, 0, 0, 0, 0], [1, 2] + [0] * 7]
+        input_data, output_data = make_policy_dataset(grids, 3, find_move)
+        self.assertEqual([[0] * 9 + [1], [0] * 9 + [2], [1, 2] + [0] * 7 + [1], [1, 2] + [0] * 7 + [2]], input_data)
+        self.assertEqual([0, 0, 2, 2], output_data)
+        self.assertEqual([1, 2, 1, 2], labelled)
+
+    def test_move_with_single_forward_pass(self):
+        '''
+        Tests that policy network predicts single row and chooses only free fields.
+        '''
+
+        input_data, output_data = self.make_dataset()
+        policy_network = PolicyNeuralNetworkSklearn(self.configuration)
+        policy_network.learn(numpy.array(input_data), numpy.array(output_data))
+        self.assertIsNotNone(policy_network.model_version)
+
+        predicted_rows = []
+
+        def predict(rows):
+            predicted_rows.append(len(rows))
+            return policy_network.predict(rows)
+
+        for row in input_data[:200]:
+            grid, moving_player = row[:9], row[9]
+            move = policy_network.make_move(grid, 3, moving_player, predict=predict)
+            self.assertEqual(0, grid[move])
+        self.assertEqual([1] * 200, predicted_rows)
+
+        # illegal moves are masked even when network prefers taken field
+        probabilities = numpy.zeros(9)
+        probabilities[4], probabilities[8] = 0.9, 0.1
+        self.assertEqual(8, policy_network.make_move([0, 0, 0, 0, 1, 0, 0, 0, 0], 3, 2, predict=lambda rows: [probabilities]))
+
+    def test_learnt_policy_keeps_game_result(self):
+        '''
+        Tests that policy network learnt on solved positions chooses moves that keep game result in most of them.
+        '''
+
+        table = solve_game(3)
+
+        def get_move_result(grid, moving_player, move):
+            grid = grid[:move] + [moving_player] + grid[move + 1:]
+            if get_winner(grid, 3) == moving_player:
+                return 1
+            if 0 not in grid:
+                return 0
+            return -solve_position(grid, 3, 2 if moving_player == 1 else 1, table)[0]
+
+        input_data, output_data = self.make_dataset()
+        policy_network = PolicyNeuralNetworkSklearn(self.configuration)
+        policy_network.learn(numpy.array(input_data), numpy.array(output_data))
+
+        correct = sum(
+            get_move_result(row[:9], row[9], policy_network.make_move(row[:9], 3, row[9]))
+            == get_move_result(row[:9], row[9], move)
+            for row, move in zip(input_data, output_data)
+        )
+        self.assertGreater(correct / len(input_data), 0.85)
+
+    def test_model_request_field(self):
+        '''
+        Tests neural network endpoint model field validation.
+        '''
+
+        data = {'grid': "0" * 9, 'grid_size': 3, 'moving_player': 1, 'max_depth': None, 'max_nodes': None}
+        self.assertTrue(NeuralNetworkRequestValidator(dict(data, model=None)).is_valid())
+        self.assertTrue(NeuralNetworkRequestValidator(dict(data, model="policy")).is_valid())
+        validator = NeuralNetworkRequestValidator(dict(data, model="forest"))
+        self.assertFalse(validator.is_valid())
+        self.assertIn("model", validator.errors)
+
+    def test_policy_model_request(self):
+        '''
+        Tests that neural network endpoint answers with policy network move when it is requested.
+        '''
+
+        client = server.server.test_client()
+        form = {'grid': "120000000", 'grid_size': "3", 'moving_player': "1", 'model': "policy"}
+        self.assertEqual(400, client.post("/tic-tac-toe/neural-network", data=dict(form, model="forest")).status_code)
+
+        if not server.policy_network_models_loaded[3]:
+            response = client.post("/tic-tac-toe/neural-network", data=form)
+            self.assertEqual(503, response.status_code)
+            self.assertIn("error", response.get_json())
+            return
+
+        response = client.post("/tic-tac-toe/neural-network", data=form)
+        self.assertEqual(200, response.status_code)
+        self.assertIn(response.get_json()["move"], range(2, 9))
+
+
+class HybridSearchTest(TestCase):
+    '''
+    Hybrid engine (min-max search with neural network leaves scores) tests class.
+    '''
+
+    @staticmethod
+    def predict(rows):
+        # 'X' player is predicted to win when it has center field, otherwise draw
+        return numpy.array([[0.2, 0.8, 0.0] if row[4] == 1 else [1.0, 0.0, 0.0] for row in rows])
+
+    def test_leaves_are_scored_by_network(self):
+        '''
+        Tests that leaves at depth cutoff are scored by neural network.
+        '''
+
+        result = HybridSearch(self.predict).search([0] * 9, 3, 1, 0)
+        self.assertEqual(4, result['move'])
+        self.assertAlmostEqual(0.8, result['score'])
+        # root and its canonical children (corner, edge, center)
+        self.assertEqual((4, 3, 1), (result['nodes'], result['leaves'], result['batches']))
+
+    def test_leaves_are_predicted_in_batches(self):
+        '''
+        Tests that leaves are predicted in calls of max. leaf batch size.
+        '''
+
+        predicted_rows = []
+
+        def predict(rows):
+            predicted_rows.append(len(rows))
+            return self.predict(rows)
+
+        result = HybridSearch(predict, leaf_batch_size=10).search([0] * 9, 3, 1, 1)
+        self.assertEqual(sum(predicted_rows), result['leaves'])
+        self.assertEqual(len(predicted_rows), result['batches'])
+        self.assertTrue(all(rows <= 10 for rows in predicted_rows))
+        self.assertGreater(result['batches'], 1)
+
+    def test_ended_games_are_preferred_to_network_scores(self):
+        '''
+        Tests that win is taken and opponent's win is blocked regardless of network scores.
+        '''
+
+        hybrid_search = HybridSearch(self.predict)
+        self.assertEqual(2, hybrid_search.make_move([2, 2, 0, 1, 0, 1, 0, 0, 1], 3, 2, 1))
+        self.assertEqual(6, hybrid_search.make_move([2, 0, 0, 2, 1, 0, 0, 0, 1], 3, 1, 2))
+
+    def test_full_depth_search_keeps_solved_result(self):
+        '''
+        Tests that search without depth cutoff chooses moves that keep solved game result.
+        '''
+
+        table = solve_game(3)
+        hybrid_search = HybridSearch(self.predict)
+        for key in list(table)[:100:7]:
+            moving_player, grid = int(key.split("-")[0]), [int(field) for field in key.split("-")[1]]
+            result = hybrid_search.search(grid, 3, moving_player, 9)
+            self.assertEqual(0, result['leaves'])
+            self.assertEqual(table[key][0], (result['score'] > 0) - (result['score'] < 0))
+
+        # tree of empty grid ends with full grids at the last level
+        self.assertEqual(0, hybrid_search.search([0] * 9, 3, 1, 8)['leaves'])
+
+    def test_search_budget(self):
+        '''
+        Tests that search which exceeds nodes budget or deadline is stopped.
+        '''
+
+        hybrid_search = HybridSearch(self.predict)
+        self.assertEqual(16, hybrid_search.search([0] * 9, 3, 1, 1, max_nodes=16)['nodes'])
+        with self.assertRaises(HybridBudgetExceededError):
+            hybrid_search.search([0] * 9, 3, 1, 1, max_nodes=15)
+        with self.assertRaises(HybridBudgetExceededError):
+            hybrid_search.search([0] * 16, 4, 1, 3, deadline=time.monotonic())
+
+    def test_hybrid_request(self):
+        '''
+        Tests hybrid engine endpoint.
+        '''
+
+        client = server.server.test_client()
+        form = {'grid': "1100220000000000", 'grid_size': "4", 'moving_player': "1", 'max_depth': "1"}
+        self.assertEqual(400, client.post("/tic-tac-toe/hybrid", data=dict(form, max_depth="20")).status_code)
+        # min-max depth caps are higher than hybrid ones
+        self.assertEqual(400, client.post("/tic-tac-toe/hybrid", data=dict(form, max_depth="5")).status_code)
+
+        response = client.post("/tic-tac-toe/hybrid", data=form)
+        if not server.neural_network_models_loaded[4]:
+            self.assertEqual(503, response.status_code)
+            return
+        self.assertEqual(200, response.status_code)
+        self.assertIn(response.get_json()["move"], [2, 3, 6, 7])
+
+    def test_hybrid_request_budget_fallback(self):
+        '''
+        Tests that neural network answers when hybrid search exceeds its nodes budget.
+        '''
+
+        if not server.neural_network_models_loaded[4]:
+            self.skipTest("4x4 neural network model is not loaded")
+
+        max_nodes = server.HYBRID_MAX_NODES
+        server.HYBRID_MAX_NODES = 1
+        try:
+            client = server.server.test_client()
+            form = {'grid': "1200000000000000", 'grid_size': "4", 'moving_player': "1", 'max_depth': "3"}
+            response = client.post("/tic-tac-toe/hybrid", data=form)
+        finally:
+            server.HYBRID_MAX_NODES = max_nodes
+        self.assertEqual(200, response.status_code)
+        self.assertIn(response.get_json()["move"], range(2, 16))
+
+
+DATA_GENERATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_generator")
+
+
+class BinaryDatasetTest(TestCase):
+    '''
+    Binary learning datasets tests class.
+    '''
+
+    grids = [[0] * 16, [1, 2] + [0] * 14, [2, 1, 1, 2, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0]]
+    labels = [[0.5, 0.25, 0.25], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+    def test_written_records_are_loaded(self):
+        '''
+        Tests that packed grids and labels are loaded in order of writing.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset.bin")
+            with DatasetWriter(path, 4) as writer:
+                writer.write(self.grids[:2], self.labels[:2])
+                writer.write(self.grids[2:], self.labels[2:])
+
+            self.assertEqual((4, 3), read_header(path))
+            # 4 bytes of packed fields and 3 float labels per record
+            self.assertEqual(32 + 3 * 16, os.path.getsize(path))
+            input_data, output_data = load_dataset(path)
+            self.assertEqual(self.grids, input_data.tolist())
+            self.assertEqual(self.labels, output_data.tolist())
+
+            self.assertEqual(self.grids[1:], load_dataset(path, start=1)[0].tolist())
+            chunks = list(iterate_dataset(path, 2))
+            self.assertEqual([2, 1], [len(chunk[0]) for chunk in chunks])
+            self.assertEqual(self.grids[2:], chunks[1][0].tolist())
+
+    def test_partially_written_records(self):
+        '''
+        Tests that partially written last record is skipped and truncated dataset is rejected.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dataset.bin")
+            writer = DatasetWriter(path, 4)
+            writer.write(self.grids, self.labels)
+            writer._file.write(b"\1" * 5)
+            writer._file.flush()
+            # header of unfinished dataset has no records number
+            self.assertEqual((4, 0), read_header(path))
+            self.assertEqual(self.grids, load_dataset(path)[0].tolist())
+
+            writer.close()
+            self.assertEqual(self.grids, load_dataset(path)[0].tolist())
+            os.truncate(path, 32 + 2 * 16)
+            self.assertRaises(DatasetFormatError, load_dataset, path)
+
+    def test_text_dataset_conversion(self):
+        '''
+        Tests that text dataset lines are converted to binary records (empty lines are skipped).
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            text_path, binary_path = os.path.join(directory, "dataset.dat"), os.path.join(directory, "dataset.bin")
+            with open(text_path, "w") as text_file:
+                for grid, labels in zip(self.grids, self.labels):
+                    text_file.write("({grid}, ) -> ({labels})\n\n".format(
+                        grid=", ".join(str(field) for field in grid), labels=", ".join("%.4f" % label for label in labels)
+                    ))
+
+            self.assertEqual(3, convert_text_dataset(text_path, binary_path, 4))
+            input_data, output_data = load_dataset(binary_path)
+            self.assertEqual(self.grids, input_data.tolist())
+            self.assertEqual(self.labels, output_data.tolist())
+
+            self.assertRaises(DatasetFormatError, read_header, text_path)
+
+    @unittest.skipUnless(os.path.exists(os.path.join(DATA_GENERATOR_PATH, "generator_3x3")), "data generators are not built")
+    def test_generator_binary_output(self):
+        '''
+        Tests that binary output of data generator matches its text output.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            text_path, binary_path = os.path.join(directory, "data.dat"), os.path.join(directory, "data.bin")
+            generator = os.path.join(DATA_GENERATOR_PATH, "generator_3x3")
+            self.assertEqual(0, os.system("{generator} {path} > /dev/null".format(generator=generator, path=text_path)))
+            self.assertEqual(0, os.system("{generator} {path} --binary > /dev/null".format(
+                generator=generator, path=binary_path
+            )))
+
+            converted_path = os.path.join(directory, "converted.bin")
+            records_number = convert_text_dataset(text_path, converted_path, 3)
+            self.assertEqual((3, records_number), read_header(binary_path))
+            input_data, output_data = load_dataset(binary_path)
+            self.assertEqual(load_dataset(converted_path)[0].tolist(), input_data.tolist())
+            self.assertTrue(numpy.allclose(load_dataset(converted_path)[1], output_data, atol=1e-4))
+
+
+@unittest.skipUnless(os.path.exists(os.path.join(DATA_GENERATOR_PATH, "generator_3x3")), "data generators are not built")
+class ExactGeneratorTest(TestCase):
+    '''
+    Exact game ending statistics generator tests class.
+    '''
+
+    def count_games(self, grid, moving_player, counts):
+        grid = tuple(grid)
+        if (grid, moving_player) not in counts:
+            winner = get_winner(list(grid), 3)
+            if winner != 0 or 0 not in grid:
+                counts[(grid, moving_player)] = numpy.eye(3)[winner]
+            else:
+                children_counts = numpy.zeros(3)
+                for field in get_free_fields(grid, 3):
+                    child = list(grid)
+                    child[field] = moving_player
+                    children_counts += self.count_games(child, get_opponent(moving_player), counts)
+                counts[(grid, moving_player)] = children_counts
+        return counts[(grid, moving_player)]
+
+    def generate(self, directory, options=""):
+        path = os.path.join(directory, "data.bin")
+        self.assertEqual(0, os.system("{generator} {path} --binary {options} > /dev/null".format(
+            generator=os.path.join(DATA_GENERATOR_PATH, "generator_3x3"), path=path, options=options
+        )))
+        return load_dataset(path)
+
+    def test_labels(self):
+        '''
+        Tests that labels are ratios of games played from grid (by both starting players) that end with given result.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_data, output_data = self.generate(directory)
+
+        # 255168 games of 'X' starting player (46080 draws, 131184 'X' player wins, 77904 'O' player wins)
+        self.assertEqual([0] * 9, input_data[0].tolist())
+        self.assertTrue(numpy.allclose([92160 / 510336, 209088 / 510336, 209088 / 510336], output_data[0], atol=1e-6))
+
+        counts = {}
+        grids = [tuple(grid) for grid in input_data.tolist()]
+        self.assertEqual(len(grids), len(set(grids)))
+        for grid, labels in list(zip(grids, output_data))[::50]:
+            x_fields, o_fields = grid.count(1), grid.count(2)
+            moving_players = [1, 2] if x_fields == o_fields else [1 if x_fields < o_fields else 2]
+            grid_counts = sum(self.count_games(grid, player, counts) for player in moving_players)
+            self.assertTrue(numpy.allclose(grid_counts / grid_counts.sum(), labels, atol=1e-6))
+
+    def test_canonical_grids(self):
+        '''
+        Tests that canonical output has single grid of grids that differ by rotation or reflection.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_data, output_data = self.generate(directory)
+            canonical_input_data, canonical_output_data = self.generate(directory, "--canonical")
+
+        canonical_grids = {tuple(canonicalize(grid, 3)[0]) for grid in input_data.tolist()}
+        self.assertEqual(len(canonical_grids), len(canonical_input_data))
+        self.assertEqual(canonical_grids, {tuple(canonicalize(grid, 3)[0]) for grid in canonical_input_data.tolist()})
+
+
+@unittest.skipUnless(os.path.exists(os.path.join(DATA_GENERATOR_PATH, "generator_4x4")), "data generators are not built")
+class GeneratorThreadsTest(TestCase):
+    '''
+    Multi-threaded games simulation of data generators tests class.
+    '''
+
+    def generate(self, directory, name, threads_number, seed, options=""):
+        path = os.path.join(directory, name)
+        command = "{generator} 5000 {path} --binary --threads {threads} --seed {seed} {options} > /dev/null".format(
+            generator=os.path.join(DATA_GENERATOR_PATH, "generator_4x4"), path=path, threads=threads_number, seed=seed,
+            options=options
+        )
+        self.assertEqual(0, os.system(command))
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_reproducible_output(self):
+        '''
+        Tests that the same seed generates the same dataset (regardless of threads number).
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(self.generate(directory, "a.bin", 4, 7), self.generate(directory, "b.bin", 4, 7))
+            self.assertEqual(self.generate(directory, "a.bin", 4, 7), self.generate(directory, "b.bin", 1, 7))
+            self.assertNotEqual(self.generate(directory, "a.bin", 4, 7), self.generate(directory, "c.bin", 4, 8))
+
+    def test_resumed_chunked_output(self):
+        '''
+        Tests that chunked output matches single file output and that only missing chunks are generated again.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.generate(directory, "data.bin", 2, 5)
+            chunked_path = os.path.join(directory, "chunked.bin")
+            self.generate(directory, "chunked.bin", 2, 5, "--chunk-games 2000")
+            chunk_paths = get_chunk_paths(chunked_path)
+            self.assertEqual(3, len(chunk_paths))
+
+            os.remove(chunk_paths[1])
+            first_chunk_time = os.path.getmtime(chunk_paths[0])
+            self.generate(directory, "chunked.bin", 3, 5, "--chunk-games 2000")
+            self.assertEqual(chunk_paths, get_chunk_paths(chunked_path))
+            self.assertEqual(first_chunk_time, os.path.getmtime(chunk_paths[0]))
+
+            input_data, output_data = load_dataset(os.path.join(directory, "data.bin"))
+            chunked_input_data, chunked_output_data = load_chunked_dataset(chunked_path)
+            self.assertEqual(input_data.tolist(), chunked_input_data.tolist())
+            self.assertEqual(output_data.tolist(), chunked_output_data.tolist())
+
+    def test_simulated_games(self):
+        '''
+        Tests that simulated games are played by alternating players until win or full grid and that labels are
+        results of games.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.dat")
+            self.assertEqual(0, os.system("{generator} 300 {path} --seed 3 > /dev/null".format(
+                generator=os.path.join(DATA_GENERATOR_PATH, "generator_5x5"), path=path
+            )))
+            with open(path, "r") as file:
+                games = [game.strip().split("\n") for game in file.read().split("\n\n") if game.strip() != ""]
+
+        self.assertEqual(300, len(games))
+        for game in games:
+            records = [parse_text_line(line) for line in game]
+            grids = [grid for grid, labels in records]
+            self.assertEqual([0] * 25, grids[0])
+            moving_players = []
+            for previous_grid, grid in zip(grids, grids[1:]):
+                self.assertEqual(0, get_winner(previous_grid, 5))
+                changed_fields = [field for field in range(25) if previous_grid[field] != grid[field]]
+                self.assertEqual(1, len(changed_fields))
+                self.assertEqual(0, previous_grid[changed_fields[0]])
+                moving_players.append(grid[changed_fields[0]])
+            self.assertTrue(all(player != next_player for player, next_player in zip(moving_players, moving_players[1:])))
+            self.assertTrue(get_winner(grids[-1], 5) != 0 or 0 not in grids[-1])
+            self.assertTrue(all(labels == records[0][1] for grid, labels in records))
+            self.assertEqual(numpy.eye(3)[get_winner(grids[-1], 5)].tolist(), records[0][1])
+
+    def test_threads_datasets(self):
+        '''
+        Tests that datasets generated with different threads numbers are valid.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            for threads_number in [1, 3, 8]:
+                self.generate(directory, "data.bin", threads_number, 1)
+                input_data, output_data = load_dataset(os.path.join(directory, "data.bin"))
+                self.assertGreater(len(input_data), 5000)
+                self.assertTrue(numpy.all(input_data <= 2))
+                self.assertTrue(numpy.allclose(output_data.sum(axis=1), 1.0, atol=1e-3))
+
+
+class SelfPlayTest(TestCase):
+    '''
+    Min-max self-play learning data tests class.
+    '''
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_played_game(self):
+        '''
+        Tests that self-play game is played by alternating players until win or full grid.
+        '''
+
+        minmax_library = MinMaxLibrary()
+        for seed in range(5):
+            grids, winner = play_game(minmax_library, 4, 1, 0.3, random.Random(seed))
+            self.assertEqual([0] * 16, grids[0])
+            moving_players = []
+            for previous_grid, grid in zip(grids, grids[1:]):
+                self.assertEqual(0, get_winner(previous_grid, 4))
+                changed_fields = [field for field in range(16) if previous_grid[field] != grid[field]]
+                self.assertEqual(1, len(changed_fields))
+                moving_players.append(grid[changed_fields[0]])
+            self.assertTrue(all(player != next_player for player, next_player in zip(moving_players, moving_players[1:])))
+            self.assertEqual(get_winner(grids[-1], 4), winner)
+            self.assertTrue(winner != 0 or 0 not in grids[-1])
+
+        # min-max moves do not depend on time of search
+        first_game = play_game(minmax_library, 4, 2, 0.1, random.Random(7))
+        time.sleep(1.1)
+        self.assertEqual(first_game, play_game(minmax_library, 4, 2, 0.1, random.Random(7)))
+
+        # 3x3 game without random moves ends with draw
+        grids, winner = play_game(minmax_library, 3, 5, 0.0, random.Random(0))
+        self.assertEqual(0, winner)
+
+    @unittest.skipUnless(MINMAX_LIBRARY_PATH.exists(), "min-max library is not built")
+    def test_dataset(self):
+        '''
+        Tests that self-play dataset does not depend on processes number and that positions are labelled with
+        results of their games.
+        '''
+
+        with tempfile.TemporaryDirectory() as directory:
+            first_path, second_path = os.path.join(directory, "first.bin"), os.path.join(directory, "second.bin")
+            statistics = generate_self_play_dataset(first_path, 4, 10, 1, 0.2, 1, games_per_task=3, seed=1)
+            generate_self_play_dataset(second_path, 4, 10, 1, 0.2, 2, games_per_task=4, seed=1)
+            with open(first_path, "rb") as first_file, open(second_path, "rb") as second_file:
+                self.assertEqual(first_file.read(), second_file.read())
+
+            input_data, output_data = load_dataset(first_path)
+            self.assertEqual(10, statistics['games'])
+            self.assertEqual(len(input_data), statistics['positions'])
+
+        games_starts = [index for index, grid in enumerate(input_data.tolist()) if not any(grid)]
+        games_ends = games_starts[1:] + [len(input_data)]
+        self.assertEqual(10, len(games_ends))
+        for game_start, game_end in zip(games_starts, games_ends):
+            winner = get_winner(input_data[game_end - 1].tolist(), 4)
+            self.assertTrue(numpy.array_equal(numpy.tile(numpy.eye(3)[winner], (game_end - game_start, 1)),
+                                              output_data[game_start:game_end]))
+
 
 if __name__ == "__main__":
     unittest.main()
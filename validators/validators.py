@@ -1,5 +1,16 @@
+import copy
+
 from validators.exceptions import ValidationError, ValidatorFieldError
 
+# server caps of per-request min-max compute budget ('max_depth' cap depends on grid size)
+MINMAX_MAX_DEPTH_CAPS = {3: 10, 4: 6, 5: 4}
+MINMAX_MAX_NODES_CAP = 10000000
+# hybrid engine search is run by interpreter (not by compiled min-max library), so its depth caps are lower
+HYBRID_MAX_DEPTH_CAPS = {3: 9, 4: 4, 5: 2}
+# neural network endpoint models - value network predicts game result of every child grid, policy network predicts
+# the best move with single forward pass
+NEURAL_NETWORK_MODELS = ["value", "policy"]
+
 # VALIDATOR FIELD CLASSES
 
 
@@ -167,6 +178,10 @@ class IntegerFieldValidator(BaseFieldValidator):
 
         super().validate()  # invoke base validation
 
+        # optional field without value (base validation allows it only for nullable and not required fields)
+        if self._value is None:
+            return
+
         # type validation
         try:
             self._value = int(self._value)
@@ -305,6 +320,10 @@ class StringFieldValidator(BaseFieldValidator):  # noqa: C901
         '''
         super().validate()  # invoke base validation (required fields)
 
+        # optional field without value (base validation allows it only for nullable and not required fields)
+        if self._value is None:
+            return
+
         # type validation
         if type(self._value) != str:
             raise ValidationError(self._name, "Type of provided value for field '{serializer_field_name}' is not str.".format(
@@ -357,27 +376,18 @@ it's length is equal to {value_length} but it should contain max. {max_length_va
 # VALIDATORS CLASSES
 
 
-class TicTacToeRequestValidator():
+class BaseRequestValidator():
     '''
-    Tic-Tac-Toe request validator.
+    Base request validator - validator fields are declared as class attributes of inheriting validators.
     '''
 
-    moving_player = IntegerFieldValidator(field_name="moving_player", required=True, nullable=False, min_value=1, max_value=2)
-    grid = StringFieldValidator(field_name="grid", required=True, nullable=False, empty=False, min_length=9, max_length=25)
-    grid_size = IntegerFieldValidator(field_name="grid_size", required=True, nullable=False, min_value=3, max_value=5)
-
     def __init__(self, validator_data):
         '''
-        Initiate TicTacToeRequestValidator.
+        Initiate request validator.
         '''
 
         # fetching validator fields
-        tmp = list(self.__dir__())
-        validator_fields = []
-        for t in tmp:
-            a = str(type(getattr(self, t)))
-            if "FieldValidator" in a:
-                validator_fields.append(t)
+        validator_fields = self._get_validator_fields()
 
         # set necessary 'data' and 'validated_data' structures in validator
         setattr(self, "data", validator_data)
@@ -386,13 +396,77 @@ class TicTacToeRequestValidator():
 
         # process all validator fields
         for field_key in validator_fields:
-            validator_field = getattr(self, field_key)  # fetch validator field
+            # fetch validator field copy (fields are declared on class, so they cannot keep values of concurrently
+            # validated requests)
+            validator_field = copy.deepcopy(getattr(self, field_key))
+            setattr(self, field_key, validator_field)
             field_value = validator_data.get(field_key, None)  # fetch value meant to be validator field value
             validator_field.set_value(field_value)  # set value for validator field
             # add field value to validated data dictionary (so it's not necessary to make it after validation
             # => validation will raise any exception)
             self.validated_data[field_key] = field_value
 
+    def _get_validator_fields(self):
+        '''
+        Finds names of validator fields.
+
+        returns:
+            list - names of validator attributes that are validator fields
+        '''
+
+        tmp = list(self.__dir__())
+        validator_fields = []
+        for t in tmp:
+            a = str(type(getattr(self, t)))
+            if "FieldValidator" in a:
+                validator_fields.append(t)
+        return validator_fields
+
+    def _validate_fields(self):
+        '''
+        Runs validation of all validator fields.
+
+        throws:
+            ValidationError - when any validator field value is incorrect.
+        '''
+
+        # run 'validate()' method for each validator field
+        for field in self._get_validator_fields():
+            validator_field = getattr(self, field)
+            valid = validator_field.is_valid()
+            if not valid:
+                raise ValidationError(validator_field._name, validator_field.errors[validator_field._name])
+
+    def is_valid(self):
+        '''
+        Decides whether received request is valid or not.
+
+        returns:
+            bool - information whether validator data are correct or not.
+        '''
+
+        try:
+            self._validate_fields()
+        except ValidationError as error:
+            self.errors[error._field] = error._message
+            return False
+        return True
+
+
+class TicTacToeRequestValidator(BaseRequestValidator):
+    '''
+    Tic-Tac-Toe request validator.
+    '''
+
+    moving_player = IntegerFieldValidator(field_name="moving_player", required=True, nullable=False, min_value=1, max_value=2)
+    grid = StringFieldValidator(field_name="grid", required=True, nullable=False, empty=False, min_length=9, max_length=25)
+    grid_size = IntegerFieldValidator(field_name="grid_size", required=True, nullable=False, min_value=3, max_value=5)
+    # optional min-max compute budget (server default is used when not provided)
+    max_depth = IntegerFieldValidator(field_name="max_depth", required=False, nullable=True, min_value=0, max_value=24)
+    max_nodes = IntegerFieldValidator(
+        field_name="max_nodes", required=False, nullable=True, min_value=100, max_value=MINMAX_MAX_NODES_CAP
+    )
+
     def __get_grid_stats(self, grid_value, grid_size_value):
         '''
         Makes grid stats.
@@ -440,20 +514,8 @@ class TicTacToeRequestValidator():
             ValidationError - when something in validator data is incorrect.
         '''
 
-        # fetching validator fields
-        tmp = list(self.__dir__())
-        validator_fields = []
-        for t in tmp:
-            a = str(type(getattr(self, t)))
-            if "FieldValidator" in a:
-                validator_fields.append(t)
-
         # run 'validate()' method for each validator field
-        for field in validator_fields:
-            validator_field = getattr(self, field)
-            valid = validator_field.is_valid()
-            if not valid:
-                raise ValidationError(validator_field._name, validator_field.errors[validator_field._name])
+        self._validate_fields()
 
         # adding custom validation for specific fields
         grid_value = self.data["grid"]
@@ -469,6 +531,12 @@ class TicTacToeRequestValidator():
                 expected_grid_length=(grid_size_value * grid_size_value)
             ))
 
+        # 'max_depth' FIELD VALUE VALIDATION - deeper searches than server cap for grid size are not allowed
+        max_depth = self.data.get("max_depth", None)
+        if max_depth is not None and int(max_depth) > MINMAX_MAX_DEPTH_CAPS[grid_size_value]:
+            raise ValidationError("max_depth", "Requested search depth exceeds server limit - max. depth for grid size \
+{grid_size} is {max_depth_cap}.".format(grid_size=grid_size_value, max_depth_cap=MINMAX_MAX_DEPTH_CAPS[grid_size_value]))
+
         # received grid value length validation
         if len(grid_value) != 9 and len(grid_value) != 16 and len(grid_value) != 25:
             raise ValidationError("grid", "Received grid state is invalid - it's length should be 9, 16 or 25. \
@@ -528,3 +596,67 @@ Length of received value was {received_grid_length}.".format(received_grid_lengt
             self.errors[error._field] = error._message
             return False
         return True
+
+
+class NeuralNetworkRequestValidator(TicTacToeRequestValidator):
+    '''
+    Neural network request validator (Tic-Tac-Toe request with optional model type).
+    '''
+
+    model = StringFieldValidator(field_name="model", required=False, nullable=True, empty=False, min_length=1, max_length=16)
+
+    def is_valid(self):
+        if not super().is_valid():
+            return False
+
+        model = self.data.get("model", None)
+        if model is not None and model not in NEURAL_NETWORK_MODELS:
+            self.errors["model"] = "Unknown neural network model '{model}' - allowed models are: {models}.".format(
+                model=model, models=", ".join(NEURAL_NETWORK_MODELS)
+            )
+            return False
+        return True
+
+
+class HybridRequestValidator(TicTacToeRequestValidator):
+    '''
+    Hybrid engine request validator (Tic-Tac-Toe request with lower 'max_depth' caps).
+    '''
+
+    def is_valid(self):
+        if not super().is_valid():
+            return False
+
+        max_depth, grid_size = self.data.get("max_depth", None), self.data["grid_size"]
+        if max_depth is not None and int(max_depth) > HYBRID_MAX_DEPTH_CAPS[grid_size]:
+            self.errors["max_depth"] = "Requested search depth exceeds server limit - max. hybrid search depth for \
+grid size {grid_size} is {max_depth_cap}.".format(grid_size=grid_size, max_depth_cap=HYBRID_MAX_DEPTH_CAPS[grid_size])
+            return False
+        return True
+
+
+class AnalysisJobRequestValidator(TicTacToeRequestValidator):
+    '''
+    Deep analysis job request validator (Tic-Tac-Toe request with optional analysis depth).
+    '''
+
+    depth = IntegerFieldValidator(field_name="depth", required=False, nullable=True, min_value=1, max_value=24)
+
+
+class GameSessionRequestValidator(BaseRequestValidator):
+    '''
+    Game session creation request validator.
+    '''
+
+    grid_size = IntegerFieldValidator(field_name="grid_size", required=True, nullable=False, min_value=3, max_value=5)
+    engine_player = IntegerFieldValidator(field_name="engine_player", required=True, nullable=False, min_value=1, max_value=2)
+    first_player = IntegerFieldValidator(field_name="first_player", required=False, nullable=True, min_value=1, max_value=2)
+    pondering = IntegerFieldValidator(field_name="pondering", required=False, nullable=True, min_value=0, max_value=1)
+
+
+class GameSessionMoveRequestValidator(BaseRequestValidator):
+    '''
+    Game session opponent move request validator (move is checked against session grid by session itself).
+    '''
+
+    move = IntegerFieldValidator(field_name="move", required=True, nullable=False, min_value=0, max_value=24)